@@ -2,8 +2,7 @@ import re
 import shutil
 from pathlib import Path
 
-import requests
-
+from scikit_package.utils import http
 from scikit_package.utils.io import copy_all_files
 
 # All cookie-cutter hooks run on project root, but good to enforce
@@ -217,7 +216,7 @@ def update_workflow():
     def get_central_workflows():
         """Get GitHub workflows from scikit-package/release-scripts."""
         base_url = f"https://api.github.com/repos/{CENTRAL_REPO_ORG}/{CENTRAL_REPO_NAME}/contents/{CENTRAL_WORKFLOW_DIR}"
-        response = requests.get(base_url, timeout=5)
+        response = http.get(base_url, timeout=5)
         if response.status_code != 200:
             raise Exception(
                 f"Failed to fetch central workflows: {response.status_code}"
@@ -226,7 +225,7 @@ def update_workflow():
         workflows = {}
         for file in response.json():
             if file["type"] == "file" and file["name"].endswith(".yml"):
-                content_response = requests.get(
+                content_response = http.get(
                     file["download_url"], timeout=5
                 )
                 if content_response.status_code == 200:
@@ -1,22 +1,127 @@
+import time
+from pathlib import Path
+
+import yaml
+
 from scikit_package.utils import cookie
 
 SKPKG_GITHUB_URL = "https://github.com/scikit-package/scikit-package"
+TEMPLATE_REPO_URLS = {
+    "workspace": f"{SKPKG_GITHUB_URL}-workspace",
+    "system": f"{SKPKG_GITHUB_URL}-system",
+    "public": SKPKG_GITHUB_URL,
+    "conda-forge": f"{SKPKG_GITHUB_URL}-conda-forge",
+    "manuscript": f"{SKPKG_GITHUB_URL}-manuscript",
+}
+# conda-forge recipes need the interactive check of the PyPI package.
+BATCH_TEMPLATES = ["workspace", "system", "public", "manuscript"]
+
+
+def _read_batch_manifest(manifest_path):
+    """Read the manifest file of `package create --batch`.
+
+    The manifest is a YAML (or JSON) file that looks like
+
+    .. code-block:: yaml
+
+        template: public  # optional, default: public
+        output_dir: packages  # optional, default: .
+        max_workers: 4  # optional, default: number of CPUs
+        packages:
+          - project_name: diffpy.my-project
+            github_username_or_orgname: diffpy
+          - project_name: diffpy.other-project
+
+    A plain list of the package contexts is also accepted.
+
+    Returns
+    -------
+    manifest : dict
+        The manifest with the optional entries filled with their defaults.
+    """
+    manifest_path = Path(manifest_path)
+    if not manifest_path.is_file():
+        raise FileNotFoundError(
+            f"The batch manifest {manifest_path} is not found. "
+            "Please provide the path to an existing YAML file."
+        )
+    with open(manifest_path, "r") as f:
+        manifest = yaml.safe_load(f)
+    if isinstance(manifest, list):
+        manifest = {"packages": manifest}
+    packages = (manifest or {}).get("packages")
+    if not isinstance(packages, list) or not all(
+        isinstance(context, dict) for context in packages
+    ):
+        raise ValueError(
+            f"The batch manifest {manifest_path} must contain a list of "
+            "package contexts under `packages`. Please see "
+            "`package create --help` for an example."
+        )
+    return {
+        "template": manifest.get("template", "public"),
+        "output_dir": manifest.get("output_dir", "."),
+        "max_workers": manifest.get("max_workers"),
+        "packages": packages,
+    }
+
+
+def batch(manifest_path, template=None):
+    """Create all packages listed in a manifest file without prompts.
+
+    Parameters
+    ----------
+    manifest_path : str
+        The path to the manifest file, see ``_read_batch_manifest``.
+    template : str, optional
+        The template to be used, overriding the one of the manifest.
+
+    Returns
+    -------
+    results : list of tuple
+        The (name, elapsed, error) of each package, where ``error`` is
+        None for created packages.
+    """
+    manifest = _read_batch_manifest(manifest_path)
+    template = template or manifest["template"]
+    if template not in BATCH_TEMPLATES:
+        raise ValueError(
+            f"The template `{template}` is not supported in batch mode. "
+            f"Please use one of {BATCH_TEMPLATES}."
+        )
+    start = time.perf_counter()
+    results = cookie.run_batch(
+        TEMPLATE_REPO_URLS[template],
+        manifest["packages"],
+        output_dir=manifest["output_dir"],
+        max_workers=manifest["max_workers"],
+    )
+    elapsed = time.perf_counter() - start
+    failed = [(name, error) for name, _, error in results if error]
+    print(
+        f"Created {len(results) - len(failed)} of {len(results)} packages "
+        f"in {elapsed:.2f} s."
+    )
+    if len(failed) > 0:
+        print("Failed to create the following packages:")
+        for name, error in failed:
+            print(f"  - {name}: {error}")
+    return results
 
 
 def package(args):
     """Run the cookiecutter template for creating a package.
 
     By default, checkout the latest release tag from the relevant GitHub
-    repository.
+    repository. With ``--batch``, create all packages listed in the
+    manifest file instead.
     """
     subcmd = args.subcommand
-    if subcmd == "workspace":
-        cookie.run(f"{SKPKG_GITHUB_URL}-workspace")
-    elif subcmd == "system":
-        cookie.run(f"{SKPKG_GITHUB_URL}-system")
-    elif subcmd == "public":
-        cookie.run(SKPKG_GITHUB_URL)
-    elif subcmd == "conda-forge":
-        cookie.run(f"{SKPKG_GITHUB_URL}-conda-forge")
-    elif subcmd == "manuscript":
-        cookie.run(f"{SKPKG_GITHUB_URL}-manuscript")
+    if getattr(args, "batch", None):
+        return batch(args.batch, template=subcmd)
+    if subcmd is None:
+        raise ValueError(
+            "Please specify the package to create, e.g. "
+            "`package create public`, or a manifest with `--batch`."
+        )
+    cookie.run(TEMPLATE_REPO_URLS[subcmd])
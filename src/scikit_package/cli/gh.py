@@ -1,35 +1,58 @@
+import functools
+import hashlib
 import json
 import os
 import re
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from tempfile import TemporaryDirectory
 from urllib.parse import urlparse
 
-import requests
 import yaml
-from requests.exceptions import JSONDecodeError
 
+from scikit_package.utils import cache, forges, http, io, mirror
 from scikit_package.utils.io import get_config_value
 
+MAX_BROADCAST_WORKERS = 4
+GITHUB_URL = "https://github.com"
+GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_BATCH_SIZE = 50  # repositories per query
+DUPLICATE_SEARCH_BATCH_SIZE = 20  # searches per query
+BROADCAST_JOURNAL_CACHE = "broadcast-journals"
+REPO_REGISTRY_CACHE = "repo-registries"
+ISSUE_CACHE = "issues"
+REGISTRY_CACHE_VERSION = 2
+REGISTRY_FILE_STEMS = ["groups", "repos"]
+REGISTRY_FILE_EXTENSIONS = [".json", ".yaml", ".yml"]
+# a name, a parenthesis, `|`, `&`, or `-` between whitespace, which
+# leaves the names containing a hyphen, e.g. `diffpy-cmi`, intact
+GROUP_EXPRESSION_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<op>[()|&]|(?<!\S)-(?!\S))|(?P<name>[^\s()|&]+))"
+)
+
+_journal_lock = threading.Lock()
+
 
 def broadcast_issue_to_repos(args):
-    """Broadcast a GitHub issue to multiple repositories."""
-    source_repo_url, issue_content = _get_issue_content(args.issue_url)
-    groups_dict, repos_dict = _get_broadcast_repos_dict(args.url_to_repo_info)
+    """Broadcast a GitHub issue to multiple repositories, on GitHub or
+    on other forges such as GitLab and Gitea."""
+    gh_token = os.environ.get("GITHUB_TOKEN", None)
+    source_repo_url, issue_content = _get_issue_content(
+        args.issue_url, gh_token
+    )
+    registry = _get_broadcast_registry(args.url_to_repo_info)
     broadcast_urls = _get_broadcast_urls(
-        args.group_name, groups_dict, repos_dict
+        args.group_name,
+        registry["groups"],
+        registry["repos"],
+        index=registry["index"],
     )
     if source_repo_url in broadcast_urls:
         print("Excluding the source repository from the broadcast list.")
         broadcast_urls.remove(source_repo_url)
-    gh_token = os.environ.get("GITHUB_TOKEN", None)
-    if gh_token is None:
-        raise EnvironmentError(
-            "GITHUB_TOKEN environment variable is not set. "
-            "Please set it to a valid GitHub token with "
-            "permissions to create issues in the target repositories."
-        )
+    concurrency = getattr(args, "concurrency", MAX_BROADCAST_WORKERS)
+    forges_by_url = _get_forges(broadcast_urls, concurrency)
     dry_run = True
     dry_run = not (args.dry_run == "n")
     return _broadcast_issue_to_urls(
@@ -37,17 +60,33 @@ def broadcast_issue_to_repos(args):
         broadcast_urls,
         gh_token,
         dry_run,
+        concurrency=concurrency,
+        issue_url=args.issue_url,
+        resume=getattr(args, "resume", False),
+        duplicates=(
+            "flag" if getattr(args, "skip_duplicates", "y") == "n" else "skip"
+        ),
+        forges_by_url=forges_by_url,
     )
 
 
-def _get_issue_content(issue_url):
+def _get_issue_content(issue_url, gh_token=None):
     """Fetch the contents of the issue that will be broadcast.
 
+    The title and body are cached per issue url with the ETag of the
+    response, and revalidated with ``If-None-Match`` afterwards, so an
+    unchanged issue costs a 304 response, which does not count against
+    the GitHub rate limit. If GitHub can not be reached, the cached
+    content is used.
+
     Parameters
     ----------
     issue_url: str
       url to the issue to be broadcast. Currently it takes the form:
       https://github.com/{user-or-org-name}/{repo-name}/issues/{issue-number}
+    gh_token: str, optional
+      GitHub token for authentication, which raises the rate limit and
+      gives access to private repositories.
 
     Returns
     -------
@@ -72,16 +111,45 @@ def _get_issue_content(issue_url):
         f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
     )
     source_repo_url = f"https://github.com/{owner}/{repo}"
+    cached = cache.read_entry(ISSUE_CACHE, issue_url)
+    headers = {"Accept": "application/vnd.github.v3+json"}
+    if gh_token is not None:
+        headers["Authorization"] = f"token {gh_token}"
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    try:
+        response = http.get(api_url, headers=headers)
+    except http.RequestException:
+        if not cached:
+            raise
+        print(
+            "> Unable to reach GitHub, the cached content of "
+            f"{issue_url} is used."
+        )
+        return source_repo_url, cached["issue_content"]
+    if response.status_code == 304 and cached:
+        return source_repo_url, cached["issue_content"]
     try:
-        response = requests.get(api_url)
         assert response.status_code == 200
-        issue_content = response.json()
-    except (AssertionError, requests.JSONDecodeError):
+        issue_json = response.json()
+        issue_content = {
+            "title": issue_json["title"],
+            "body": issue_json["body"],
+        }
+    except (AssertionError, KeyError, http.JSONDecodeError):
         raise ValueError(
             f"Can not find the corresponding issue from {issue_url}. "
             "Please ensure the input url is with a format like https://"
             "github.com/username/reponame/issues/issue-number"
         )
+    cache.write_entry(
+        ISSUE_CACHE,
+        issue_url,
+        {
+            "etag": response.headers.get("ETag"),
+            "issue_content": issue_content,
+        },
+    )
     return source_repo_url, issue_content
 
 
@@ -134,36 +202,189 @@ def _get_broadcast_repos_dict(url_to_repo_info=None):
             "repo3":  "https://github.com/myorg/myrepo3"
         }
     """
+    registry = _get_broadcast_registry(url_to_repo_info)
+    return registry["groups"], registry["repos"]
+
+
+def _get_registry_sources(dir_path):
+    """Get the path, modification time, size and SHA256 of the groups
+    and repos files in a directory.
 
-    def _load_json_or_yaml_from_dir(dir_path: Path, file_stems: list):
-        extensions = [".json", ".yaml", ".yml"]
-        return_dict = {}
-        find_all = []
-        for file_stem in file_stems:
-            find_file = False
-            for ext in extensions:
-                file_path = dir_path / f"{file_stem}{ext}"
-                if file_path.is_file():
-                    find_file = True
-                    with open(file_path, "r") as f:
-                        if ext == ".json":
-                            return_dict[file_stem] = json.load(f)
-                        elif ext == ".yaml":
-                            return_dict[file_stem] = yaml.safe_load(f)
-                    break
-            find_all.append(find_file)
-        find_all = all(find_all)
-        return return_dict, find_all
-
-    def _load_json_or_yaml_from_repo(repo_url, file_stems):
-        with TemporaryDirectory() as tmpdir:
-            tmp_path = Path(tmpdir)
-            subprocess.run(
-                ["git", "clone", repo_url, str(tmp_path)],
-                capture_output=True,
-                text=True,
+    Returns
+    -------
+    sources : dict or None
+        The information of each file keyed by its stem, or None if the
+        directory does not contain both files.
+    """
+    sources = {}
+    for file_stem in REGISTRY_FILE_STEMS:
+        for ext in REGISTRY_FILE_EXTENSIONS:
+            file_path = dir_path / f"{file_stem}{ext}"
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            sources[file_stem] = {
+                "path": str(file_path.resolve()),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+            }
+            break
+        else:
+            return None
+    return sources
+
+
+def _get_sha256(file_path):
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _is_registry_current(entry, sources):
+    """Check whether a compiled registry was compiled from the files.
+
+    A file whose modification time and size are unchanged is not read
+    again. Otherwise, it is hashed and compared with the SHA256 recorded
+    at compile time, so a file that was touched without being changed
+    does not need to be parsed again. The matching hashes are recorded
+    in ``sources``.
+    """
+    if entry is None or entry.get("version") != REGISTRY_CACHE_VERSION:
+        return False
+    for file_stem, source in sources.items():
+        cached = entry["sources"].get(file_stem)
+        if cached is None or cached["path"] != source["path"]:
+            return False
+        if (cached["mtime_ns"], cached["size"]) != (
+            source["mtime_ns"],
+            source["size"],
+        ):
+            if _get_sha256(source["path"]) != cached["sha256"]:
+                return False
+        source["sha256"] = cached["sha256"]
+    return True
+
+
+def _check_dicts(groups_dict, repos_dict):
+    names_mentioned = set(
+        [value for _, values in groups_dict.items() for value in values]
+    )
+    for name in names_mentioned:
+        if name not in repos_dict and name not in groups_dict:
+            raise KeyError(
+                f"repo `{name}` in the groups dictionary does not "
+                f"exist in repos dictionary {repos_dict.keys()}. "
+                "Please ensure all repo names in the groups dictionary "
+                "exist in the repos dictionary."
             )
-            return _load_json_or_yaml_from_dir(tmp_path, file_stems)
+    return groups_dict, repos_dict
+
+
+def _get_group_index(groups_dict, repos_dict):
+    """Get the urls of all repos of each group, including the repos of
+    the groups it contains.
+
+    A member of a group is a repo if its name is in ``repos_dict``,
+    otherwise it is another group. The repos of each group are resolved
+    once and reused by the groups that contain it, and the urls are
+    kept in the order of their first appearance without duplicates.
+
+    Returns
+    -------
+    index : dict
+        The list of repo urls keyed by group name.
+    """
+    index = {}
+    resolving = []
+
+    def resolve(group_name):
+        if group_name in index:
+            return index[group_name]
+        if group_name in resolving:
+            cycle = resolving[resolving.index(group_name) :] + [group_name]
+            raise ValueError(
+                f"The groups {' -> '.join(cycle)} contain each other. "
+                "Please ensure the groups dictionary has no cycle."
+            )
+        resolving.append(group_name)
+        urls = {}
+        for name in groups_dict[group_name]:
+            if name in repos_dict:
+                urls[repos_dict[name]] = None
+            else:
+                urls.update(dict.fromkeys(resolve(name)))
+        resolving.pop()
+        index[group_name] = list(urls)
+        return index[group_name]
+
+    for group_name in groups_dict:
+        resolve(group_name)
+    return index
+
+
+def _compile_registry(dir_path):
+    """Load the groups and repos files of a directory into a compiled
+    registry.
+
+    The compiled registry holds the groups and repos dictionaries and
+    the urls of the repos of each group. It is cached, keyed by the
+    directory, together with the modification time, size and SHA256 of
+    the files, so the files are only parsed again when they change.
+
+    Returns
+    -------
+    registry : dict or None
+        The registry with the ``groups``, ``repos`` and ``index``
+        entries, or None if the directory does not contain both files.
+    """
+    sources = _get_registry_sources(dir_path)
+    if sources is None:
+        return None
+    cache_key = str(dir_path.resolve())
+    entry = cache.read_entry(REPO_REGISTRY_CACHE, cache_key)
+    if _is_registry_current(entry, sources):
+        if entry["sources"] != sources:
+            entry["sources"] = sources
+            cache.write_entry(REPO_REGISTRY_CACHE, cache_key, entry)
+        return entry
+    dicts = {}
+    for file_stem, source in sources.items():
+        with open(source["path"], "rb") as f:
+            content = f.read()
+        source["sha256"] = hashlib.sha256(content).hexdigest()
+        if source["path"].endswith(".json"):
+            dicts[file_stem] = json.loads(content)
+        else:
+            dicts[file_stem] = yaml.safe_load(content)
+    groups_dict, repos_dict = _check_dicts(dicts["groups"], dicts["repos"])
+    entry = {
+        "version": REGISTRY_CACHE_VERSION,
+        "sources": sources,
+        "groups": groups_dict,
+        "repos": repos_dict,
+        "index": _get_group_index(groups_dict, repos_dict),
+    }
+    cache.write_entry(REPO_REGISTRY_CACHE, cache_key, entry)
+    return entry
+
+
+def _get_broadcast_registry(url_to_repo_info=None):
+    """Get the compiled registry of the repos and groups databases, see
+    ``_get_broadcast_repos_dict`` and ``_compile_registry``."""
+
+    def _load_registry_from_repo(repo_url):
+        try:
+            checkout_path = mirror.checkout_sparse(
+                repo_url,
+                [
+                    f"{file_stem}{ext}"
+                    for file_stem in REGISTRY_FILE_STEMS
+                    for ext in REGISTRY_FILE_EXTENSIONS
+                ],
+            )
+        except subprocess.CalledProcessError:
+            return None
+        return _compile_registry(checkout_path)
 
     def is_github_repo_url(url: str) -> bool:
         pattern = re.compile(
@@ -172,20 +393,6 @@ def _get_broadcast_repos_dict(url_to_repo_info=None):
         )
         return bool(pattern.match(url))
 
-    def _check_dicts(groups_dict, repos_dict):
-        repos_mentioned = set(
-            [value for _, values in groups_dict.items() for value in values]
-        )
-        for repo_name in repos_mentioned:
-            if repo_name not in repos_dict:
-                raise KeyError(
-                    f"repo `{repo_name}` in the groups dictionary does not "
-                    f"exist in repos dictionary {repos_dict.keys()}. "
-                    "Please ensure all repo names in the groups dictionary "
-                    "exist in the repos dictionary."
-                )
-        return groups_dict, repos_dict
-
     if url_to_repo_info:
         if url_to_repo_info.startswith(
             "http://"
@@ -199,11 +406,8 @@ def _get_broadcast_repos_dict(url_to_repo_info=None):
                     "https://github.com/user-or-orgname/reponame "
                     "or provide a directory path instead."
                 )
-            dicts, find_all = _load_json_or_yaml_from_repo(
-                url_to_repo_info,
-                ["groups", "repos"],
-            )
-            if not find_all:
+            registry = _load_registry_from_repo(url_to_repo_info)
+            if registry is None:
                 raise FileNotFoundError(
                     f"{url_to_repo_info} "
                     "is a valid GitHub repository URL but the required "
@@ -212,7 +416,7 @@ def _get_broadcast_repos_dict(url_to_repo_info=None):
                     "repository. Please ensure both files exist in the "
                     "top level of the GitHub repository."
                 )
-            return _check_dicts(dicts["groups"], dicts["repos"])
+            return registry
         else:  # url_to_repo_info is a directory path
             path = Path(url_to_repo_info)
             if not path.is_dir():
@@ -222,10 +426,8 @@ def _get_broadcast_repos_dict(url_to_repo_info=None):
                     "exists on your local file system or provide a GitHub "
                     "repository URL instead."
                 )
-            dicts, find_all = _load_json_or_yaml_from_dir(
-                path, ["groups", "repos"]
-            )
-            if not find_all:
+            registry = _compile_registry(path)
+            if registry is None:
                 raise FileNotFoundError(
                     (
                         "The required files `groups.json`(or `groups.yaml`), "
@@ -235,14 +437,12 @@ def _get_broadcast_repos_dict(url_to_repo_info=None):
                     )
                 )
             else:
-                return _check_dicts(dicts["groups"], dicts["repos"])
+                return registry
     else:  # url_to_repo_info is None
         url_to_repo_info = Path().cwd()
-        dicts, find_all = _load_json_or_yaml_from_dir(
-            url_to_repo_info, ["groups", "repos"]
-        )
-        if find_all:
-            return _check_dicts(dicts["groups"], dicts["repos"])
+        registry = _compile_registry(url_to_repo_info)
+        if registry is not None:
+            return registry
         else:
             try:
                 url_to_repo_info = get_config_value(
@@ -257,18 +457,113 @@ def _get_broadcast_repos_dict(url_to_repo_info=None):
                     "required files when `url_to_repo_info` is not provided "
                     "to the command."
                 )
-            return _get_broadcast_repos_dict(url_to_repo_info)
+            return _get_broadcast_registry(url_to_repo_info)
+
+
+def _tokenize_group_expression(expression):
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = GROUP_EXPRESSION_TOKEN_PATTERN.match(expression, position)
+        if match is None:
+            raise ValueError(
+                f"Can not parse the group expression `{expression}`."
+            )
+        tokens.append(match["op"] or match["name"])
+        position = match.end()
+    return tokens
+
 
+def _evaluate_group_expression(expression, resolve_name):
+    """Evaluate an expression combining groups with set operations.
 
-def _get_broadcast_urls(input_name, groups_dict, repos_dict):
+    ``a | b`` is the union of the repos of ``a`` and ``b``, ``a & b``
+    their intersection and ``a - b`` the repos of ``a`` that are not in
+    ``b``. As in Python, ``-`` binds tighter than ``&``, which binds
+    tighter than ``|``, and parentheses group sub-expressions. The
+    urls are kept in the order of the left-hand operand.
+
+    Parameters
+    ----------
+    expression : str
+        The expression, e.g. "(diffpy | regolith) - archived".
+    resolve_name : callable
+        The function returning the list of repo urls of a name.
+
+    Returns
+    -------
+    urls : list of str
+        The urls of the repos of the expression.
+    """
+    tokens = _tokenize_group_expression(expression)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def parse_operand():
+        nonlocal position
+        token = peek()
+        if token == "(":
+            position += 1
+            urls = parse_union()
+            if peek() != ")":
+                raise ValueError(
+                    f"A parenthesis is not closed in `{expression}`."
+                )
+            position += 1
+            return urls
+        if token is None or token in ("|", "&", "-", ")"):
+            raise ValueError(
+                f"A group name is expected in `{expression}` "
+                f"instead of `{token or 'the end'}`."
+            )
+        position += 1
+        return resolve_name(token)
+
+    def parse_binary(parse_next, operator, combine):
+        def parse():
+            nonlocal position
+            urls = parse_next()
+            while peek() == operator:
+                position += 1
+                urls = combine(urls, set(parse_next()))
+            return urls
+
+        return parse
+
+    parse_union = parse_binary(
+        parse_binary(
+            parse_binary(
+                parse_operand,
+                "-",
+                lambda urls, other: [u for u in urls if u not in other],
+            ),
+            "&",
+            lambda urls, other: [u for u in urls if u in other],
+        ),
+        "|",
+        lambda urls, other: list(dict.fromkeys([*urls, *other])),
+    )
+    urls = parse_union()
+    if peek() is not None:
+        raise ValueError(
+            f"Unexpected `{peek()}` in the group expression `{expression}`."
+        )
+    return urls
+
+
+def _get_broadcast_urls(input_name, groups_dict, repos_dict, index=None):
     """Build the list of repository URLs from the repos and groups
     databases and a user-supplied group key.
 
     Parameters
     ----------
     input_name : str
-        The user-supplied group key.
-        For example, "even_repos".
+        The user-supplied group key, or an expression combining groups,
+        see ``_evaluate_group_expression``.
+        For example, "even_repos" or "all_repos - odd_repos".
     groups_dict : dict
         The dictionary that maps group names to lists of repo names.
         It looks like
@@ -281,27 +576,499 @@ def _get_broadcast_urls(input_name, groups_dict, repos_dict):
             "repo2":  "https://github.com/myorg/myrepo2",
             "repo3":  "https://github.com/myorg/myrepo3"
         }
+    index : dict, optional
+        The urls of the repos of each group precomputed by
+        ``_get_group_index``. If not given, it is computed.
 
     Returns
     -------
     broadcast_urls : list of str
         The list of repo urls to broadcast the issue.
     """
-    if input_name not in groups_dict:
+    if index is None:
+        index = _get_group_index(groups_dict, repos_dict)
+
+    def resolve_name(name):
+        if name in index:
+            return index[name]
+        if name in repos_dict:
+            return [repos_dict[name]]
         raise KeyError(
-            f"The input name `{input_name}` does not exist in the "
+            f"The input name `{name}` does not exist in the "
             f"groups dictionary {groups_dict.keys()}. "
             "Please ensure the input name exists in the groups dictionary"
         )
-    repo_names = groups_dict[input_name]
-    broadcast_urls = []
-    for repo_name in repo_names:
-        broadcast_urls.append(repos_dict[repo_name])
-    return broadcast_urls
 
+    return list(_evaluate_group_expression(input_name, resolve_name))
+
+
+def _get_journal_path(issue_url):
+    """Get the path of the journal of the broadcasts of an issue."""
+    return cache.get_cache_path(
+        BROADCAST_JOURNAL_CACHE, issue_url, suffix=".jsonl"
+    )
+
+
+def _read_journal(issue_url):
+    """Read the repos where the issue has already been created.
+
+    Returns
+    -------
+    repo_urls : set of str
+        The urls of the repos recorded in the journal of ``issue_url``.
+    """
+    repo_urls = set()
+    try:
+        with open(_get_journal_path(issue_url), "r") as f:
+            for line in f:
+                try:
+                    repo_urls.add(json.loads(line)["repo_url"])
+                except (ValueError, KeyError):
+                    # a line cut short by an interrupted broadcast
+                    continue
+    except OSError:
+        pass
+    return repo_urls
+
+
+def _append_to_journal(issue_url, repo_url, created_issue_url):
+    """Record that the issue has been created in a repo.
+
+    Each record is a line appended and flushed right after the issue is
+    created, so the journal survives a broadcast that dies halfway.
+    """
+    journal_path = _get_journal_path(issue_url)
+    record = {"repo_url": repo_url, "created_issue_url": created_issue_url}
+    line = json.dumps(record).encode() + b"\n"
+    with _journal_lock:
+        journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(journal_path, "ab+") as f:
+            # end a line cut short by an interrupted broadcast
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _build_repos_query(repo_urls):
+    """Build a GraphQL query checking several repositories at once.
+
+    Each repository is queried through an aliased ``repository`` field,
+    ``r0``, ``r1``, ..., whose owner and name are passed as variables.
+
+    Returns
+    -------
+    query : str
+        The GraphQL query.
+    variables : dict
+        The owner and name of each repository.
+    """
+    fields = []
+    variables = {}
+    for i, repo_url in enumerate(repo_urls):
+        path_parts = urlparse(repo_url).path.strip("/").split("/")
+        variables[f"owner{i}"] = path_parts[0]
+        variables[f"name{i}"] = path_parts[1]
+        fields.append(
+            f"r{i}: repository(owner: $owner{i}, name: $name{i}) "
+            "{ hasIssuesEnabled isArchived viewerPermission }"
+        )
+    params = ", ".join(f"${name}: String!" for name in variables)
+    return f"query({params}) {{ {' '.join(fields)} }}", variables
+
+
+def _get_repo_failure_reason(repository, error_type=None):
+    """Get the reason why an issue can not be created in a repository
+    returned by the GraphQL query, or None if it can be created.
+
+    Anyone who can read a repository can open issues in it, so any
+    ``viewerPermission`` is enough.
+    """
+    if repository is None:
+        return (error_type or "NOT_FOUND").lower().replace("_", " ")
+    if repository["isArchived"]:
+        return "archived"
+    if not repository["hasIssuesEnabled"]:
+        return "issues disabled"
+    if repository["viewerPermission"] is None:
+        return "no permission"
+    return None
+
+
+def _check_repos(repo_urls, headers):
+    """Check whether an issue can be created in each GitHub repository.
+
+    The repositories are checked in batches of ``GRAPHQL_BATCH_SIZE``
+    with one GraphQL query per batch, instead of one REST request per
+    repository.
+
+    Returns
+    -------
+    might_fail_gh_urls_info : list of tuple
+        The (url, failure reason) of each repo where the creation might
+        fail.
+    might_succeed_gh_urls : list of str
+        The urls of the repos where the issue might be created.
+    """
+    might_fail_gh_urls_info = []
+    might_succeed_gh_urls = []
+    for start in range(0, len(repo_urls), GRAPHQL_BATCH_SIZE):
+        batch = repo_urls[start : start + GRAPHQL_BATCH_SIZE]
+        query, variables = _build_repos_query(batch)
+        try:
+            response = http.post(
+                GRAPHQL_URL,
+                json={"query": query, "variables": variables},
+                headers=headers,
+            )
+            if response.status_code != 200:
+                raise ValueError(f"{response.status_code} {response.reason}")
+            result = response.json()
+        except (http.RequestException, ValueError) as e:
+            might_fail_gh_urls_info.extend((url, str(e)) for url in batch)
+            continue
+        data = result.get("data") or {}
+        error_types = {
+            error["path"][0]: error.get("type")
+            for error in result.get("errors", [])
+            if error.get("path")
+        }
+        for i, url in enumerate(batch):
+            failure_reason = _get_repo_failure_reason(
+                data.get(f"r{i}"), error_types.get(f"r{i}")
+            )
+            if failure_reason is None:
+                might_succeed_gh_urls.append(url)
+            else:
+                might_fail_gh_urls_info.append((url, failure_reason))
+    return might_fail_gh_urls_info, might_succeed_gh_urls
+
+
+def _skip_journaled_urls(issue_url, repo_urls, resume):
+    """Remove the repos where the issue has already been created from
+    the targets when resuming, otherwise warn about them.
+
+    Returns
+    -------
+    repo_urls : list of str
+        The urls of the remaining target repos.
+    """
+    journaled = _read_journal(issue_url)
+    done_urls = [url for url in repo_urls if url in journaled]
+    if not done_urls:
+        return repo_urls
+    if resume:
+        print(
+            "Resuming the broadcast: the issue has already been created in "
+            "the following repositories, which are skipped:"
+        )
+        for url in done_urls:
+            print(f"  - {url}")
+        return [url for url in repo_urls if url not in journaled]
+    print(
+        f"Warning: the issue has already been broadcast to {len(done_urls)} "
+        "of the target repositories. Rerun with '--resume' to skip them."
+    )
+    return repo_urls
+
+
+def _build_issue_search_query(repo_urls, title):
+    """Build a GraphQL query searching the open issues with a title in
+    several repositories at once.
+
+    Each repository is searched through an aliased ``search`` field,
+    ``s0``, ``s1``, ..., whose search query is passed as a variable.
+    """
+    fields = []
+    variables = {}
+    # the search syntax can not escape quotes, the titles of the results
+    # are compared to the exact title afterwards anyway
+    phrase = title.replace('"', " ")
+    for i, repo_url in enumerate(repo_urls):
+        path_parts = urlparse(repo_url).path.strip("/").split("/")
+        variables[f"q{i}"] = (
+            f"repo:{path_parts[0]}/{path_parts[1]} is:issue is:open "
+            f'in:title "{phrase}"'
+        )
+        fields.append(
+            f"s{i}: search(query: $q{i}, type: ISSUE, first: 100) "
+            "{ nodes { ... on Issue { title url } } }"
+        )
+    params = ", ".join(f"${name}: String!" for name in variables)
+    return f"query({params}) {{ {' '.join(fields)} }}", variables
+
+
+def _search_open_issues(repo_urls, title, headers):
+    """Search the open issues with the same title in each GitHub
+    repository.
+
+    The repositories are searched in batches of
+    ``DUPLICATE_SEARCH_BATCH_SIZE`` with one GraphQL query per batch.
+
+    Returns
+    -------
+    open_issue_urls : dict
+        The url of the open issue with the title, or None if there is
+        none, keyed by the url of each repo that could be searched.
+    """
+    open_issue_urls = {}
+    for start in range(0, len(repo_urls), DUPLICATE_SEARCH_BATCH_SIZE):
+        batch = repo_urls[start : start + DUPLICATE_SEARCH_BATCH_SIZE]
+        query, variables = _build_issue_search_query(batch, title)
+        try:
+            response = http.post(
+                GRAPHQL_URL,
+                json={"query": query, "variables": variables},
+                headers=headers,
+            )
+            if response.status_code != 200:
+                continue
+            data = response.json().get("data") or {}
+        except (http.RequestException, ValueError):
+            continue
+        for i, url in enumerate(batch):
+            search = data.get(f"s{i}")
+            if search is None:
+                continue
+            open_issue_urls[url] = next(
+                (
+                    node["url"]
+                    for node in search["nodes"]
+                    if node and node.get("title") == title
+                ),
+                None,
+            )
+    return open_issue_urls
+
+
+class GitHub(forges.Forge):
+    """GitHub, where the target repositories are checked and searched for
+    duplicates with batched GraphQL queries."""
+
+    name = "GitHub"
+    token_env = "GITHUB_TOKEN"
+
+    def __init__(self, token, concurrency=MAX_BROADCAST_WORKERS):
+        super().__init__(GITHUB_URL, token, concurrency)
+
+    def get_headers(self):
+        return {
+            "Authorization": f"token {self.token}",
+            "Accept": "application/vnd.github.v3+json",
+        }
+
+    def _send_issue(self, repo_url, data):
+        return http.post(
+            _get_api_url(repo_url, endpoint="issues"),
+            json=data,
+            headers=self.get_headers(),
+            limiter=self.limiter,
+        )
+
+    def check_repos(self, repo_urls):
+        might_fail_gh_urls_info, _ = _check_repos(
+            repo_urls, self.get_headers()
+        )
+        failure_reasons = dict.fromkeys(repo_urls)
+        failure_reasons.update(might_fail_gh_urls_info)
+        return failure_reasons
+
+    def _search_open_issues(self, repo_urls, title):
+        return _search_open_issues(repo_urls, title, self.get_headers())
+
+
+FORGE_TYPES = {"github": GitHub, **forges.FORGE_TYPES}
+
+
+def _get_forges(repo_urls, concurrency=MAX_BROADCAST_WORKERS):
+    """Get the forges hosting the target repos, authenticated with the
+    token of their environment variable, e.g. ``GITLAB_TOKEN``.
+
+    The type of the forge of each host is set by ``forges`` in
+    ~/.skpkgrc, e.g. ``{"gitlab.example.com": "gitlab"}``, in addition to
+    the public hosts in ``forges.DEFAULT_FORGE_HOSTS``.
+
+    Returns
+    -------
+    forges_by_url : dict
+        The forge keyed by its scheme and host, e.g. "https://gitlab.com".
+        The repos on other hosts, including the hosts other than GitHub
+        whose token is not set, are not supported.
+
+    Raises
+    ------
+    EnvironmentError
+        If the repos on GitHub are targeted and ``GITHUB_TOKEN`` is not
+        set.
+    """
+    try:
+        config_forges = io.read_skpkg_config(Path().home() / ".skpkgrc").get(
+            "forges"
+        )
+    except (FileNotFoundError, ValueError):
+        config_forges = None
+    forge_hosts = forges.get_forge_hosts(config_forges)
+    forges_by_url = {}
+    # the hosts whose token is not set
+    skipped_urls = set()
+    for repo_url in repo_urls:
+        parsed = urlparse(repo_url)
+        base_url = f"{parsed.scheme}://{parsed.netloc}"
+        if (
+            base_url in forges_by_url
+            or base_url in skipped_urls
+            or parsed.netloc not in forge_hosts
+        ):
+            continue
+        forge_type = forge_hosts[parsed.netloc]
+        if forge_type not in FORGE_TYPES:
+            raise ValueError(
+                f"The forge type `{forge_type}` of {parsed.netloc} is not "
+                f"supported. Please use one of {list(FORGE_TYPES)} in "
+                "`forges` of ~/.skpkgrc."
+            )
+        forge_class = FORGE_TYPES[forge_type]
+        if forge_class is GitHub and base_url != GITHUB_URL:
+            continue
+        token = os.environ.get(forge_class.token_env, None)
+        if token is None:
+            if forge_class is GitHub:
+                raise EnvironmentError(
+                    "GITHUB_TOKEN environment variable is not set. "
+                    "Please set it to a valid GitHub token with "
+                    "permissions to create issues in the target "
+                    "repositories."
+                )
+            print(
+                f"Warning: {forge_class.token_env} environment variable is "
+                f"not set, so the repositories on {parsed.netloc} are "
+                f"skipped. Please set it to a valid {forge_class.name} token "
+                "with permissions to create issues in the target "
+                "repositories."
+            )
+            skipped_urls.add(base_url)
+            continue
+        if forge_class is GitHub:
+            forges_by_url[base_url] = GitHub(token, concurrency)
+        else:
+            forges_by_url[base_url] = forge_class(base_url, token, concurrency)
+    return forges_by_url
+
+
+def _group_by_forge(repo_urls, forges_by_url):
+    """Group the target repos by the forge hosting them.
+
+    Returns
+    -------
+    unsupported_urls : list of str
+        The urls of the repos that are not on a supported forge.
+    urls_by_forge : dict
+        The urls of the repos of each forge.
+    """
+    unsupported_urls = []
+    urls_by_forge = {}
+    for repo_url in repo_urls:
+        parsed = urlparse(repo_url)
+        forge = forges_by_url.get(f"{parsed.scheme}://{parsed.netloc}")
+        if forge is None or forge.get_repo_path(repo_url) is None:
+            unsupported_urls.append(repo_url)
+        else:
+            urls_by_forge.setdefault(forge, []).append(repo_url)
+    return unsupported_urls, urls_by_forge
 
-def _broadcast_issue_to_urls(issue_content, repo_urls, gh_token, dry_run=True):
-    """Broadcast a issue to multiple GitHub repositories.
+
+def _run_per_forge(func, urls_by_forge):
+    """Run ``func(forge, repo_urls)`` for all forges in parallel, so that
+    each forge sends its requests at the same time as the others.
+
+    Returns
+    -------
+    results : dict
+        The results of all forges merged, keyed by repo url.
+    """
+    results = {}
+    if not urls_by_forge:
+        return results
+    with ThreadPoolExecutor(max_workers=len(urls_by_forge)) as executor:
+        for forge_results in executor.map(
+            lambda item: func(*item), urls_by_forge.items()
+        ):
+            results.update(forge_results)
+    return results
+
+
+def _skip_duplicate_urls(urls_by_forge, title, duplicates):
+    """Skip or flag the repos that already have an open issue with the
+    same title.
+
+    Parameters
+    ----------
+    urls_by_forge : dict
+        The urls of the target repos of each forge.
+    title : str
+        The title of the issue.
+    duplicates : {"skip", "flag"}
+        Whether to remove these repos from the targets or only warn
+        about them.
+
+    Returns
+    -------
+    urls_by_forge : dict
+        The urls of the remaining target repos of each forge.
+    """
+    repo_urls = [url for urls in urls_by_forge.values() for url in urls]
+    open_issue_urls = _run_per_forge(
+        lambda forge, urls: forge.find_open_issues(urls, title),
+        urls_by_forge,
+    )
+    unchecked_urls = [url for url in repo_urls if url not in open_issue_urls]
+    if unchecked_urls:
+        print(
+            f"Warning: {len(unchecked_urls)} of the target repositories "
+            "could not be searched for an open issue with the same title."
+        )
+    duplicate_urls = [url for url in repo_urls if open_issue_urls.get(url)]
+    if not duplicate_urls:
+        return urls_by_forge
+    if duplicates == "skip":
+        print(
+            "The following repositories already have an open issue "
+            "with the same title and are skipped:"
+        )
+    else:
+        print(
+            "Warning: the following repositories already have an "
+            "open issue with the same title. Rerun with "
+            "'--skip-duplicates y' to skip them:"
+        )
+    for url in duplicate_urls:
+        print(f"  - {url} ({open_issue_urls[url]})")
+    if duplicates == "skip":
+        return {
+            forge: [url for url in urls if url not in duplicate_urls]
+            for forge, urls in urls_by_forge.items()
+        }
+    return urls_by_forge
+
+
+def _broadcast_issue_to_urls(
+    issue_content,
+    repo_urls,
+    gh_token,
+    dry_run=True,
+    concurrency=MAX_BROADCAST_WORKERS,
+    issue_url=None,
+    resume=False,
+    duplicates=None,
+    forges_by_url=None,
+):
+    """Broadcast a issue to multiple repositories.
+
+    The repos are grouped by the forge hosting them, e.g. GitHub or a
+    GitLab instance, and all forges are sent their requests in parallel.
 
      Parameters
     ----------
@@ -311,13 +1078,31 @@ def _broadcast_issue_to_urls(issue_content, repo_urls, gh_token, dry_run=True):
         The urls to the target repos.
     gh_token : str
         GitHub token for authentication.
+    dry_run : bool, optional
+        Whether to only check the target repos. Default is True.
+    concurrency : int, optional
+        The maximum number of issues created at the same time on each
+        forge.
+    issue_url : str, optional
+        The url of the source issue. If given, each created issue is
+        recorded in the journal of the source issue.
+    resume : bool, optional
+        Whether to skip the repos where the journal of ``issue_url``
+        records that the issue has already been created.
+    duplicates : {"skip", "flag"}, optional
+        Whether to skip or only flag the repos that already have an open
+        issue with the same title. Default is None, which does not look
+        them up.
+    forges_by_url : dict, optional
+        The forges hosting the target repos, see ``_get_forges``.
+        Default is GitHub authenticated with ``gh_token`` only.
 
     Returns
     -------
-    non_gh_urls: list of str
-        The list of non-GitHub repo urls.
-    failed_gh_urls: list of str
-        The list of GhitHub repo urls where issue creation failed.
+    unsupported_urls: list of str
+        The list of repo urls that are not on a supported forge.
+    failed_urls: list of str
+        The list of repo urls where issue creation failed.
     dry_run: bool
         Whether it is in dry-run mode.
     """
@@ -325,53 +1110,55 @@ def _broadcast_issue_to_urls(issue_content, repo_urls, gh_token, dry_run=True):
         "title": issue_content["title"],
         "body": issue_content["body"],
     }
-    headers = {
-        "Authorization": f"token {gh_token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
-    non_gh_urls = []
-    for i in range(len(repo_urls)):
-        try:
-            api_url = _get_api_url(repo_urls[i])
-        except (IndexError, AssertionError):
-            non_gh_urls.append(repo_urls[i])
-    repo_urls = [url for url in repo_urls if url not in non_gh_urls]
+    if forges_by_url is None:
+        forges_by_url = {GITHUB_URL: GitHub(gh_token, concurrency)}
+    unsupported_urls, urls_by_forge = _group_by_forge(repo_urls, forges_by_url)
+    repo_urls = [url for url in repo_urls if url not in unsupported_urls]
+    if issue_url is not None:
+        remaining_urls = set(
+            _skip_journaled_urls(issue_url, repo_urls, resume)
+        )
+        urls_by_forge = {
+            forge: [url for url in urls if url in remaining_urls]
+            for forge, urls in urls_by_forge.items()
+        }
+    if duplicates is not None:
+        urls_by_forge = _skip_duplicate_urls(
+            urls_by_forge, data["title"], duplicates
+        )
     if dry_run:
-        might_fail_gh_urls_info = []
-        might_succeed_gh_urls = []
-        for i in range(len(repo_urls)):
-            api_url = _get_api_url(repo_urls[i], endpoint="repo")
-            response = requests.get(api_url)
-            try:
-                assert response.status_code == 200
-                assert response.json().get("owner", False)
-                might_succeed_gh_urls.append(repo_urls[i])
-            except (AssertionError, JSONDecodeError):
-                might_fail_gh_urls_info.append((repo_urls[i], response))
+        failure_reasons = _run_per_forge(
+            lambda forge, urls: forge.check_repos(urls), urls_by_forge
+        )
     else:
-        failed_gh_urls_info = []
-        success_gh_urls = []
-        for i in range(len(repo_urls)):
-            api_url = _get_api_url(repo_urls[i], endpoint="issues")
-            response = requests.post(api_url, json=data, headers=headers)
-            if response.status_code != 201:
-                failed_gh_urls_info.append((repo_urls[i], response))
-            else:
-                success_gh_urls.append(repo_urls[i])
+        on_created = None
+        if issue_url is not None:
+            on_created = functools.partial(_append_to_journal, issue_url)
+        failure_reasons = _run_per_forge(
+            lambda forge, urls: forge.create_issues(urls, data, on_created),
+            urls_by_forge,
+        )
+    # report the repos in the order of the targets
+    failed_urls_info = [
+        (url, failure_reasons[url])
+        for url in repo_urls
+        if failure_reasons.get(url) is not None
+    ]
+    success_urls = [
+        url
+        for url in repo_urls
+        if url in failure_reasons and failure_reasons[url] is None
+    ]
     if dry_run:
         _print_dry_run_message(
-            non_gh_urls,
-            might_fail_gh_urls_info,
-            might_succeed_gh_urls,
+            unsupported_urls, failed_urls_info, success_urls
         )
-        might_fail_gh_urls = [url for url, _ in might_fail_gh_urls_info]
-        return non_gh_urls, might_fail_gh_urls, dry_run
     else:
         _print_no_dry_run_message(
-            non_gh_urls, failed_gh_urls_info, success_gh_urls
+            unsupported_urls, failed_urls_info, success_urls
         )
-        failed_gh_urls = [url for url, _ in failed_gh_urls_info]
-        return non_gh_urls, failed_gh_urls, dry_run
+    failed_urls = [url for url, _ in failed_urls_info]
+    return unsupported_urls, failed_urls, dry_run
 
 
 def _get_api_url(repo_url, endpoint="issues"):
@@ -404,47 +1191,45 @@ def _get_api_url(repo_url, endpoint="issues"):
 
 
 def _print_dry_run_message(
-    non_gh_urls, might_fail_gh_urls_info, might_succeed_gh_urls
+    unsupported_urls, might_fail_urls_info, might_succeed_urls
 ):
     print(
         "Dry-run mode: No issues will be created. "
         "To create issues, rerun with the '--dry-run n' option."
     )
-    if len(non_gh_urls) > 0:
-        print("The following non-GitHub repository URLs will be skipped:")
-        for url in non_gh_urls:
-            print(f"  - {url}")
-    if len(might_fail_gh_urls_info) > 0:
-        print(
-            "Issue might fail to be created in the following GitHub "
-            "repositories:"
-        )
-        for url, response in might_fail_gh_urls_info:
-            print(f"  - [{response.status_code} {response.reason}] {url}")
-    if len(might_succeed_gh_urls) > 0:
+    if len(unsupported_urls) > 0:
         print(
-            "Issues would be created in the following GitHub " "repositories:"
+            "The following repository URLs are not on a supported forge "
+            "with a token and will be skipped:"
         )
-        for url in might_succeed_gh_urls:
+        for url in unsupported_urls:
+            print(f"  - {url}")
+    if len(might_fail_urls_info) > 0:
+        print("Issue might fail to be created in the following repositories:")
+        for url, failure_reason in might_fail_urls_info:
+            print(f"  - [{failure_reason}] {url}")
+    if len(might_succeed_urls) > 0:
+        print("Issues would be created in the following repositories:")
+        for url in might_succeed_urls:
             print(f"  - {url}")
 
 
 def _print_no_dry_run_message(
-    non_gh_urls, failed_gh_urls_info, success_gh_urls
+    unsupported_urls, failed_urls_info, success_urls
 ):
     print("Dry-run mode disabled: Issues will be created. ")
-    if len(non_gh_urls) > 0:
-        print("The following non-GitHub repository URLs will be skipped:")
-        for url in non_gh_urls:
-            print(f"  - {url}")
-    if len(failed_gh_urls_info) > 0:
-        print("Failed to create issue in the following GitHub repositories:")
-        for url, response in failed_gh_urls_info:
-            print(f"  - [{response.status_code} {response.reason}] {url}")
-    if len(success_gh_urls) > 0:
+    if len(unsupported_urls) > 0:
         print(
-            "Successfully created issues in the following "
-            "GitHub repositories:"
+            "The following repository URLs are not on a supported forge "
+            "with a token and will be skipped:"
         )
-        for url in success_gh_urls:
+        for url in unsupported_urls:
+            print(f"  - {url}")
+    if len(failed_urls_info) > 0:
+        print("Failed to create issue in the following repositories:")
+        for url, failure_reason in failed_urls_info:
+            print(f"  - [{failure_reason}] {url}")
+    if len(success_urls) > 0:
+        print("Successfully created issues in the following repositories:")
+        for url in success_urls:
             print(f"  - {url}")
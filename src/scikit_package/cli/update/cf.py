@@ -1,100 +1,365 @@
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import click
+from packaging.version import parse as parse_version
 
 from scikit_package.cli.create import SKPKG_GITHUB_URL
-from scikit_package.utils import auth, cookie, io, pypi
-from scikit_package.utils.shell import run
+from scikit_package.utils import (
+    auth,
+    cache,
+    cookie,
+    git,
+    http,
+    io,
+    pypi,
+    recipe,
+)
 
+MAX_PYPI_WORKERS = 8
+MAX_RELEASE_WORKERS = 4
+META_YAML_PATH = "recipe/meta.yaml"
+UPSTREAM_MAIN_REF = "refs/remotes/upstream/main"
+FEEDSTOCK_INDEX_CACHE = "feedstock-index"
 
-def _update_meta_yaml(meta_file_path, new_version, new_sha256):
-    """Update the meta.yaml file with the new version and SHA256."""
-    with open(meta_file_path, "r") as file:
-        lines = file.readlines()
-    with open(meta_file_path, "w") as file:
-        for line in lines:
-            if "{%- set version =" in line:
-                line = f'{{%- set version = "{new_version}" -%}}\n'
-            elif "{% set version =" in line:
-                line = f'{{% set version = "{new_version}" %}}\n'
-            elif "sha256:" in line:
-                line = f"  sha256: {new_sha256}\n"
-            file.write(line)
+
+def _read_upstream_meta_yaml(cwd):
+    """Get the text of the meta.yaml of the local upstream/main ref of a
+    feedstock, without fetching it.
+
+    Returns
+    -------
+    text : str or None
+        The text of the meta.yaml, or None if the ref or the file is
+        missing.
+    """
+    try:
+        return git.show_file(cwd, UPSTREAM_MAIN_REF, META_YAML_PATH)
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
+
+def _get_upstream_ref_mtime_ns(feedstock_dir):
+    """Get the mtimes of the files storing the upstream/main ref of a
+    feedstock, which change whenever the ref is fetched.
+
+    Returns
+    -------
+    mtime_ns : list or None
+        The mtime of the loose ref and of ``packed-refs``, each None if
+        the file is missing, or None if the feedstock has no ``.git``
+        directory.
+    """
+    git_dir = os.path.join(feedstock_dir, ".git")
+    if not os.path.isdir(git_dir):
+        return None
+    mtime_ns = []
+    for path in [
+        os.path.join(git_dir, *UPSTREAM_MAIN_REF.split("/")),
+        os.path.join(git_dir, "packed-refs"),
+    ]:
+        try:
+            mtime_ns.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtime_ns.append(None)
+    return mtime_ns
+
+
+def _is_meta_yaml_current(text, version, sha256):
+    """Check whether the text of a meta.yaml already has the version and
+    the SHA256."""
+    return recipe.read_version_sha256(text) == (version, sha256)
 
 
 def _check_remote_exists(cwd, pkg_name):
     """Add feedstock upstream remote if it is not configured."""
-    remotes = run("git remote", cwd=cwd, capture_output=True)
     feedstock_url = f"https://github.com/conda-forge/{pkg_name}-feedstock.git"
-    if "upstream" not in remotes.stdout.split():
-        run(
-            f"git remote add upstream {feedstock_url}",
-            cwd=cwd,
-        )
+    if "upstream" not in git.get_remotes(cwd):
+        git.run("remote", "add", "upstream", feedstock_url, cwd=cwd)
+
+
+def _fetch_upstream_meta_yaml(cwd, pkg_name):
+    """Fetch the latest upstream/main of the feedstock and get the text
+    of its meta.yaml, which the release commit is created from."""
+    _check_remote_exists(cwd, pkg_name)
+    git.run(
+        "fetch",
+        "--quiet",
+        "upstream",
+        "+refs/heads/main:refs/remotes/upstream/main",
+        cwd=cwd,
+    )
+    return git.show_file(cwd, "upstream/main", META_YAML_PATH)
+
+
+def _create_release_commit(cwd, text, version, SHA256):
+    """Create the release commit on top of upstream/main without
+    touching the working tree.
+
+    Parameters
+    ----------
+    text : str
+        The text of the meta.yaml of upstream/main.
+
+    Returns
+    -------
+    commit : str or None
+        The SHA of the release commit, or None if the meta.yaml of
+        upstream/main is left unchanged by the update.
+    """
+    new_text = recipe.update_text(text, version, SHA256)
+    if new_text == text:
+        return None
+    return git.commit_file(
+        cwd,
+        "upstream/main",
+        META_YAML_PATH,
+        new_text,
+        f"release: update to {version}",
+    )
+
+
+def _create_pull_request(cwd, pkg_name, username, version, body=None):
+    """Create the PR of the release branch to the conda-forge
+    feedstock.
+
+    Parameters
+    ----------
+    body : str, optional
+        The body of the PR. If None, ``gh`` prompts the user for it.
+    """
+    command = [
+        "gh",
+        "pr",
+        "create",
+        "--repo",
+        f"conda-forge/{pkg_name}-feedstock",
+        "--base",
+        "main",
+        "--head",
+        f"{username}:{version}",
+        "--title",
+        f"Release {version}",
+    ]
+    if body is not None:
+        command += ["--body", body]
+    subprocess.run(command, check=True, cwd=cwd)
+
+
+def _push_release_branch(cwd, text, version, SHA256):
+    """Push a branch name of <new_version> with the release commit to
+    origin.
+
+    The release commit is created from the latest upstream/main directly
+    in the object database, so the checked-out branch, the working tree
+    and the uncommitted changes of the feedstock are left as they are.
 
+    Parameters
+    ----------
+    text : str
+        The text of the meta.yaml of upstream/main.
 
-def _check_branch_exists(cwd, branch_name):
-    """Check if a branch exists in the current repository."""
-    branches = run("git branch", cwd=cwd, capture_output=True)
-    if branch_name in branches.stdout.split():
+    Returns
+    -------
+    pushed : bool
+        Whether the branch was pushed. False if there was nothing to
+        commit.
+    """
+    commit = _create_release_commit(cwd, text, version, SHA256)
+    if commit is None:
+        return False
+    if not git.create_branch(cwd, version, commit):
         raise ValueError(
-            f"The latest branch name of '{branch_name}' already exists. "
+            f"The latest branch name of '{version}' already exists. "
             "Please delete the branch by running git branch -D <branch> "
             "and try again."
         )
+    git.run("push", "--quiet", "origin", f"{version}:{version}", cwd=cwd)
+    return True
 
 
-def _run_commands(cwd, meta_file_path, version, SHA256, username, pkg_name):
+def _run_commands(cwd, version, SHA256, username, pkg_name):
     """Create a PR from a branch name of <new_version> to
-    upstream/main."""
-    _check_remote_exists(cwd, pkg_name)
-    _check_branch_exists(cwd, version)
-    run("git stash", cwd=cwd)
-    run("git checkout main", cwd=cwd)
-    run("git pull upstream main", cwd=cwd)
-    run(f"git checkout -b {version}", cwd=cwd)
-    _update_meta_yaml(meta_file_path, version, SHA256)
-    run("git add recipe/meta.yaml", cwd=cwd)
-    try:
-        run(f'git commit -m "release: update to {version}"', cwd=cwd)
-    except subprocess.CalledProcessError:
+    upstream/main, see ``_push_release_branch``.
+
+    The meta.yaml of the local upstream/main ref is checked first, so a
+    current feedstock is skipped without fetching upstream.
+
+    Returns
+    -------
+    created : bool
+        Whether the PR was created. False if there was nothing to commit.
+    """
+    text = _read_upstream_meta_yaml(cwd)
+    if text is None or not _is_meta_yaml_current(text, version, SHA256):
+        text = _fetch_upstream_meta_yaml(cwd, pkg_name)
+    if _is_meta_yaml_current(text, version, SHA256):
+        print(
+            f"Skipping {pkg_name}, the meta.yaml of upstream/main already "
+            f"has the latest version {version} and SHA256."
+        )
+        return False
+    if not _push_release_branch(cwd, text, version, SHA256):
         print(
             "\nError! There is nothing to commit! "
-            "Your meta.yaml already has the latest version and SHA256. "
-            "Please check the package has been successfully released to PyPI. "
+            "The meta.yaml of upstream/main could not be updated to the "
+            "latest version and SHA256. Please check the package has been "
+            "successfully released to PyPI. "
         )
-        return
-    run(f"git push origin {version}", cwd=cwd)
-    run(
-        f"gh repo set-default conda-forge/{pkg_name}-feedstock",
-        cwd=cwd,
-    )
-    pr_command = (
-        f"gh pr create --base main --head {username}:{version} "
-        f"--title 'Release {version}' "
+        return False
+    _create_pull_request(cwd, pkg_name, username, version)
+    return True
+
+
+def _update_outdated_feedstock(cwd, version, SHA256, pkg_name):
+    """Push the release branch of a feedstock if the version in the
+    meta.yaml of its upstream/main is older than ``version``.
+
+    Returns
+    -------
+    current_version : str or None
+        The version in the meta.yaml of upstream/main.
+    status : str
+        "pushed", "up to date" or "nothing to commit".
+    """
+    text = _fetch_upstream_meta_yaml(cwd, pkg_name)
+    current_version, _ = recipe.read_version_sha256(text)
+    if current_version is not None and parse_version(version) <= parse_version(
+        current_version
+    ):
+        return current_version, "up to date"
+    if not _push_release_branch(cwd, text, version, SHA256):
+        return current_version, "nothing to commit"
+    return current_version, "pushed"
+
+
+def _index_feedstock(feedstock_path, feedstock_name, entry):
+    """Get the index entry of a feedstock, reusing ``entry`` if its
+    upstream/main ref has not been fetched since it was indexed."""
+    feedstock_dir = os.path.join(feedstock_path, feedstock_name)
+    upstream_mtime_ns = _get_upstream_ref_mtime_ns(feedstock_dir)
+    if (
+        entry is not None
+        and upstream_mtime_ns is not None
+        and entry.get("upstream_mtime_ns") == upstream_mtime_ns
+    ):
+        return entry
+    text = _read_upstream_meta_yaml(feedstock_dir)
+    version, sha256 = (
+        recipe.read_version_sha256(text) if text is not None else (None, None)
     )
-    run(pr_command, cwd=cwd)
+    return {
+        "path": feedstock_dir,
+        "upstream_mtime_ns": upstream_mtime_ns,
+        "version": version,
+        "sha256": sha256,
+    }
 
 
 def _list_feedstock(feedstock_path):
-    """List all feedstocks in the feedstock directory."""
-    feedstock_path = io.get_config_value("feedstock_path")
-    feedstocks = [
-        f
-        for f in os.listdir(feedstock_path)
-        if f.endswith("-feedstock")
-        and os.path.isdir(os.path.join(feedstock_path, f))
-    ]
+    """List all feedstocks in the feedstock directory.
+
+    The feedstocks are read from an index cached per feedstock directory
+    and refreshed incrementally. The directory is only listed again when
+    its mtime changed, i.e. when a feedstock was added or removed. The
+    version and SHA256 are read from the meta.yaml of the local
+    upstream/main ref, which the release commit is created from, and
+    only read again when the ref was fetched.
+
+    Parameters
+    ----------
+    feedstock_path : str
+        The path to the directory containing the feedstocks.
+
+    Returns
+    -------
+    feedstocks : dict
+        The path, upstream/main ref mtimes, version and SHA256 of each
+        feedstock, keyed by its name, e.g. "scikit-package-feedstock".
+    """
+    feedstock_path = os.path.abspath(os.path.expanduser(feedstock_path))
+    index = cache.read_entry(FEEDSTOCK_INDEX_CACHE, feedstock_path) or {}
+    indexed = index.get("feedstocks", {})
+    mtime_ns = os.stat(feedstock_path).st_mtime_ns
+    if index.get("mtime_ns") == mtime_ns:
+        feedstock_names = list(indexed)
+    else:
+        feedstock_names = sorted(
+            f
+            for f in os.listdir(feedstock_path)
+            if f.endswith("-feedstock")
+            and (
+                f in indexed or os.path.isdir(os.path.join(feedstock_path, f))
+            )
+        )
+    feedstocks = {
+        name: _index_feedstock(feedstock_path, name, indexed.get(name))
+        for name in feedstock_names
+    }
+    if index.get("mtime_ns") != mtime_ns or feedstocks != indexed:
+        cache.write_entry(
+            FEEDSTOCK_INDEX_CACHE,
+            feedstock_path,
+            {"mtime_ns": mtime_ns, "feedstocks": feedstocks},
+        )
     if not feedstocks:
         raise ValueError(
             f"No feedstocks found in {feedstock_path}. "
-            "Please ensure you have feedstocks cloned in {feedstock_path}."
+            f"Please ensure you have feedstocks cloned in {feedstock_path}."
         )
     return feedstocks
 
 
-def update_conda_forge():
+def _get_latest_version_sha(pkg_name, verify=False):
+    """Get the latest stable version of a package on PyPI and the SHA256
+    of its sdist."""
+    pkg_pypi_data = pypi.get_pypi_version_sha(pkg_name, count=1, verify=verify)
+    if not pkg_pypi_data:
+        raise ValueError(f"No sdist of {pkg_name} is found on PyPI.")
+    return next(iter(pkg_pypi_data.items()))
+
+
+def _lookup_feedstocks(
+    feedstock_names, max_workers=MAX_PYPI_WORKERS, verify=False
+):
+    """Look up the latest PyPI version of the feedstocks concurrently.
+
+    Parameters
+    ----------
+    feedstock_names : list of str
+        The names of the feedstocks, e.g. ["scikit-package-feedstock"].
+    max_workers : int, optional
+        The maximum number of concurrent lookups.
+    verify : bool, optional
+        Whether to download the sdists and verify their SHA256.
+
+    Yields
+    ------
+    feedstock_name : str
+        The name of the feedstock, in the order the lookups finish.
+    version_sha : tuple of str or None
+        The latest version and its SHA256, or None if the lookup failed.
+    error : Exception or None
+        The reason of the failure, or None if the lookup succeeded.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _get_latest_version_sha,
+                feedstock_name.replace("-feedstock", ""),
+                verify,
+            ): feedstock_name
+            for feedstock_name in feedstock_names
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except (ValueError, KeyError, http.RequestException) as e:
+                yield futures[future], None, e
+
+
+def update_conda_forge(verify=False):
     """Update the Python package version and SHA256 hash in a meta.yaml
     file, and create a pull request to the upstream feedstock
     repository.
@@ -106,34 +371,60 @@ def update_conda_forge():
     - Commit and push the changes to a <username>/<version> branch on GitHub.
     - Create a pull request to conda-forge/main.
     - Prompt the user to use the pull request template via the CLI.
+
+    The PyPI lookups run concurrently and each feedstock is listed as
+    soon as its lookup finishes. Feedstocks whose lookup failed are listed
+    with the reason but can not be selected. Each feedstock is marked as
+    current or outdated from the meta.yaml of its local upstream/main
+    ref, which the release commit is created from.
+
+    Parameters
+    ----------
+    verify : bool, optional
+        Whether to download the sdists and verify their SHA256 before
+        listing them.
     """
-    feedstock_path = io.get_config_value("feedstock_path")
-    feedstock_names = _list_feedstock(feedstock_path)
+    feedstocks = _list_feedstock(io.get_config_value("feedstock_path"))
     print("Available feedstocks with the latest PyPI version/SHA256:")
     version_map = {}
-    for i, feedstock_name in enumerate(feedstock_names, start=1):
+    for feedstock_name, version_sha, error in _lookup_feedstocks(
+        feedstocks, verify=verify
+    ):
         pkg_name = feedstock_name.replace("-feedstock", "")
-        pkg_pypi_data = pypi.get_pypi_version_sha(pkg_name, count=1)
-        pkg_version, pkg_sha256 = next(iter(pkg_pypi_data.items()))
+        if error is not None:
+            print(f"  -  {pkg_name}, failed to fetch from PyPI: {error}")
+            continue
+        pkg_version, pkg_sha256 = version_sha
+        feedstock = feedstocks[feedstock_name]
+        i = len(version_map) + 1
         version_map[i] = {
             "package_name": pkg_name,
             "version": pkg_version,
             "sha256": pkg_sha256,
-            "feedstock_dir_path": os.path.join(feedstock_path, feedstock_name),
-            "meta_file_path": os.path.join(
-                feedstock_path, feedstock_name, "recipe", "meta.yaml"
-            ),
+            "feedstock_dir_path": feedstock["path"],
         }
-        print(f"  {i}. {pkg_name}, {pkg_version}, SHA256: {pkg_sha256[:5]}..")
+        status = (
+            "current"
+            if (feedstock["version"], feedstock["sha256"]) == version_sha
+            else "outdated"
+        )
+        print(
+            f"  {i}. {pkg_name}, {pkg_version}, "
+            f"SHA256: {pkg_sha256[:5]}.. ({status})"
+        )
+    if not version_map:
+        raise ValueError(
+            "Failed to fetch the latest version of any feedstock from PyPI. "
+            "Please check your network connection and try again."
+        )
     choice = click.prompt(
         "Enter the corresponding number of the feedstock you want to update",
-        type=click.IntRange(1, len(feedstock_names)),
+        type=click.IntRange(1, len(version_map)),
     )
     selected = version_map[choice]
     username = auth.get_github_username()
     _run_commands(
         selected["feedstock_dir_path"],
-        selected["meta_file_path"],
         selected["version"],
         selected["sha256"],
         username,
@@ -141,9 +432,135 @@ def update_conda_forge():
     )
 
 
+def _print_bulk_update_summary(results):
+    """Print the result of each feedstock as a table."""
+    header = ("Package", "Recipe", "PyPI", "Result")
+    rows = [header] + [
+        (
+            r["package_name"],
+            r["current_version"] or "-",
+            r["version"] or "-",
+            r["result"],
+        )
+        for r in sorted(results, key=lambda r: r["package_name"])
+    ]
+    widths = [max(len(row[i]) for row in rows) for i in range(3)]
+    for row in rows:
+        cells = [cell.ljust(width) for cell, width in zip(row, widths)]
+        print("  " + "  ".join(cells + [row[3]]))
+
+
+def update_all_outdated_feedstocks(
+    max_workers=MAX_RELEASE_WORKERS, verify=False
+):
+    """Create a pull request for every feedstock whose recipe is older
+    than the latest version on PyPI.
+
+    The version set in the ``recipe/meta.yaml`` of the local
+    upstream/main ref of each feedstock, read from the feedstock index,
+    is compared with the latest stable version on PyPI, so the current
+    feedstocks are skipped without any network request. The latest
+    upstream/main of the other feedstocks is fetched and checked again,
+    then the branch, commit and push of the outdated feedstocks are
+    created, all in parallel. Since the release commits
+    are created from upstream/main in the object database of each
+    feedstock, the local checkouts are never read or modified and no
+    worktree is needed. The pull requests are then created one at a time
+    with a body, so ``gh`` never prompts. A summary table of the results
+    is printed at the end.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        The maximum number of feedstocks updated concurrently.
+    verify : bool, optional
+        Whether to download the sdists and verify their SHA256.
+
+    Returns
+    -------
+    results : list of dict
+        The package name, recipe and PyPI versions and result of each
+        feedstock.
+    """
+    feedstocks = _list_feedstock(io.get_config_value("feedstock_path"))
+    results = []
+    outdated = []
+    for feedstock_name, version_sha, error in _lookup_feedstocks(
+        feedstocks, verify=verify
+    ):
+        feedstock = feedstocks[feedstock_name]
+        result = {
+            "package_name": feedstock_name.replace("-feedstock", ""),
+            "current_version": feedstock["version"],
+            "version": None,
+            "sha256": None,
+            "feedstock_dir_path": feedstock["path"],
+        }
+        results.append(result)
+        if error is not None:
+            result["result"] = f"failed to fetch from PyPI: {error}"
+            continue
+        result["version"], result["sha256"] = version_sha
+        if result["current_version"] is not None and parse_version(
+            result["version"]
+        ) <= parse_version(result["current_version"]):
+            result["result"] = "up to date"
+            continue
+        outdated.append(result)
+    pushed = []
+    if outdated:
+        print(f"Updating {len(outdated)} outdated feedstock(s)...")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _update_outdated_feedstock,
+                    r["feedstock_dir_path"],
+                    r["version"],
+                    r["sha256"],
+                    r["package_name"],
+                ): r
+                for r in outdated
+            }
+            for future in as_completed(futures):
+                r = futures[future]
+                try:
+                    r["current_version"], status = future.result()
+                except (subprocess.CalledProcessError, ValueError) as e:
+                    r["result"] = f"failed: {e}"
+                    continue
+                if status == "pushed":
+                    pushed.append(r)
+                else:
+                    r["result"] = status
+    if pushed:
+        username = auth.get_github_username()
+    for r in sorted(pushed, key=lambda r: r["package_name"]):
+        try:
+            _create_pull_request(
+                r["feedstock_dir_path"],
+                r["package_name"],
+                username,
+                r["version"],
+                body=(
+                    f"Update {r['package_name']} to {r['version']}, "
+                    "the latest version on PyPI."
+                ),
+            )
+            r["result"] = "PR created"
+        except subprocess.CalledProcessError as e:
+            r["result"] = f"failed: {e}"
+    print("Summary of the conda-forge feedstock updates:")
+    _print_bulk_update_summary(results)
+    return results
+
+
 def update(args):
     subcmd = args.subcommand
     if subcmd == "conda-forge":
-        update_conda_forge()
+        verify = getattr(args, "verify", False)
+        if getattr(args, "all_outdated", False):
+            update_all_outdated_feedstocks(verify=verify)
+        else:
+            update_conda_forge(verify=verify)
     elif subcmd is None:
         cookie.run(SKPKG_GITHUB_URL, update=True)
@@ -1,16 +1,47 @@
 import argparse
 from argparse import ArgumentParser
+from importlib import import_module
 
-from scikit_package.cli import add, create
-from scikit_package.cli.build import api_doc
-from scikit_package.cli.gh import broadcast_issue_to_repos
-from scikit_package.cli.update import cf
 from scikit_package.version import __version__
 
 SKPKG_GITHUB_URL = "https://github.com/scikit-package/scikit-package"
 
+# Handlers are referenced by "<module>:<function>" import paths and only
+# imported once their subcommand is dispatched, so that light commands
+# such as `package add news` do not pay for importing `requests`, `yaml`,
+# `click` and `packaging`.
+CREATE_HANDLER = "scikit_package.cli.create:package"
+ADD_NEWS_HANDLER = "scikit_package.cli.add:news_item"
+UPDATE_HANDLER = "scikit_package.cli.update.cf:update"
+BUILD_HANDLER = "scikit_package.cli.build.api_doc:build"
+BROADCAST_HANDLER = "scikit_package.cli.gh:broadcast_issue_to_repos"
 
-def _add_subcommands(subparsers, commands, func, special_args={}):
+
+def _lazy_handler(import_path):
+    """Return a handler that imports ``import_path`` when it is called.
+
+    Parameters
+    ----------
+    import_path : str
+        The handler location in the form of ``<module>:<function>``.
+
+    Returns
+    -------
+    handler : callable
+        The function taking the parsed ``args`` that imports the module
+        and dispatches to the handler.
+    """
+    module_name, func_name = import_path.split(":")
+
+    def handler(args):
+        func = getattr(import_module(module_name), func_name)
+        return func(args)
+
+    handler.import_path = import_path
+    return handler
+
+
+def _add_subcommands(subparsers, commands, handler_path, special_args={}):
     """Helper function to add subcommands to a parser."""
     for command, help_text in commands:
         parser_sub = subparsers.add_parser(
@@ -18,7 +49,22 @@ def _add_subcommands(subparsers, commands, func, special_args={}):
         )
         if command in special_args:
             special_args[command](parser_sub)
-        parser_sub.set_defaults(func=func, subcommand=command)
+        parser_sub.set_defaults(
+            func=_lazy_handler(handler_path), subcommand=command
+        )
+
+
+def _positive_int(value):
+    """Parse a positive integer argument, e.g. ``--concurrency``."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"must be a positive integer, but it is {value!r}"
+        )
+    return number
 
 
 def _add_news_flags(p):
@@ -47,7 +93,11 @@ def _add_broadcast_args(p):
     p.add_argument(
         "group_name",
         type=str,
-        help="The name of the group of repositories to broadcast to.",
+        help=(
+            "The name of the group of repositories to broadcast to, or an "
+            "expression combining groups, e.g. 'group1 | group2' or "
+            "'group1 - group2'."
+        ),
     )
     p.add_argument(
         "--url-to-repo-info",
@@ -70,13 +120,71 @@ def _add_broadcast_args(p):
             "repositories (default: y)."
         ),
     )
+    p.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=4,
+        help=(
+            "The maximum number of issues created at the same time "
+            "(default: 4)."
+        ),
+    )
+    p.add_argument(
+        "--skip-duplicates",
+        choices=["y", "n"],
+        default="y",
+        help=(
+            "Specify whether to skip the repositories that already have an "
+            "open issue with the same title (y/n). With n, they are only "
+            "flagged (default: y)."
+        ),
+    )
+    p.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Skip the repositories where a previous broadcast of the issue "
+            "has already created it."
+        ),
+    )
+
+
+def _add_update_conda_forge_args(p):
+    """Helper function to add flags for `package update conda-forge`."""
+    p.add_argument(
+        "--all-outdated",
+        action="store_true",
+        help=(
+            "Create a PR for every feedstock whose recipe is older than the "
+            "latest version on PyPI, without prompting."
+        ),
+    )
+    p.add_argument(
+        "--verify",
+        action="store_true",
+        help=(
+            "Download the sdist from PyPI and verify its SHA256 instead of "
+            "trusting the digest listed by PyPI."
+        ),
+    )
 
 
 def setup_subparsers(parser):
     # "create" subparser
     parser_create = parser.add_parser("create", help="Create a new package")
+    parser_create.add_argument(
+        "--batch",
+        metavar="MANIFEST",
+        help=(
+            "Create all packages listed in a YAML manifest file "
+            "non-interactively and in parallel. The manifest contains a "
+            "list of cookiecutter contexts under `packages` and optionally "
+            "`template`, `output_dir` and `max_workers`."
+        ),
+    )
+    parser_create.set_defaults(func=_lazy_handler(CREATE_HANDLER))
     subparsers_create = parser_create.add_subparsers(
-        dest="subcommand", required=True
+        dest="subcommand", required=False
     )
     create_commands = [
         ("workspace", "Create a workspace package"),
@@ -85,7 +193,7 @@ def setup_subparsers(parser):
         ("conda-forge", "Create a conda-forge recipe meta.yml file"),
         ("manuscript", "Create a LaTeX manuscript project"),
     ]
-    _add_subcommands(subparsers_create, create_commands, create.package)
+    _add_subcommands(subparsers_create, create_commands, CREATE_HANDLER)
     # "add" subparser
     parser_add = parser.add_parser(
         "add", help="Add a new file like a news item"
@@ -112,7 +220,7 @@ def setup_subparsers(parser):
     parser_update = parser.add_parser(
         "update", help="Update an existing scikit-package standard package."
     )
-    parser_update.set_defaults(func=cf.update)
+    parser_update.set_defaults(func=_lazy_handler(UPDATE_HANDLER))
     subparsers_update = parser_update.add_subparsers(
         dest="subcommand", required=False
     )
@@ -122,7 +230,12 @@ def setup_subparsers(parser):
             "Update conda-forge recipe meta.yml file after release.",
         ),
     ]
-    _add_subcommands(subparsers_update, update_commands, cf.update)
+    _add_subcommands(
+        subparsers_update,
+        update_commands,
+        UPDATE_HANDLER,
+        special_args={"conda-forge": _add_update_conda_forge_args},
+    )
     # "build" subparser
     parser_build = parser.add_parser("build", help="Build API docs")
     subparsers_build = parser_build.add_subparsers(
@@ -134,15 +247,17 @@ def setup_subparsers(parser):
             "Generate API in docs/source/api for namespace import package.",
         ),
     ]
-    _add_subcommands(subparsers_build, build_commands, api_doc.build)
+    _add_subcommands(subparsers_build, build_commands, BUILD_HANDLER)
     _add_news_flags(parser_news)
-    parser_news.set_defaults(func=add.news_item, subcommand="news")
+    parser_news.set_defaults(
+        func=_lazy_handler(ADD_NEWS_HANDLER), subcommand="news"
+    )
 
     parser_broadcast = parser.add_parser(
         "broadcast", help="Broadcast a issue to many GitHub repositories."
     )
     _add_broadcast_args(parser_broadcast)
-    parser_broadcast.set_defaults(func=broadcast_issue_to_repos)
+    parser_broadcast.set_defaults(func=_lazy_handler(BROADCAST_HANDLER))
 
 
 def main():
@@ -155,9 +270,12 @@ def main():
     >>> package create public
     >>> package create manuscript
     >>> package create conda-forge
+    >>> package create --batch manifest.yaml
     >>> package add news -a -m "Add awesome news item."
     >>> package add news -n -m "Fix minor typo."
     >>> package update conda-forge
+    >>> package update conda-forge --all-outdated
+    >>> package update conda-forge --verify
     >>> package update (Not implemented yet)
     """
     parser = ArgumentParser(
@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from urllib.parse import quote
+
+SKPKG_CACHE_DIR_NAME = "scikit-package"
+
+
+def get_cache_dir():
+    """Get the directory where scikit-package stores its cached data.
+
+    The directory is ``$SKPKG_CACHE_DIR`` if the environment variable is
+    set, otherwise ``$XDG_CACHE_HOME/scikit-package``, falling back to
+    ``~/.cache/scikit-package``.
+
+    Returns
+    -------
+    cache_dir : Path
+        The path to the cache directory. It is not created by this function.
+    """
+    cache_dir = os.environ.get("SKPKG_CACHE_DIR")
+    if cache_dir:
+        return Path(os.path.expandvars(cache_dir)).expanduser()
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        return Path(xdg_cache_home).expanduser() / SKPKG_CACHE_DIR_NAME
+    return Path.home() / ".cache" / SKPKG_CACHE_DIR_NAME
+
+
+def get_cache_path(namespace, key, suffix=".json"):
+    """Get the path of the cache file storing ``key`` in ``namespace``.
+
+    Parameters
+    ----------
+    namespace : str
+        The name of the sub-directory grouping related entries,
+        e.g. "release-tags".
+    key : str
+        The key of the entry, e.g. "scikit-package/scikit-package".
+    suffix : str, optional
+        The file extension of the cache file. Default is ".json".
+
+    Returns
+    -------
+    path : Path
+        The path to the cache file.
+    """
+    return get_cache_dir() / namespace / f"{quote(key, safe='')}{suffix}"
+
+
+def read_entry(namespace, key):
+    """Read a cached JSON entry.
+
+    Returns
+    -------
+    entry : dict or None
+        The cached entry, or None if it is missing or unreadable.
+    """
+    path = get_cache_path(namespace, key)
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_entry(namespace, key, entry):
+    """Write a JSON entry to the cache atomically.
+
+    The entry is written to a temporary file that then replaces the cache
+    file, so concurrent readers never see a partially written entry.
+    Failing to write the cache, e.g. on a read-only home directory, is
+    not an error.
+
+    Parameters
+    ----------
+    namespace : str
+        The name of the sub-directory grouping related entries.
+    key : str
+        The key of the entry.
+    entry : dict
+        The JSON-serializable data to be cached.
+    """
+    path = get_cache_path(namespace, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
@@ -1,28 +1,146 @@
 import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-from scikit_package.utils import io, pypi
+from cookiecutter.exceptions import CookiecutterException
+from cookiecutter.main import cookiecutter
 
+from scikit_package.utils import io, mirror, pypi
 
-def run(repo_url, update=False):
-    """Run cookiecutter with optional config file."""
+
+def _get_latest_release_tag(repo_url):
     username_or_orgname = repo_url.split("/")[3]
     repo_name = repo_url.split("/")[4]
-    tag = io.get_latest_release_tag(username_or_orgname, repo_name)
+    return repo_name, io.get_latest_release_tag(username_or_orgname, repo_name)
+
+
+def run(repo_url, update=False):
+    """Run cookiecutter with optional config file."""
+    repo_name, tag = _get_latest_release_tag(repo_url)
     if repo_name == "scikit-package-conda-forge":
         package_name = input(
             "Enter the package name to check whether it's available on PyPI: "
         )
         pypi.check_pypi_package_exists(package_name)
     print(f"> The latest release version of {tag} of {repo_name} is used.")
+    checkout = None
+    try:
+        template = str(mirror.checkout_template(repo_url, tag))
+    except (OSError, subprocess.CalledProcessError):
+        print(
+            "> The local template mirror is unavailable, "
+            f"cloning {repo_url} instead."
+        )
+        template, checkout = repo_url, tag
+    # The private `_` entries, e.g. `_extensions`, are the settings of the
+    # template the project was created with, not answers of the user, so
+    # the ones of the new template are used.
+    extra_context = {
+        key: value
+        for key, value in io.get_extra_context().items()
+        if not key.startswith("_")
+    }
+    extra_context["_is_skpkg_update"] = "Yes" if update else "No"
     try:
-        cmd = ["cookiecutter", repo_url]
-        cmd.extend(["--checkout", tag])
-        config_cmd = io.get_config_cmd()
-        if update:
-            config_cmd.extend(["_is_skpkg_update=Yes"])
-        else:
-            config_cmd.extend(["_is_skpkg_update=No"])
-        cmd.extend(config_cmd)
-        subprocess.run(cmd, check=True)
-    except subprocess.CalledProcessError as e:
+        cookiecutter(
+            template,
+            checkout=checkout,
+            extra_context=extra_context,
+            config_file=io.get_config_file(),
+        )
+    # cookiecutter raises ValueError when a value of the project does not
+    # fit a variable of the new template, e.g. a changed choice list.
+    except (CookiecutterException, ValueError) as e:
         print(f"Failed to run scikit-package for the following reason: {e}")
+
+
+def _render(template, extra_context, output_dir, config_file):
+    """Render one package without prompts in a worker process.
+
+    Returns
+    -------
+    elapsed : float
+        The time spent on rendering the package in seconds.
+    error : str or None
+        The reason of the failure, or None if the package was created.
+    """
+    start = time.perf_counter()
+    try:
+        cookiecutter(
+            template,
+            no_input=True,
+            extra_context=extra_context,
+            output_dir=output_dir,
+            config_file=config_file,
+        )
+        error = None
+    # Any failure only concerns this package and is reported with the
+    # others once the batch is done.
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    return time.perf_counter() - start, error
+
+
+def run_batch(repo_url, contexts, output_dir=".", max_workers=None):
+    """Render the template for many packages in parallel without
+    prompts.
+
+    The latest release tag is resolved and checked out of the local
+    template mirror once, then every package is rendered from that same
+    checkout across a pool of processes. If the template can not be
+    checked out, every package is reported as failed with the reason.
+
+    Parameters
+    ----------
+    repo_url : str
+        The URL of the template repository.
+    contexts : list of dict
+        The cookiecutter context of each package, e.g.
+        [{"project_name": "diffpy.my-project"}, ...].
+    output_dir : str, optional
+        The directory where the packages are created. Default is the
+        current working directory.
+    max_workers : int, optional
+        The maximum number of worker processes. Default is the number of
+        CPUs.
+
+    Returns
+    -------
+    results : list of tuple
+        The (name, elapsed, error) of each package in the order of
+        ``contexts``, where ``error`` is None for created packages.
+    """
+    repo_name, tag = _get_latest_release_tag(repo_url)
+    print(f"> The latest release version of {tag} of {repo_name} is used.")
+    names = [
+        context.get("project_name", f"package #{i}")
+        for i, context in enumerate(contexts, start=1)
+    ]
+    try:
+        template = str(mirror.checkout_template(repo_url, tag))
+    except (OSError, subprocess.CalledProcessError) as e:
+        reason = str(e) or type(e).__name__
+        error = f"the template could not be checked out: {reason}"
+        for name in names:
+            print(f"  - {name}: failed ({error})")
+        return [(name, 0.0, error) for name in names]
+    config_file = io.get_config_file()
+    results = [None] * len(contexts)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _render,
+                template,
+                {**context, "_is_skpkg_update": "No"},
+                output_dir,
+                config_file,
+            ): i
+            for i, context in enumerate(contexts)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            elapsed, error = future.result()
+            results[i] = (names[i], elapsed, error)
+            status = "created" if error is None else f"failed ({error})"
+            print(f"  - {names[i]}: {status} in {elapsed:.2f} s")
+    return results
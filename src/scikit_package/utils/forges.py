@@ -0,0 +1,339 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlparse
+
+from scikit_package.utils import http
+
+MAX_WORKERS = 4
+# the forges of the public hosts, the self-hosted ones are set with
+# `forges` in ~/.skpkgrc
+DEFAULT_FORGE_HOSTS = {
+    "github.com": "github",
+    "gitlab.com": "gitlab",
+    "codeberg.org": "gitea",
+    "gitea.com": "gitea",
+}
+
+_NOT_SEARCHED = object()
+# the url of the open issue of each (repo url, title), or None if there
+# is none, looked up on any forge during this run
+_open_issue_urls = {}
+
+
+def clear_cache():
+    """Forget the open issues looked up in this run."""
+    _open_issue_urls.clear()
+
+
+class Forge(ABC):
+    """A host of repositories where issues can be created, e.g. a GitLab
+    instance.
+
+    Each forge sends its requests through its own pool of threads and its
+    own rate limiter, so a slow or rate-limited forge does not hold back
+    the others. The subclasses implement the requests of the API of the
+    forge, e.g. through ``RestApiMixin``.
+
+    Parameters
+    ----------
+    base_url : str
+        The scheme and host of the forge, e.g. "https://gitlab.com".
+    token : str
+        The token used to authenticate the requests.
+    concurrency : int, optional
+        The maximum number of requests sent at the same time.
+    """
+
+    name = None
+    token_env = None  # the environment variable holding the token
+
+    def __init__(self, base_url, token, concurrency=MAX_WORKERS):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.concurrency = concurrency
+        self.limiter = http.RateLimiter()
+
+    def get_repo_path(self, repo_url):
+        """Get the path of a repository on the forge, e.g.
+        "owner/repo", or None if the url does not point to a repository
+        of this forge."""
+        parsed = urlparse(repo_url)
+        if f"{parsed.scheme}://{parsed.netloc}" != self.base_url:
+            return None
+        path = parsed.path.strip("/").removesuffix(".git")
+        if len(path.split("/")) < 2:
+            return None
+        return path
+
+    def _map(self, func, repo_urls):
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return list(executor.map(func, repo_urls))
+
+    def _request(self, method, url, **kwargs):
+        return http.request(
+            method,
+            url,
+            headers=self.get_headers(),
+            limiter=self.limiter,
+            **kwargs,
+        )
+
+    @abstractmethod
+    def get_headers(self):
+        """Get the headers authenticating a request."""
+
+    def create_issue(self, repo_url, data, on_created=None):
+        """Create an issue in a repository.
+
+        Parameters
+        ----------
+        repo_url : str
+            The url of the repository.
+        data : dict
+            The ``title`` and ``body`` of the issue.
+        on_created : callable, optional
+            Called with the url of the repository and the url of the
+            created issue once it is created.
+
+        Returns
+        -------
+        failure_reason : str or None
+            The reason of the failure, or None if the issue was created.
+        """
+        try:
+            response = self._send_issue(repo_url, data)
+        except http.RequestException as e:
+            return str(e)
+        if response.status_code != 201:
+            return f"{response.status_code} {response.reason}"
+        if on_created is not None:
+            try:
+                created_issue_url = self._get_created_issue_url(
+                    response.json()
+                )
+            except ValueError:
+                created_issue_url = None
+            on_created(repo_url, created_issue_url)
+        return None
+
+    @abstractmethod
+    def _send_issue(self, repo_url, data):
+        """Send the request creating an issue in a repository."""
+
+    def _get_created_issue_url(self, issue):
+        return issue.get("html_url")
+
+    def create_issues(self, repo_urls, data, on_created=None):
+        """Create an issue in each repository concurrently.
+
+        Returns
+        -------
+        failure_reasons : dict
+            The reason of the failure, or None if the issue was created,
+            keyed by the url of each repository.
+        """
+        failure_reasons = self._map(
+            lambda url: self.create_issue(url, data, on_created), repo_urls
+        )
+        return dict(zip(repo_urls, failure_reasons))
+
+    @abstractmethod
+    def check_repos(self, repo_urls):
+        """Check whether an issue can be created in each repository.
+
+        Returns
+        -------
+        failure_reasons : dict
+            The reason why the creation might fail, or None if the issue
+            might be created, keyed by the url of each repository.
+        """
+
+    @abstractmethod
+    def _search_open_issues(self, repo_urls, title):
+        """Search the open issues with the title in each repository.
+
+        Returns
+        -------
+        open_issue_urls : dict
+            The url of the open issue with the title, or None if there is
+            none, keyed by the url of each repository that could be
+            searched.
+        """
+
+    def find_open_issues(self, repo_urls, title):
+        """Find the open issues with the title in each repository.
+
+        The results are kept for the rest of the run, so each repository
+        is only searched once per title.
+
+        Returns
+        -------
+        open_issue_urls : dict
+            The url of the open issue with the title, or None if there is
+            none, keyed by the url of each repository that could be
+            searched.
+        """
+        to_search = [
+            url for url in repo_urls if (url, title) not in _open_issue_urls
+        ]
+        if to_search:
+            for url, issue_url in self._search_open_issues(
+                to_search, title
+            ).items():
+                _open_issue_urls[(url, title)] = issue_url
+        return {
+            url: _open_issue_urls[(url, title)]
+            for url in repo_urls
+            if (url, title) in _open_issue_urls
+        }
+
+
+class RestApiMixin:
+    """Check the repositories and search their open issues with one
+    request of the REST API of the forge per repository, for the forges
+    without a batched API."""
+
+    def check_repo(self, repo_url):
+        """Get the reason why an issue can not be created in a
+        repository, or None if it can be created."""
+        try:
+            response = self._request("GET", self._get_repo_api_url(repo_url))
+        except http.RequestException as e:
+            return str(e)
+        if response.status_code == 404:
+            return "not found"
+        if response.status_code != 200:
+            return f"{response.status_code} {response.reason}"
+        try:
+            repository = response.json()
+        except ValueError as e:
+            return str(e)
+        if repository.get("archived"):
+            return "archived"
+        if not self._has_issues_enabled(repository):
+            return "issues disabled"
+        return None
+
+    @abstractmethod
+    def _get_repo_api_url(self, repo_url):
+        """Get the API url of a repository."""
+
+    @abstractmethod
+    def _has_issues_enabled(self, repository):
+        """Check whether the issues of a repository are enabled, from its
+        API representation."""
+
+    def check_repos(self, repo_urls):
+        return dict(zip(repo_urls, self._map(self.check_repo, repo_urls)))
+
+    def find_open_issue(self, repo_url, title):
+        """Find the url of the open issue with the title in a
+        repository, or None if there is none."""
+        response = self._request(
+            "GET",
+            f"{self._get_repo_api_url(repo_url)}/issues",
+            params=self._get_search_params(title),
+        )
+        response.raise_for_status()
+        for issue in response.json():
+            if issue.get("title") == title:
+                return self._get_created_issue_url(issue)
+        return None
+
+    @abstractmethod
+    def _get_search_params(self, title):
+        """Get the query parameters searching the open issues with the
+        title."""
+
+    def _search_open_issues(self, repo_urls, title):
+        def find(repo_url):
+            try:
+                return self.find_open_issue(repo_url, title)
+            except (http.RequestException, ValueError, KeyError):
+                return _NOT_SEARCHED
+
+        return {
+            url: issue_url
+            for url, issue_url in zip(repo_urls, self._map(find, repo_urls))
+            if issue_url is not _NOT_SEARCHED
+        }
+
+
+class GitLab(RestApiMixin, Forge):
+    """A GitLab instance, see
+    https://docs.gitlab.com/api/issues/#new-issue."""
+
+    name = "GitLab"
+    token_env = "GITLAB_TOKEN"
+
+    def get_headers(self):
+        return {"PRIVATE-TOKEN": self.token}
+
+    def _get_repo_api_url(self, repo_url):
+        project_id = quote(self.get_repo_path(repo_url), safe="")
+        return f"{self.base_url}/api/v4/projects/{project_id}"
+
+    def _send_issue(self, repo_url, data):
+        return self._request(
+            "POST",
+            f"{self._get_repo_api_url(repo_url)}/issues",
+            json={"title": data["title"], "description": data["body"]},
+        )
+
+    def _get_created_issue_url(self, issue):
+        return issue.get("web_url")
+
+    def _has_issues_enabled(self, repository):
+        return repository.get("issues_access_level", "enabled") != "disabled"
+
+    def _get_search_params(self, title):
+        return {"state": "opened", "search": title, "in": "title"}
+
+
+class Gitea(RestApiMixin, Forge):
+    """A Gitea or Forgejo instance, see
+    https://docs.gitea.com/api/1.22/#tag/issue/operation/issueCreateIssue.
+    """
+
+    name = "Gitea"
+    token_env = "GITEA_TOKEN"
+
+    def get_headers(self):
+        return {"Authorization": f"token {self.token}"}
+
+    def _get_repo_api_url(self, repo_url):
+        return f"{self.base_url}/api/v1/repos/{self.get_repo_path(repo_url)}"
+
+    def _send_issue(self, repo_url, data):
+        return self._request(
+            "POST",
+            f"{self._get_repo_api_url(repo_url)}/issues",
+            json={"title": data["title"], "body": data["body"]},
+        )
+
+    def _has_issues_enabled(self, repository):
+        return repository.get("has_issues", True)
+
+    def _get_search_params(self, title):
+        return {"state": "open", "type": "issues", "q": title, "limit": 50}
+
+
+FORGE_TYPES = {"gitlab": GitLab, "gitea": Gitea}
+
+
+def get_forge_hosts(config_forges=None):
+    """Get the type of the forge of each host.
+
+    Parameters
+    ----------
+    config_forges : dict, optional
+        The type of the forge of the self-hosted hosts, e.g.
+        {"gitlab.example.com": "gitlab"}, read from ``forges`` in
+        ~/.skpkgrc.
+
+    Returns
+    -------
+    forge_hosts : dict
+        The type of the forge, e.g. "gitlab", keyed by host.
+    """
+    return {**DEFAULT_FORGE_HOSTS, **(config_forges or {})}
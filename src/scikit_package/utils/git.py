@@ -0,0 +1,108 @@
+import os
+import subprocess
+import tempfile
+
+
+def run(*args, cwd=None, env=None, input=None):
+    """Run a git command without a shell.
+
+    Parameters
+    ----------
+    *args : str
+        The arguments of the git command, e.g. ("fetch", "upstream").
+    cwd : str, optional
+        The directory of the repository.
+    env : dict, optional
+        The environment variables added to the current ones.
+    input : str, optional
+        The text passed to the standard input of the command.
+
+    Returns
+    -------
+    stdout : str
+        The standard output of the command.
+    """
+    if env is not None:
+        env = {**os.environ, **env}
+    return subprocess.run(
+        ["git", *args],
+        check=True,
+        capture_output=True,
+        encoding="utf-8",
+        cwd=cwd,
+        env=env,
+        input=input,
+    ).stdout
+
+
+def get_remotes(cwd):
+    """Get the names of the remotes of the repository."""
+    return run("remote", cwd=cwd).split()
+
+
+def show_file(cwd, revision, path):
+    """Get the content of a file at a revision, without checking it
+    out."""
+    return run("show", f"{revision}:{path}", cwd=cwd)
+
+
+def commit_file(cwd, parent, path, content, message):
+    """Create a commit that changes a single regular file of its
+    parent.
+
+    The blob, tree and commit are written directly to the object
+    database through a temporary index, so neither the working tree nor
+    the index of the repository are touched and no branch is moved.
+
+    Parameters
+    ----------
+    cwd : str
+        The directory of the repository.
+    parent : str
+        The revision of the parent commit, e.g. "upstream/main".
+    path : str
+        The path of the file relative to the root of the repository,
+        e.g. "recipe/meta.yaml".
+    content : str
+        The new content of the file.
+    message : str
+        The commit message.
+
+    Returns
+    -------
+    commit : str
+        The SHA of the created commit.
+    """
+    blob = run("hash-object", "-w", "--stdin", cwd=cwd, input=content).strip()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = {"GIT_INDEX_FILE": os.path.join(tmpdir, "index")}
+        run("read-tree", parent, cwd=cwd, env=env)
+        run(
+            "update-index",
+            "--add",
+            "--cacheinfo",
+            f"100644,{blob},{path}",
+            cwd=cwd,
+            env=env,
+        )
+        tree = run("write-tree", cwd=cwd, env=env).strip()
+    return run(
+        "commit-tree", tree, "-p", parent, "-m", message, cwd=cwd
+    ).strip()
+
+
+def create_branch(cwd, branch, commit):
+    """Create a branch pointing to a commit.
+
+    Returns
+    -------
+    created : bool
+        Whether the branch was created. False if it already exists, in
+        which case it is left unchanged.
+    """
+    try:
+        # the empty old value makes git refuse to overwrite the branch
+        run("update-ref", f"refs/heads/{branch}", commit, "", cwd=cwd)
+    except subprocess.CalledProcessError:
+        return False
+    return True
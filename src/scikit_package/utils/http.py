@@ -0,0 +1,205 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests import JSONDecodeError, RequestException  # noqa: F401
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) in seconds
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5  # seconds, doubled after each attempt
+MAX_RETRY_DELAY = 60  # seconds
+POOL_MAXSIZE = 16
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Get the HTTP session shared by all network calls of
+    scikit-package.
+
+    The session keeps connections alive in a pool per host, so repeated
+    requests to the same host skip the DNS lookup and the TCP and TLS
+    handshakes.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+
+class RateLimiter:
+    """Pause the requests sent to a host by several threads while its
+    rate limit is exhausted.
+
+    The limiter is passed to ``request`` for each request to the host.
+    Once a response reports that no request is remaining, with
+    ``X-RateLimit-Remaining: 0`` and ``X-RateLimit-Reset``, or asks to
+    retry later with ``Retry-After``, every thread waits until the
+    limit is reset before sending its next request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0.0  # in seconds of time.monotonic()
+
+    def pause(self, delay):
+        """Pause the requests of all threads for ``delay`` seconds."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    def wait(self):
+        """Wait until the requests are no longer paused."""
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, response):
+        """Pause the requests until the rate limit is reset if the
+        response reports that it is exhausted."""
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            delay = _get_rate_limit_reset_delay(response)
+            if delay is not None:
+                self.pause(delay)
+
+
+def _get_rate_limit_reset_delay(response):
+    """Get the seconds until ``X-RateLimit-Reset``, or None if the
+    response does not have the header."""
+    try:
+        reset = float(response.headers["X-RateLimit-Reset"])
+    except (KeyError, ValueError):
+        return None
+    return max(reset - time.time(), 0)
+
+
+def _is_rate_limited(response):
+    """Check whether a response rejected the request because of a rate
+    limit, in which case the server did not process it.
+
+    GitHub reports its secondary rate limits with 403 Forbidden, so 403
+    counts only with ``Retry-After`` or ``X-RateLimit-Remaining: 0``.
+    """
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and (
+        "Retry-After" in response.headers
+        or response.headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+
+def _get_retry_delay(response, attempt, backoff_factor):
+    """Get the seconds to wait before the next attempt, honoring the
+    ``Retry-After`` or ``X-RateLimit-Reset`` header of the response if
+    there is one."""
+    retry_after = None
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is None and _is_rate_limited(response):
+            delay = _get_rate_limit_reset_delay(response)
+            if delay is not None:
+                return min(delay, MAX_RETRY_DELAY)
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp()
+                delay -= time.time()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0), MAX_RETRY_DELAY)
+    return min(backoff_factor * 2**attempt, MAX_RETRY_DELAY)
+
+
+def request(
+    method,
+    url,
+    timeout=DEFAULT_TIMEOUT,
+    retries=DEFAULT_RETRIES,
+    backoff_factor=DEFAULT_BACKOFF_FACTOR,
+    limiter=None,
+    **kwargs,
+):
+    """Send an HTTP request through the shared session with retries.
+
+    Responses with a status code in ``RETRY_STATUS_CODES`` and connection
+    errors are retried with exponential backoff, waiting for
+    ``Retry-After`` when the server sends it. Requests that are not
+    idempotent, such as POST, are only retried when they are rejected by
+    a rate limit, which guarantees that the server did not process them.
+
+    Parameters
+    ----------
+    method : str
+        The HTTP method, e.g. "GET".
+    url : str
+        The URL of the request.
+    timeout : float or tuple of float, optional
+        The connect and read timeouts in seconds.
+        Default is ``DEFAULT_TIMEOUT``.
+    retries : int, optional
+        The maximum number of retries. Default is ``DEFAULT_RETRIES``.
+    backoff_factor : float, optional
+        The delay before the first retry in seconds, doubled for each
+        further retry. Default is ``DEFAULT_BACKOFF_FACTOR``.
+    limiter : RateLimiter, optional
+        The rate limiter of the host shared with the other threads. The
+        delay before a retry then pauses all of them.
+    **kwargs
+        The other arguments passed to ``requests.Session.request``,
+        e.g. ``headers`` or ``json``.
+
+    Returns
+    -------
+    response : requests.Response
+        The response of the last attempt.
+    """
+    method = method.upper()
+    idempotent = method in IDEMPOTENT_METHODS
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.wait()
+        try:
+            response = get_session().request(
+                method, url, timeout=timeout, **kwargs
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            if not idempotent or attempt == retries:
+                raise
+            time.sleep(_get_retry_delay(None, attempt, backoff_factor))
+            continue
+        if limiter is not None:
+            limiter.update(response)
+        retry = _is_rate_limited(response) or (
+            idempotent and response.status_code in RETRY_STATUS_CODES
+        )
+        if not retry or attempt == retries:
+            return response
+        delay = _get_retry_delay(response, attempt, backoff_factor)
+        if limiter is not None:
+            limiter.pause(delay)
+        else:
+            time.sleep(delay)
+        response.close()
+
+
+def get(url, **kwargs):
+    """Send a GET request, see ``request``."""
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    """Send a POST request, see ``request``."""
+    return request("POST", url, **kwargs)
@@ -1,11 +1,10 @@
 import json
 import os
 import shutil
+import time
 from pathlib import Path
 
-import requests
-
-from scikit_package.utils import io
+from scikit_package.utils import cache, io
 
 SKPKG_USER_CONFIG_FILE = "~/.skpkgrc"
 try:
@@ -15,6 +14,9 @@ except KeyError:
 config_file = os.path.expandvars(config_file)
 config_file = Path(config_file).expanduser()
 
+RELEASE_TAG_CACHE = "release-tags"
+RELEASE_TAG_CACHE_TTL = 3600  # seconds
+
 SKPKG_PROJ_CONFIG_FILE = "cookiecutter.json"
 proj_config_file = Path(SKPKG_PROJ_CONFIG_FILE).expanduser()
 
@@ -137,25 +139,102 @@ def get_config_value(key, config_path=config_file):
     return value
 
 
-def get_latest_release_tag(owner, repo):
-    """Get the latest release tag from a GitHub repository."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/releases/latest"
-    response = requests.get(url)
-    response.raise_for_status()
-    return response.json()["tag_name"]
+def get_release_tag_cache_ttl(config_path=config_file):
+    """Get the number of seconds a cached release tag is used without
+    revalidation.
 
+    The value is read from ``release_tag_cache_ttl`` in ~/.skpkgrc and
+    defaults to one hour, which is also used with a warning when the
+    value is not a number.
+    """
+    try:
+        ttl = read_skpkg_config(config_path).get("release_tag_cache_ttl")
+    except (FileNotFoundError, ValueError):
+        ttl = None
+    if ttl is None:
+        return RELEASE_TAG_CACHE_TTL
+    try:
+        return float(ttl)
+    except (TypeError, ValueError):
+        print(
+            f"Warning: 'release_tag_cache_ttl' in {str(config_path)} must be "
+            f"a number of seconds, but it is {ttl!r}. The default of "
+            f"{RELEASE_TAG_CACHE_TTL} seconds is used."
+        )
+        return RELEASE_TAG_CACHE_TTL
 
-def get_config_cmd(config_file=config_file, proj_config_file=proj_config_file):
-    config_cmd = []
+
+def get_latest_release_tag(owner, repo, config_path=config_file):
+    """Get the latest release tag from a GitHub repository.
+
+    The tag is cached under the user's cache directory per ``owner/repo``
+    together with the ETag of the response. Within the TTL set by
+    ``release_tag_cache_ttl`` in ~/.skpkgrc the cached tag is returned
+    without any request. Afterwards, it is revalidated with
+    ``If-None-Match`` so an unchanged release costs a 304 response, which
+    does not count against the GitHub rate limit. If GitHub can not be
+    reached, the cached tag is used.
+    """
+    # Imported here so that `package add news`, which only needs the file
+    # helpers of this module, does not import `requests`.
+    from scikit_package.utils import http
+
+    key = f"{owner}/{repo}"
+    cached = cache.read_entry(RELEASE_TAG_CACHE, key)
+    ttl = get_release_tag_cache_ttl(config_path)
+    if cached and time.time() - cached["fetched_at"] < ttl:
+        return cached["tag"]
+    url = f"https://api.github.com/repos/{owner}/{repo}/releases/latest"
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    try:
+        response = http.get(url, headers=headers)
+        if response.status_code == 304 and cached:
+            tag = cached["tag"]
+        else:
+            response.raise_for_status()
+            tag = response.json()["tag_name"]
+    except http.RequestException:
+        if not cached:
+            raise
+        print(
+            f"> Unable to reach GitHub, the cached release tag "
+            f"{cached['tag']} of {repo} is used."
+        )
+        return cached["tag"]
+    cache.write_entry(
+        RELEASE_TAG_CACHE,
+        key,
+        {
+            "tag": tag,
+            "etag": response.headers.get("ETag", headers.get("If-None-Match")),
+            "fetched_at": time.time(),
+        },
+    )
+    return tag
+
+
+def get_config_file(config_file=config_file):
+    """Get the path to ~/.skpkgrc to be used as the cookiecutter config
+    file, or None if it does not exist."""
     if config_file.exists():
-        config_cmd.extend(["--config-file", str(config_file)])
-    if proj_config_file.exists():
-        extra_context = read_skpkg_config(proj_config_file)
-        extra_context_cmd = []
-        for key, value in extra_context.items():
-            if isinstance(value, list):
-                continue
-            cmd = key + "=" + value
-            extra_context_cmd.append(cmd)
-        config_cmd.extend(extra_context_cmd)
-    return config_cmd
+        return str(config_file)
+    return None
+
+
+def get_extra_context(proj_config_file=proj_config_file):
+    """Get the cookiecutter extra context from ./cookiecutter.json.
+
+    The values are returned as they are stored in the file, including
+    list values such as choice variables.
+
+    Returns
+    -------
+    extra_context : dict
+        The context of the existing project, or an empty dict if
+        cookiecutter.json does not exist.
+    """
+    if not proj_config_file.exists():
+        return {}
+    return read_skpkg_config(proj_config_file)
@@ -0,0 +1,214 @@
+import os
+import shutil
+import subprocess
+import tarfile
+import tempfile
+from io import BytesIO
+from urllib.parse import urlparse
+
+from scikit_package.utils import cache
+
+MIRROR_CACHE = "mirrors"
+TEMPLATE_CACHE = "templates"
+CHECKOUT_CACHE = "checkouts"
+
+
+def _git(*args, git_dir=None):
+    """Run a git command without a shell and return its stdout bytes."""
+    cmd = ["git"]
+    if git_dir is not None:
+        cmd.append(f"--git-dir={git_dir}")
+    cmd.extend(args)
+    return subprocess.run(cmd, check=True, capture_output=True).stdout
+
+
+def _get_owner_and_repo(repo_url):
+    path_parts = urlparse(repo_url).path.strip("/").split("/")
+    return path_parts[-2], path_parts[-1].removesuffix(".git")
+
+
+def _has_tag(mirror_path, tag):
+    try:
+        _git(
+            "rev-parse",
+            "--verify",
+            "--quiet",
+            f"refs/tags/{tag}^{{commit}}",
+            git_dir=mirror_path,
+        )
+    except subprocess.CalledProcessError:
+        return False
+    return True
+
+
+def get_mirror(repo_url, tag):
+    """Get the local bare mirror of a template repository.
+
+    The mirror is cloned once into the scikit-package cache directory.
+    Afterwards, it is only fetched, incrementally, when it does not
+    contain ``tag`` yet.
+
+    Parameters
+    ----------
+    repo_url : str
+        The URL of the template repository, e.g.
+        https://github.com/scikit-package/scikit-package.
+    tag : str
+        The release tag that the mirror must contain.
+
+    Returns
+    -------
+    mirror_path : Path
+        The path to the bare mirror repository.
+    """
+    owner, repo = _get_owner_and_repo(repo_url)
+    mirror_path = cache.get_cache_dir() / MIRROR_CACHE / owner / f"{repo}.git"
+    if not mirror_path.is_dir():
+        mirror_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=mirror_path.parent) as tmpdir:
+            tmp_mirror_path = os.path.join(tmpdir, f"{repo}.git")
+            _git("clone", "--mirror", "--quiet", repo_url, tmp_mirror_path)
+            os.replace(tmp_mirror_path, mirror_path)
+    elif not _has_tag(mirror_path, tag):
+        _git("fetch", "--prune", "--quiet", "origin", git_dir=mirror_path)
+    return mirror_path
+
+
+def checkout_template(repo_url, tag):
+    """Get a local directory containing the template at a release tag.
+
+    The files of ``tag`` are extracted from the local mirror of
+    ``repo_url`` once and reused afterwards, so that a warm cache needs
+    neither network access nor a clone.
+
+    Parameters
+    ----------
+    repo_url : str
+        The URL of the template repository.
+    tag : str
+        The release tag to be checked out.
+
+    Returns
+    -------
+    template_path : Path
+        The path to the directory containing the template files.
+    """
+    owner, repo = _get_owner_and_repo(repo_url)
+    template_path = cache.get_cache_dir() / TEMPLATE_CACHE / owner / repo / tag
+    if template_path.is_dir():
+        return template_path
+    mirror_path = get_mirror(repo_url, tag)
+    archive = _git("archive", "--format=tar", tag, git_dir=mirror_path)
+    template_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=template_path.parent)
+    try:
+        with tarfile.open(fileobj=BytesIO(archive)) as tar:
+            tar.extractall(tmp_path, filter="data")
+        os.replace(tmp_path, template_path)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return template_path
+
+
+def _get_remote_head(repo_url):
+    """Get the SHA of the commit of the default branch of a remote with a
+    single ``git ls-remote``."""
+    output = _git("ls-remote", repo_url, "HEAD").decode()
+    return output.split()[0] if output else None
+
+
+def _get_local_head(checkout_path):
+    try:
+        return _git("-C", str(checkout_path), "rev-parse", "HEAD").decode()
+    except subprocess.CalledProcessError:
+        return None
+
+
+def checkout_sparse(repo_url, paths):
+    """Get a local checkout of only some files of a repository.
+
+    The checkout is kept in the scikit-package cache directory. It is
+    created by a shallow, blobless clone of the default branch with a
+    sparse checkout of ``paths``, so neither the history nor the other
+    files are downloaded. Afterwards, it is revalidated with a single
+    ``git ls-remote`` and only fetched when the remote has new commits.
+    When the remote can not be reached, the cached checkout is used.
+
+    Parameters
+    ----------
+    repo_url : str
+        The URL of the repository.
+    paths : list of str
+        The paths of the files to be checked out, relative to the root
+        of the repository, e.g. ["groups.json", "repos.json"].
+
+    Returns
+    -------
+    checkout_path : Path
+        The path to the directory of the checkout.
+    """
+    owner, repo = _get_owner_and_repo(repo_url)
+    checkout_path = cache.get_cache_dir() / CHECKOUT_CACHE / owner / repo
+    try:
+        remote_head = _get_remote_head(repo_url)
+    except subprocess.CalledProcessError:
+        if checkout_path.is_dir():
+            return checkout_path
+        raise
+    local_head = _get_local_head(checkout_path)
+    if local_head is not None and local_head.strip() == remote_head:
+        return checkout_path
+    patterns = [f"/{path}" for path in paths]
+    if local_head is None:
+        shutil.rmtree(checkout_path, ignore_errors=True)
+        checkout_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=checkout_path.parent) as tmpdir:
+            tmp_checkout_path = os.path.join(tmpdir, repo)
+            _git(
+                "clone",
+                "--depth=1",
+                "--filter=blob:none",
+                "--no-checkout",
+                "--quiet",
+                repo_url,
+                tmp_checkout_path,
+            )
+            _git("-C", tmp_checkout_path, "sparse-checkout", "init")
+            _git(
+                "-C",
+                tmp_checkout_path,
+                "sparse-checkout",
+                "set",
+                "--no-cone",
+                *patterns,
+            )
+            _git("-C", tmp_checkout_path, "checkout", "--quiet")
+            os.replace(tmp_checkout_path, checkout_path)
+    else:
+        _git(
+            "-C",
+            str(checkout_path),
+            "fetch",
+            "--depth=1",
+            "--filter=blob:none",
+            "--quiet",
+            "origin",
+            "HEAD",
+        )
+        _git(
+            "-C",
+            str(checkout_path),
+            "sparse-checkout",
+            "set",
+            "--no-cone",
+            *patterns,
+        )
+        _git(
+            "-C",
+            str(checkout_path),
+            "reset",
+            "--hard",
+            "--quiet",
+            "FETCH_HEAD",
+        )
+    return checkout_path
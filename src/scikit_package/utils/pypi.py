@@ -1,13 +1,88 @@
-import requests
+import hashlib
+
+from packaging.version import InvalidVersion
 from packaging.version import parse as parse_version
 
+from scikit_package.utils import cache, http
+
+PYPI_URL = "https://pypi.org"
+PYPI_CACHE = "pypi"
+PYPI_SIMPLE_JSON = "application/vnd.pypi.simple.v1+json"
+VERIFIED_SDIST_CACHE = "verified-sdists"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # bytes
+SDIST_EXTENSIONS = (".tar.gz", ".zip")
+
+# JSON documents downloaded from PyPI in this run, keyed by URL.
+_json_cache = {}
+
+
+def clear_cache():
+    """Forget the PyPI documents downloaded in this run.
+
+    The on-disk cache is kept, so the next lookups are revalidated
+    instead of downloaded again.
+    """
+    _json_cache.clear()
+
+
+def _get_json(url, accept=None):
+    """Get a JSON document from PyPI.
+
+    Each document is downloaded at most once per run. It is also cached
+    on disk with its ETag and Last-Modified headers, so that later runs
+    only download it again when it changed on PyPI.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the JSON document.
+    accept : str, optional
+        The media type requested with the ``Accept`` header.
+
+    Returns
+    -------
+    data : dict or None
+        The parsed document, or None if PyPI did not return it.
+    """
+    if url in _json_cache:
+        return _json_cache[url]
+    cached = cache.read_entry(PYPI_CACHE, url)
+    headers = {}
+    if accept is not None:
+        headers["Accept"] = accept
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    response = http.get(url, headers=headers)
+    if response.status_code == 304 and cached:
+        data = cached["data"]
+    elif response.status_code == 200:
+        data = response.json()
+        cache.write_entry(
+            PYPI_CACHE,
+            url,
+            {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "data": data,
+            },
+        )
+    else:
+        data = None
+    _json_cache[url] = data
+    return data
+
+
+def _get_project_json(package):
+    return _get_json(f"{PYPI_URL}/pypi/{package}/json")
+
 
 def check_pypi_package_exists(package):
     """Check if a package exists on PyPI and print the latest
     version."""
-    response = requests.get(f"https://pypi.org/pypi/{package}/json")
-    if response.status_code == 200:
-        data = response.json()
+    data = _get_project_json(package)
+    if data is not None:
         version = data["info"]["version"]
         print(f"> {package} is available on PyPI (latest version: {version}).")
     else:
@@ -21,30 +96,173 @@ def check_pypi_package_exists(package):
         )
 
 
-def get_pypi_version_sha(package, count=1):
+def _get_latest_stable_versions(versions, count):
+    stable_versions = [
+        v for v in versions if not parse_version(v).is_prerelease
+    ]
+    return sorted(stable_versions, key=parse_version, reverse=True)[:count]
+
+
+def _get_sdist(files):
+    for file in files:
+        if file["packagetype"] == "sdist":
+            return file
+    return None
+
+
+def _get_version_sdist_from_project_json(package, count):
+    """Look up the latest sdists in the project JSON, which lists the
+    files of every release."""
+    data = _get_project_json(package)
+    if data is None:
+        return None
+    version_sdist = {}
+    for version in _get_latest_stable_versions(data["releases"], count):
+        sdist = _get_sdist(data["releases"][version])
+        if sdist is not None:
+            version_sdist[version] = sdist
+    return version_sdist
+
+
+def _get_sdists_from_simple_index(index):
+    """Get the sdists listed with a SHA256 by the simple index, keyed by
+    their parsed version."""
+    sdists = {}
+    for file in index.get("files", []):
+        filename = file.get("filename", "")
+        sha256 = file.get("hashes", {}).get("sha256")
+        extension = next(
+            (ext for ext in SDIST_EXTENSIONS if filename.endswith(ext)), None
+        )
+        if extension is None or sha256 is None or "-" not in filename:
+            continue
+        try:
+            version = parse_version(
+                filename.removesuffix(extension).rsplit("-", 1)[1]
+            )
+        except InvalidVersion:
+            continue
+        sdists.setdefault(
+            version,
+            {
+                "packagetype": "sdist",
+                "filename": filename,
+                "url": file.get("url"),
+                "digests": {"sha256": sha256},
+            },
+        )
+    return sdists
+
+
+def _get_version_sdist_from_version_json(package, count):
+    """Look up the latest sdists in the simple index, or else in the
+    per-version JSON.
+
+    The versions are listed by the PEP 691 JSON simple index, which also
+    lists the SHA256 of each file. Only when the sdist of one of the
+    latest stable versions is not listed with its SHA256 is
+    ``/pypi/<package>/<version>/json`` downloaded, instead of the files
+    of every release.
+
+    Returns
+    -------
+    version_sdist : dict or None
+        The sdist file of each version, or None if the versions are not
+        listed by the simple index.
+    """
+    index = _get_json(f"{PYPI_URL}/simple/{package}/", accept=PYPI_SIMPLE_JSON)
+    if index is None or "versions" not in index:
+        return None
+    index_sdists = _get_sdists_from_simple_index(index)
+    version_sdist = {}
+    for version in _get_latest_stable_versions(index["versions"], count):
+        sdist = index_sdists.get(parse_version(version))
+        if sdist is None:
+            data = _get_json(f"{PYPI_URL}/pypi/{package}/{version}/json")
+            sdist = _get_sdist(data["urls"]) if data else None
+        if sdist is not None:
+            version_sdist[version] = sdist
+    return version_sdist
+
+
+def verify_sdist_sha256(url, sha256=None):
+    """Compute the SHA256 of an sdist and check it against the digest
+    advertised by PyPI.
+
+    The sdist is streamed in chunks of ``DOWNLOAD_CHUNK_SIZE`` bytes
+    through the hash, so it is never held in memory. Verified
+    (URL, SHA256) pairs are cached, so the sdist is only downloaded once.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the sdist.
+    sha256 : str, optional
+        The SHA256 advertised by PyPI. If None, the computed SHA256 is
+        returned without verification.
+
+    Returns
+    -------
+    sha256 : str
+        The verified SHA256 of the sdist.
+    """
+    cached = cache.read_entry(VERIFIED_SDIST_CACHE, url)
+    if cached and sha256 in (None, cached["sha256"]):
+        return cached["sha256"]
+    digest = hashlib.sha256()
+    with http.get(url, stream=True) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    computed_sha256 = digest.hexdigest()
+    if sha256 is not None and computed_sha256 != sha256:
+        raise ValueError(
+            f"The SHA256 of {url} is {computed_sha256}, but PyPI lists "
+            f"{sha256}. Please try again later or report it to the "
+            "package maintainers."
+        )
+    cache.write_entry(VERIFIED_SDIST_CACHE, url, {"sha256": computed_sha256})
+    return computed_sha256
+
+
+def get_pypi_version_sha(package, count=1, verify=False):
     """Fetch the latest stable versions of the package and their
-    SHA256."""
-    response = requests.get(f"https://pypi.org/pypi/{package}/json")
-    if response.status_code == 200:
-        data = response.json()
-        all_versions = [
-            v
-            for v in data["releases"].keys()
-            if not parse_version(v).is_prerelease
-        ]
-        sorted_versions = sorted(
-            all_versions, key=parse_version, reverse=True
-        )[:count]
-        version_info = {}
-        for version in sorted_versions:
-            files = data["releases"][version]
-            for file in files:
-                if file["packagetype"] == "sdist":
-                    version_info[version] = file["digests"]["sha256"]
-                    break
-        return version_info
-    else:
+    SHA256.
+
+    The simple index, or the per-version JSON for the sdists it lists
+    without a SHA256, is used when the simple index lists the versions,
+    which avoids downloading the files of every release of the package.
+    Otherwise the project JSON is used.
+
+    Parameters
+    ----------
+    package : str
+        The name of the package on PyPI.
+    count : int, optional
+        The number of the latest stable versions. Default is 1.
+    verify : bool, optional
+        Whether to download each sdist and verify its SHA256, see
+        ``verify_sdist_sha256``. The SHA256 of sdists without a digest
+        on PyPI is then computed instead of being left out.
+
+    Returns
+    -------
+    version_info : dict
+        The SHA256 of the sdist of each version.
+    """
+    version_sdist = _get_version_sdist_from_version_json(package, count)
+    if version_sdist is None:
+        version_sdist = _get_version_sdist_from_project_json(package, count)
+    if version_sdist is None:
         raise ValueError(
             f"No matching package found for {package} on PyPI. "
             "Please check the name at https://pypi.org/project/"
         )
+    version_info = {}
+    for version, sdist in version_sdist.items():
+        sha256 = sdist.get("digests", {}).get("sha256")
+        if verify:
+            sha256 = verify_sdist_sha256(sdist["url"], sha256)
+        if sha256 is not None:
+            version_info[version] = sha256
+    return version_info
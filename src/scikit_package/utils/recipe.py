@@ -0,0 +1,258 @@
+import re
+from collections import namedtuple
+
+SET_PATTERN = re.compile(
+    r"\{%-?\s*set\s+(?P<name>\w+)\s*=\s*"
+    r"(?:\"(?P<dq>[^\"]*)\"|'(?P<sq>[^']*)'|(?P<bare>[^\s%\"']+))"
+    r"\s*-?%\}"
+)
+KEY_PATTERN = re.compile(
+    r"^(?P<indent> *)(?P<dash>- +)?(?P<key>[\w.-]+):"
+    r"(?:[ \t]+(?P<value>[^#\s](?:[^#]*[^#\s])?))?[ \t]*(?:#.*)?$"
+)
+BLOCK_SCALAR_PATTERN = re.compile(r"^[|>][-+0-9]*$")
+VERSION_TEMPLATE_PATTERN = re.compile(r"\{\{\s*version\s*\}\}")
+JINJA_VARIABLE_PATTERN = re.compile(r"^\{\{\s*(\w+)\s*\}\}$")
+PYPI_HOSTS = ("pypi.io", "pypi.org", "files.pythonhosted.org")
+
+# A Jinja `{% set %}` statement (``path`` is ``(name,)``) or a YAML
+# `key: value` entry (``path`` is the keys and list item indices leading
+# to it). ``start`` and ``end`` locate the value within its line.
+Token = namedtuple("Token", ["kind", "line", "path", "value", "start", "end"])
+
+
+def tokenize(text):
+    """Locate the Jinja `{% set %}` statements and the YAML entries of a
+    conda-forge recipe in a single pass over its lines.
+
+    Nesting is tracked from the indentation, so that e.g. the
+    ``sha256`` of each source of a multi-source recipe and the
+    ``build: number`` of each output of a multi-output recipe are told
+    apart. The content of block scalars (``|`` and ``>``) is skipped.
+
+    Parameters
+    ----------
+    text : str
+        The content of the meta.yaml file.
+
+    Returns
+    -------
+    tokens : list of Token
+        The tokens in the order of the text.
+    """
+    tokens = []
+    # the (column, name) of the enclosing keys and list items
+    stack = []
+    n_items = 0
+    block_scalar_column = None
+    for i, line in enumerate(text.splitlines()):
+        for match in SET_PATTERN.finditer(line):
+            group = next(
+                g for g in ("dq", "sq", "bare") if match[g] is not None
+            )
+            tokens.append(
+                Token(
+                    "set",
+                    i,
+                    (match["name"],),
+                    match[group],
+                    match.start(group),
+                    match.end(group),
+                )
+            )
+        if block_scalar_column is not None:
+            indent = len(line) - len(line.lstrip())
+            if not line.strip() or indent > block_scalar_column:
+                continue
+            block_scalar_column = None
+        match = KEY_PATTERN.match(line)
+        if match is None:
+            continue
+        column = len(match["indent"])
+        if match["dash"]:
+            while stack and (
+                stack[-1][0] > column
+                or (stack[-1][0] == column and isinstance(stack[-1][1], int))
+            ):
+                stack.pop()
+            stack.append((column, n_items))
+            n_items += 1
+            column += len(match["dash"])
+        else:
+            while stack and stack[-1][0] >= column:
+                stack.pop()
+        stack.append((column, match["key"]))
+        path = tuple(name for _, name in stack)
+        value = match["value"]
+        if value is not None and BLOCK_SCALAR_PATTERN.match(value):
+            block_scalar_column = column
+        tokens.append(
+            Token(
+                "key",
+                i,
+                path,
+                value,
+                match.start("value") if value is not None else None,
+                match.end("value") if value is not None else None,
+            )
+        )
+    return tokens
+
+
+def _get_set_token(tokens, name):
+    for token in tokens:
+        if token.kind == "set" and token.path == (name,):
+            return token
+    return None
+
+
+def _resolve_variable(tokens, token):
+    """Get the `{% set %}` statement of the Jinja variable that is the
+    value of a YAML entry, e.g. ``{{ sha256 }}``, or the entry itself if
+    its value is not a Jinja variable.
+
+    Returns None if the variable is not set in the recipe.
+    """
+    variable = JINJA_VARIABLE_PATTERN.match(token.value)
+    if variable is None:
+        return token
+    return _get_set_token(tokens, variable[1])
+
+
+def _get_sources(tokens):
+    """Group the entries of each source block.
+
+    Returns
+    -------
+    sources : dict
+        The entries of each source, keyed by the path of the source, e.g.
+        ``("source",)`` or ``("source", 2)`` for an item of a list.
+    """
+    sources = {}
+    for token in tokens:
+        if token.kind != "key" or "source" not in token.path[:-1]:
+            continue
+        source_path = token.path[: token.path.index("source") + 1]
+        rest = token.path[len(source_path) :]
+        if isinstance(rest[0], int):
+            source_path += rest[:1]
+            rest = rest[1:]
+        if len(rest) == 1:
+            sources.setdefault(source_path, {})[rest[0]] = token
+    return sources
+
+
+def _get_pypi_source(tokens):
+    """Get the entries of the source downloaded from PyPI.
+
+    The source whose URL is on PyPI and contains ``{{ version }}`` is
+    preferred, then any source whose URL contains ``{{ version }}``,
+    then the only source of the recipe.
+    """
+    sources = [
+        source
+        for source in _get_sources(tokens).values()
+        if "sha256" in source and source["sha256"].value is not None
+    ]
+
+    def get_url(source):
+        return (source["url"].value or "") if "url" in source else ""
+
+    for is_candidate in [
+        lambda url: VERSION_TEMPLATE_PATTERN.search(url)
+        and any(host in url for host in PYPI_HOSTS),
+        lambda url: VERSION_TEMPLATE_PATTERN.search(url),
+    ]:
+        for source in sources:
+            if is_candidate(get_url(source)):
+                return source
+    return sources[0] if len(sources) == 1 else None
+
+
+def read_version_sha256(text):
+    """Read the version and the SHA256 of the PyPI source of a recipe.
+
+    Returns
+    -------
+    version : str or None
+        The version set by ``{% set version = "..." %}``.
+    sha256 : str or None
+        The SHA256 of the source downloaded from PyPI, resolved through
+        ``{% set sha256 = "..." %}`` when it is set by a Jinja variable.
+    """
+    tokens = tokenize(text)
+    version = _get_set_token(tokens, "version")
+    source = _get_pypi_source(tokens)
+    sha256 = _resolve_variable(tokens, source["sha256"]) if source else None
+    return (
+        version.value if version else None,
+        sha256.value.strip("\"'") if sha256 else None,
+    )
+
+
+def update_text(text, version, sha256):
+    """Get the content of a recipe updated to a new release on PyPI.
+
+    Only the version set by ``{% set version = "..." %}`` and the
+    ``sha256`` of the PyPI source are replaced, so the other sources of
+    a multi-source recipe are left as they are. A ``sha256`` set through
+    a Jinja variable is replaced in its `{% set %}` statement. When the
+    version changes, every ``build: number`` is reset to 0, including
+    the ones of the outputs and the ones set through a Jinja variable.
+
+    Parameters
+    ----------
+    text : str
+        The content of the meta.yaml file.
+    version : str
+        The new version.
+    sha256 : str
+        The SHA256 of the new sdist.
+
+    Returns
+    -------
+    text : str
+        The updated content.
+    """
+    tokens = tokenize(text)
+    version_token = _get_set_token(tokens, "version")
+    if version_token is None:
+        raise ValueError(
+            'No `{% set version = "..." %}` is found in the recipe. '
+            "Please update the recipe by hand."
+        )
+    source = _get_pypi_source(tokens)
+    if source is None:
+        raise ValueError(
+            "The PyPI source with a `sha256` is not found in the recipe. "
+            "Please update the recipe by hand."
+        )
+    sha256_token = _resolve_variable(tokens, source["sha256"])
+    if sha256_token is None:
+        raise ValueError(
+            "The Jinja variable of the PyPI source "
+            f"`sha256: {source['sha256'].value}` is not set in the recipe. "
+            "Please update the recipe by hand."
+        )
+    # the new value of each token, keyed by its position, so that a Jinja
+    # variable shared by several outputs is only replaced once
+    edits = {
+        (version_token.line, version_token.start): (version_token, version),
+        (sha256_token.line, sha256_token.start): (sha256_token, sha256),
+    }
+    if version_token.value != version:
+        for token in tokens:
+            if (
+                token.kind != "key"
+                or token.path[-2:] != ("build", "number")
+                or token.value is None
+            ):
+                continue
+            token = _resolve_variable(tokens, token)
+            if token is not None and token.value.isdigit():
+                edits[(token.line, token.start)] = (token, "0")
+    lines = text.splitlines(keepends=True)
+    for _, (token, value) in sorted(edits.items(), reverse=True):
+        line = lines[token.line]
+        lines[token.line] = line[: token.start] + value + line[token.end :]
+    return "".join(lines)
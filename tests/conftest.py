@@ -1,9 +1,14 @@
 import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 import yaml
 
+from scikit_package.utils import forges, pypi
+
 files_in_old_project = {
     ".git/COMMIT_EDITMSG": """
 skpkg: last commit message in skpkg-package
@@ -133,3 +138,82 @@ def user_filesystem(tmp_path):
         json.dump(another_repos_dict, repos_file)
 
     yield tmp_path
+
+
+@pytest.fixture(autouse=True)
+def skpkg_cache_dir(tmp_path, monkeypatch):
+    """Keep the scikit-package caches of each test separate."""
+    cache_dir = tmp_path / "skpkg-cache"
+    monkeypatch.setenv("SKPKG_CACHE_DIR", str(cache_dir))
+    pypi.clear_cache()
+    forges.clear_cache()
+    return cache_dir
+
+
+def _start_stub_server():
+    """Serve a stub JSON API, e.g. of a forge or PyPI, on localhost.
+
+    ``routes`` maps ``(method, path)`` to the ``(status, JSON body,
+    headers)`` of the response, or to a list of them returned in turn.
+    Each request is recorded as ``(method, path with query, headers, JSON
+    body)`` in ``requests``, and each response as ``(path with query,
+    number of bytes of its body)`` in ``responses``.
+    """
+    server = SimpleNamespace(routes={}, requests=[], responses=[])
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _respond(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length)) if length else None
+            with lock:
+                server.requests.append(
+                    (self.command, self.path, dict(self.headers), body)
+                )
+                route = server.routes.get(
+                    (self.command, self.path.split("?")[0]),
+                    (404, {"message": "Not Found"}, {}),
+                )
+                if isinstance(route, list):
+                    route = route.pop(0) if len(route) > 1 else route[0]
+            status, content, headers = route
+            content = json.dumps(content).encode()
+            with lock:
+                server.responses.append((self.path, len(content)))
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = do_POST = _respond
+
+        def log_message(self, format, *args):
+            pass
+
+    server.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.url = f"http://127.0.0.1:{server.server.server_address[1]}"
+    threading.Thread(
+        target=server.server.serve_forever,
+        kwargs={"poll_interval": 0.05},
+        daemon=True,
+    ).start()
+    return server
+
+
+@pytest.fixture
+def start_stub_server():
+    """Start stub servers, see ``_start_stub_server``, that are shut down
+    after the test."""
+    stubs = []
+
+    def start():
+        stubs.append(_start_stub_server())
+        return stubs[-1]
+
+    yield start
+    for stub in stubs:
+        stub.server.shutdown()
+        stub.server.server_close()
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from scikit_package.utils import cache
+
+
+def test_get_cache_dir(monkeypatch, tmp_path):
+    # C1: SKPKG_CACHE_DIR is set. Expect it is used.
+    monkeypatch.setenv("SKPKG_CACHE_DIR", str(tmp_path / "skpkg"))
+    assert cache.get_cache_dir() == tmp_path / "skpkg"
+    # C2: only XDG_CACHE_HOME is set. Expect scikit-package under it.
+    monkeypatch.delenv("SKPKG_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert cache.get_cache_dir() == tmp_path / "xdg" / "scikit-package"
+    # C3: no environment variable is set. Expect ~/.cache/scikit-package.
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    assert cache.get_cache_dir() == (
+        tmp_path / "home" / ".cache" / "scikit-package"
+    )
+
+
+def test_read_write_entry(skpkg_cache_dir):
+    # C1: a missing entry. Expect None.
+    assert cache.read_entry("release-tags", "owner/repo") is None
+    # C2: a written entry. Expect it is read back and stored in a single
+    #   file of the namespace directory.
+    entry = {"tag": "1.0.0", "etag": '"abc"'}
+    cache.write_entry("release-tags", "owner/repo", entry)
+    assert cache.read_entry("release-tags", "owner/repo") == entry
+    assert [p.name for p in (skpkg_cache_dir / "release-tags").iterdir()] == [
+        "owner%2Frepo.json"
+    ]
+    # C3: a corrupted entry. Expect None.
+    cache.get_cache_path("release-tags", "owner/repo").write_text("{")
+    assert cache.read_entry("release-tags", "owner/repo") is None
@@ -0,0 +1,44 @@
+import json
+
+from scikit_package.utils import cookie
+
+
+def test_run(mocker, tmp_path, monkeypatch, capsys):
+    # C1: cookiecutter.json of an existing project with list values and
+    #   private entries in the current working directory. Expect
+    #   cookiecutter is run in-process with the template from the mirror
+    #   and the context without the private entries as a dict.
+    project_context = {
+        "project_name": "diffpy.my-project",
+        "project_needs_c_code_compiled": ["No", "Yes"],
+    }
+    (tmp_path / "cookiecutter.json").write_text(
+        json.dumps({**project_context, "_extensions": ["old.Extension"]})
+    )
+    monkeypatch.chdir(tmp_path)
+    mocker.patch(
+        "scikit_package.utils.io.get_latest_release_tag",
+        return_value="1.0.0",
+    )
+    mocker.patch(
+        "scikit_package.utils.mirror.checkout_template",
+        return_value=tmp_path / "template",
+    )
+    mocker.patch("scikit_package.utils.io.get_config_file", return_value=None)
+    cookiecutter_mocker = mocker.patch(
+        "scikit_package.utils.cookie.cookiecutter"
+    )
+    cookie.run("https://github.com/scikit-package/scikit-package", update=True)
+    cookiecutter_mocker.assert_called_once_with(
+        str(tmp_path / "template"),
+        checkout=None,
+        extra_context={**project_context, "_is_skpkg_update": "Yes"},
+        config_file=None,
+    )
+    # C2: a value of the project does not fit the new template.
+    #   Expect the failure is reported instead of raised.
+    cookiecutter_mocker.side_effect = ValueError(
+        "Value provided for multi-choice variable"
+    )
+    cookie.run("https://github.com/scikit-package/scikit-package")
+    assert "Failed to run scikit-package" in capsys.readouterr().out
@@ -0,0 +1,153 @@
+import json
+
+import pytest
+
+from scikit_package.cli.create import _read_batch_manifest, batch
+from scikit_package.utils import cookie
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    template_dir = tmp_path / "template"
+    package_dir = template_dir / "{{ cookiecutter.project_name }}"
+    package_dir.mkdir(parents=True)
+    (template_dir / "cookiecutter.json").write_text(
+        json.dumps({"project_name": "my-project", "_is_skpkg_update": "No"})
+    )
+    (package_dir / "README.rst").write_text("{{ cookiecutter.project_name }}")
+    return template_dir
+
+
+def test_read_batch_manifest(tmp_path):
+    # C1: a manifest with all entries. Expect they are returned.
+    manifest_path = tmp_path / "manifest.yaml"
+    manifest_path.write_text("""
+template: workspace
+output_dir: packages
+max_workers: 2
+packages:
+  - project_name: project-a
+  - project_name: project-b
+""")
+    assert _read_batch_manifest(manifest_path) == {
+        "template": "workspace",
+        "output_dir": "packages",
+        "max_workers": 2,
+        "packages": [
+            {"project_name": "project-a"},
+            {"project_name": "project-b"},
+        ],
+    }
+    # C2: a plain list of package contexts. Expect the default entries.
+    manifest_path.write_text("- project_name: project-a\n")
+    assert _read_batch_manifest(manifest_path) == {
+        "template": "public",
+        "output_dir": ".",
+        "max_workers": None,
+        "packages": [{"project_name": "project-a"}],
+    }
+
+
+def test_read_batch_manifest_bad(tmp_path):
+    # C1: a manifest without package contexts. Expect ValueError.
+    manifest_path = tmp_path / "manifest.yaml"
+    manifest_path.write_text("template: public\n")
+    with pytest.raises(ValueError, match="must contain a list of package"):
+        _read_batch_manifest(manifest_path)
+    # C2: a non-existing manifest. Expect FileNotFoundError.
+    with pytest.raises(FileNotFoundError):
+        _read_batch_manifest(tmp_path / "nonexisting.yaml")
+
+
+def test_batch(mocker, tmp_path, template_dir, capsys):
+    # C1: a manifest with two valid packages and a package whose directory
+    #   already exists. Expect the tag and the template checkout are
+    #   resolved once, the valid packages are created and the failure is
+    #   reported.
+    output_dir = tmp_path / "packages"
+    (output_dir / "project-c").mkdir(parents=True)
+    manifest_path = tmp_path / "manifest.yaml"
+    manifest_path.write_text(
+        json.dumps(
+            {
+                "output_dir": str(output_dir),
+                "max_workers": 2,
+                "packages": [
+                    {"project_name": "project-a"},
+                    {"project_name": "project-b"},
+                    {"project_name": "project-c"},
+                ],
+            }
+        )
+    )
+    tag_mocker = mocker.patch(
+        "scikit_package.utils.io.get_latest_release_tag",
+        return_value="1.0.0",
+    )
+    checkout_mocker = mocker.patch(
+        "scikit_package.utils.mirror.checkout_template",
+        return_value=template_dir,
+    )
+    mocker.patch("scikit_package.utils.io.get_config_file", return_value=None)
+    results = batch(str(manifest_path))
+    tag_mocker.assert_called_once()
+    checkout_mocker.assert_called_once()
+    assert [(name, error is None) for name, _, error in results] == [
+        ("project-a", True),
+        ("project-b", True),
+        ("project-c", False),
+    ]
+    for name in ["project-a", "project-b"]:
+        assert (output_dir / name / "README.rst").read_text() == name
+    captured = capsys.readouterr()
+    assert "Created 2 of 3 packages" in captured.out
+    assert "  - project-c: " in captured.out
+
+
+def test_batch_bad(tmp_path, mocker):
+    # C1: a template that can not be rendered without prompts.
+    #   Expect ValueError and no rendering.
+    manifest_path = tmp_path / "manifest.yaml"
+    manifest_path.write_text("- project_name: project-a\n")
+    run_batch_mocker = mocker.patch.object(cookie, "run_batch")
+    with pytest.raises(ValueError, match="not supported in batch mode"):
+        batch(str(manifest_path), template="conda-forge")
+    run_batch_mocker.assert_not_called()
+
+
+def test_batch_checkout_failed(mocker, tmp_path, capsys):
+    # C1: the template can not be checked out of the local mirror.
+    #   Expect every package is reported as failed with the reason and
+    #   nothing is rendered.
+    output_dir = tmp_path / "packages"
+    manifest_path = tmp_path / "manifest.yaml"
+    manifest_path.write_text(
+        json.dumps(
+            {
+                "output_dir": str(output_dir),
+                "packages": [
+                    {"project_name": "project-a"},
+                    {"project_name": "project-b"},
+                ],
+            }
+        )
+    )
+    mocker.patch(
+        "scikit_package.utils.io.get_latest_release_tag",
+        return_value="1.0.0",
+    )
+    mocker.patch(
+        "scikit_package.utils.mirror.checkout_template",
+        side_effect=OSError("No space left on device"),
+    )
+    results = batch(str(manifest_path))
+    assert [(name, error) for name, _, error in results] == [
+        (
+            name,
+            "the template could not be checked out: No space left on device",
+        )
+        for name in ["project-a", "project-b"]
+    ]
+    assert not output_dir.exists()
+    captured = capsys.readouterr()
+    assert "Created 0 of 2 packages" in captured.out
@@ -0,0 +1,149 @@
+import pytest
+
+from scikit_package.utils import forges
+
+GITLAB_REPO = {"archived": False, "issues_access_level": "enabled"}
+GITEA_REPO = {"archived": False, "has_issues": True}
+
+
+@pytest.mark.parametrize(
+    "repo_url, expected_path",
+    [
+        # C1: a repo in a subgroup. Expect the full path without `.git`.
+        ("https://gitlab.com/group/sub/repo.git", "group/sub/repo"),
+        # C2: a url of another host. Expect None.
+        ("https://github.com/group/repo", None),
+        # C3: a url of a group. Expect None.
+        ("https://gitlab.com/group", None),
+    ],
+)
+def test_get_repo_path(repo_url, expected_path):
+    forge = forges.GitLab("https://gitlab.com", "token")
+    assert forge.get_repo_path(repo_url) == expected_path
+
+
+def test_gitlab(start_stub_server):
+    stub = start_stub_server()
+    api_url = "/api/v4/projects/group%2Fsub%2Frepo"
+    stub.routes = {
+        ("GET", api_url): (200, GITLAB_REPO, {}),
+        ("GET", "/api/v4/projects/group%2Farchived"): (
+            200,
+            {**GITLAB_REPO, "archived": True},
+            {},
+        ),
+        ("GET", "/api/v4/projects/group%2Fnoissues"): (
+            200,
+            {**GITLAB_REPO, "issues_access_level": "disabled"},
+            {},
+        ),
+        ("POST", f"{api_url}/issues"): [
+            (429, {"message": "Retry later"}, {"Retry-After": "0"}),
+            (201, {"web_url": f"{stub.url}/group/sub/repo/-/issues/7"}, {}),
+        ],
+        ("GET", f"{api_url}/issues"): (
+            200,
+            [
+                {"title": "Drop Python", "web_url": "issue-1"},
+                {"title": "Drop Python 3.10", "web_url": "issue-2"},
+            ],
+            {},
+        ),
+    }
+    forge = forges.GitLab(stub.url, "gl-token", concurrency=2)
+    repo_url = f"{stub.url}/group/sub/repo"
+    # C1: repos in various states. Expect the reasons why the creation
+    #   might fail.
+    assert forge.check_repos(
+        [
+            repo_url,
+            f"{stub.url}/group/archived",
+            f"{stub.url}/group/noissues",
+            f"{stub.url}/group/missing",
+        ]
+    ) == {
+        repo_url: None,
+        f"{stub.url}/group/archived": "archived",
+        f"{stub.url}/group/noissues": "issues disabled",
+        f"{stub.url}/group/missing": "not found",
+    }
+    assert all(
+        headers["PRIVATE-TOKEN"] == "gl-token"
+        for _, _, headers, _ in stub.requests
+    )
+    # C2: an issue is created after a rate limit. Expect it is retried,
+    #   sent with the GitLab fields and reported with its url.
+    created = []
+    stub.requests.clear()
+    assert forge.create_issues(
+        [repo_url],
+        {"title": "Drop Python 3.10", "body": "Please drop it."},
+        on_created=lambda *args: created.append(args),
+    ) == {repo_url: None}
+    assert [body for _, _, _, body in stub.requests] == [
+        {"title": "Drop Python 3.10", "description": "Please drop it."}
+    ] * 2
+    assert created == [(repo_url, f"{stub.url}/group/sub/repo/-/issues/7")]
+    # C3: repos searched for an open issue with the title, twice and by
+    #   another forge of the same host. Expect the exact title is matched,
+    #   the missing repo is not reported and searched again each time and
+    #   the other results are reused.
+    stub.requests.clear()
+    missing_url = f"{stub.url}/group/missing"
+    for forge in [forge, forge, forges.GitLab(stub.url, "gl-token")]:
+        assert forge.find_open_issues(
+            [repo_url, missing_url], "Drop Python 3.10"
+        ) == {repo_url: "issue-2"}
+    assert len(stub.requests) == 4
+    assert "search=Drop+Python+3.10" in stub.requests[0][1]
+
+
+def test_forge_is_abstract():
+    # C1: a forge without the requests of its API. Expect TypeError.
+    class Incomplete(forges.Forge):
+        def get_headers(self):
+            return {}
+
+    with pytest.raises(TypeError, match="abstract"):
+        Incomplete("https://forge.example.com", "token")
+
+
+def test_gitea(start_stub_server):
+    stub = start_stub_server()
+    api_url = "/api/v1/repos/owner/repo"
+    stub.routes = {
+        ("GET", api_url): (200, GITEA_REPO, {}),
+        ("GET", "/api/v1/repos/owner/noissues"): (
+            200,
+            {**GITEA_REPO, "has_issues": False},
+            {},
+        ),
+        ("POST", f"{api_url}/issues"): (
+            201,
+            {"html_url": f"{stub.url}/owner/repo/issues/3"},
+            {},
+        ),
+        ("POST", "/api/v1/repos/owner/noissues/issues"): (
+            403,
+            {"message": "Forbidden"},
+            {},
+        ),
+    }
+    forge = forges.Gitea(stub.url, "gt-token")
+    repo_url = f"{stub.url}/owner/repo"
+    noissues_url = f"{stub.url}/owner/noissues"
+    # C1: a repo with issues and one without. Expect the latter might
+    #   fail.
+    assert forge.check_repos([repo_url, noissues_url]) == {
+        repo_url: None,
+        noissues_url: "issues disabled",
+    }
+    # C2: the issue is created in both. Expect the creation fails in the
+    #   repo without issues, and the token and fields of Gitea are sent.
+    stub.requests.clear()
+    assert forge.create_issues(
+        [repo_url, noissues_url], {"title": "title", "body": "body"}
+    ) == {repo_url: None, noissues_url: "403 Forbidden"}
+    for _, _, headers, body in stub.requests:
+        assert headers["Authorization"] == "token gt-token"
+        assert body == {"title": "title", "body": "body"}
@@ -1,9 +1,12 @@
 import os
 import re
+import threading
+import time
 from types import SimpleNamespace
 
 import pytest
 
+from scikit_package.cli import gh
 from scikit_package.cli.gh import (
     _broadcast_issue_to_urls,
     _get_broadcast_repos_dict,
@@ -11,15 +14,17 @@ from scikit_package.cli.gh import (
     _get_issue_content,
     broadcast_issue_to_repos,
 )
+from scikit_package.utils import forges
 
 
 def test_get_issue_content(mocker):
     # C1: a valid issue url. Expect the source_repo_url and
     #   issue content are returned.
     get_issue_mocker = mocker.patch(
-        "requests.get",
+        "scikit_package.utils.http.get",
         return_value=SimpleNamespace(
             status_code=200,
+            headers={"ETag": '"etag-1"'},
             json=lambda: {"title": "issue-title", "body": "issue-body"},
         ),
     )
@@ -32,6 +37,23 @@ def test_get_issue_content(mocker):
     get_issue_mocker.assert_called_once()
     assert actual_source_repo_url == expected_source_repo_url
     assert actual_issue_content == expected_issue_content
+    # C2: the issue is fetched again with a token and is unchanged.
+    #   Expect it is revalidated with its ETag and the cached content is
+    #   returned.
+    get_issue_mocker.return_value = SimpleNamespace(
+        status_code=304, headers={}
+    )
+    actual_source_repo_url, actual_issue_content = _get_issue_content(
+        issue_url, "dummy_token"
+    )
+    headers = get_issue_mocker.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"etag-1"'
+    assert headers["Authorization"] == "token dummy_token"
+    assert actual_issue_content == expected_issue_content
+    # C3: GitHub can not be reached. Expect the cached content is
+    #   returned.
+    get_issue_mocker.side_effect = gh.http.RequestException("offline")
+    assert _get_issue_content(issue_url)[1] == expected_issue_content
 
 
 def test_get_issue_content_bad(mocker):
@@ -50,7 +72,7 @@ def test_get_issue_content_bad(mocker):
     # C2: a valid url but can not find the corresponding issue.
     #   Expect ValueError.
     get_issue_fail_mocker = mocker.patch(
-        "requests.get",
+        "scikit_package.utils.http.get",
         return_value=SimpleNamespace(
             status_code=404,
             json=lambda: {"message": "Not Found"},
@@ -94,21 +116,10 @@ def test_get_broadcast_repos_dict_url_and_dir(
     url_to_repo_info,
     expected_return_dicts_name,
 ):
-    def mock_clone_repo(cwd, **kwargs):
-        # already a temporary directory created by
-        #   _get_broadcast_repos_dict
-        source_dir = user_filesystem / "repo_info_dir_json"
-        group_json_content = (source_dir / "groups.json").read_text()
-        repos_json_content = (source_dir / "repos.json").read_text()
-        target_dir = cwd[-1]
-        with open(f"{target_dir}/groups.json", "w") as f:
-            f.write(group_json_content)
-        with open(f"{target_dir}/repos.json", "w") as f:
-            f.write(repos_json_content)
-
+    # the sparse checkout of the repo contains the files of the directory
     mocker.patch(
-        "subprocess.run",
-        side_effect=mock_clone_repo,
+        "scikit_package.utils.mirror.checkout_sparse",
+        return_value=user_filesystem / "repo_info_dir_json",
     )
     filesystem_dicts = (
         {
@@ -198,8 +209,8 @@ def test_get_broadcast_repos_dict_bad_url_and_dir(
     mocker, user_filesystem, url_to_repo_info, error, error_msg_parts
 ):
     mocker.patch(
-        "subprocess.run",
-        return_value=None,
+        "scikit_package.utils.mirror.checkout_sparse",
+        return_value=user_filesystem / "empty-source-dir",
     )
     if url_to_repo_info.startswith("http"):
         pass
@@ -326,11 +337,108 @@ def test_get_broadcast_urls_bad():
         )
 
 
+@pytest.mark.parametrize(
+    "input_name, expected_repos",
+    [
+        # C1: a group containing another group. Expect the repos of both
+        #   without duplicates.
+        ("all", ["repo1", "repo3", "repo2", "repo4"]),
+        # C2: a group difference. Expect the repos of the left-hand group
+        #   that are not in the right-hand group.
+        ("all - archived", ["repo1", "repo3"]),
+        # C3: a union and an intersection. Expect `&` binds tighter than
+        #   `|`.
+        ("odd | even & my-group", ["repo1", "repo3", "repo2"]),
+        # C4: parentheses and a name with a hyphen. Expect the urls in the
+        #   order of the left-hand operand.
+        ("(even | odd) & my-group", ["repo2", "repo3"]),
+        # C5: a repo name without spaces around the operator.
+        ("odd|repo2", ["repo1", "repo3", "repo2"]),
+    ],
+)
+def test_get_broadcast_urls_expression(input_name, expected_repos):
+    groups_dict = {
+        "all": ["odd", "even", "repo1"],
+        "odd": ["repo1", "repo3"],
+        "even": ["repo2", "repo4"],
+        "archived": ["repo2", "repo4"],
+        "my-group": ["repo3", "repo2"],
+    }
+    repos_dict = {
+        f"repo{i}": f"https://github.com/user/repo{i}" for i in range(5)
+    }
+    actual_urls = _get_broadcast_urls(input_name, groups_dict, repos_dict)
+    assert actual_urls == [repos_dict[name] for name in expected_repos]
+
+
+@pytest.mark.parametrize(
+    "input_name, groups_dict, error, message",
+    [
+        # C1: groups containing each other. Expect ValueError with the
+        #   cycle.
+        (
+            "a",
+            {"a": ["repo1", "b"], "b": ["c"], "c": ["a"]},
+            ValueError,
+            "The groups a -> b -> c -> a contain each other.",
+        ),
+        # C2: an unknown name in an expression. Expect KeyError.
+        (
+            "a - unknown",
+            {"a": ["repo1"]},
+            KeyError,
+            "`unknown` does not exist",
+        ),
+        # C3: invalid expressions. Expect ValueError.
+        ("(a | a", {"a": ["repo1"]}, ValueError, "not closed"),
+        ("a | ", {"a": ["repo1"]}, ValueError, "instead of `the end`"),
+        ("a a", {"a": ["repo1"]}, ValueError, "Unexpected `a`"),
+    ],
+)
+def test_get_broadcast_urls_expression_bad(
+    input_name, groups_dict, error, message
+):
+    repos_dict = {"repo1": "https://github.com/user/repo1"}
+    with pytest.raises(error, match=re.escape(message)):
+        _get_broadcast_urls(input_name, groups_dict, repos_dict)
+
+
+WRITABLE_REPOSITORY = {
+    "hasIssuesEnabled": True,
+    "isArchived": False,
+    "viewerPermission": "WRITE",
+}
+
+
+def _mock_github(mocker, graphql_repository, create_issue_response):
+    """Mock the GraphQL API to return ``graphql_repository`` for every
+    repository and no open issue, and the REST API to return
+    ``create_issue_response``."""
+
+    def mock_post(url, json, headers, **kwargs):
+        if url != gh.GRAPHQL_URL:
+            return create_issue_response
+        if "search(" in json["query"]:
+            data = {
+                f"s{i}": {"nodes": []} for i in range(len(json["variables"]))
+            }
+        else:
+            n_repos = len(json["variables"]) // 2
+            data = {f"r{i}": graphql_repository for i in range(n_repos)}
+        return SimpleNamespace(
+            status_code=200, reason="OK", json=lambda: {"data": data}
+        )
+
+    return mocker.patch(
+        "scikit_package.utils.http.post", side_effect=mock_post
+    )
+
+
 @pytest.mark.parametrize(
     (
         "broadcast_urls, expected_non_gh_urls, expected_failed_urls, "
         "dry_run, create_issue_mocker_return_value, "
-        "dry_run_mocker_return_value"
+        "graphql_repository"
     ),
     [
         # C1: a list of target repo urls and dry_run is True.
@@ -344,13 +452,7 @@ def test_get_broadcast_urls_bad():
             [],
             True,
             SimpleNamespace(status_code=201, reason="OK"),
-            SimpleNamespace(
-                status_code=200,
-                reason="OK",
-                json=lambda: {
-                    "owner": {"login": "user-or-orgname"},
-                },
-            ),
+            WRITABLE_REPOSITORY,
         ),
         # C2: a list of target repo urls, and dry_run is False.
         #   Expect non_gh_urls, failed_gh_urls to be empty, and
@@ -364,13 +466,7 @@ def test_get_broadcast_urls_bad():
             [],
             False,
             SimpleNamespace(status_code=201, reason="OK"),
-            SimpleNamespace(
-                status_code=200,
-                reason="OK",
-                json=lambda: {
-                    "owner": {"login": "user-or-orgname"},
-                },
-            ),
+            WRITABLE_REPOSITORY,
         ),
         # C3: One URL is not with a format of GH repo, another URL is with
         #   a format of GH repo but doesn't point to a valid GH repo,
@@ -388,11 +484,7 @@ def test_get_broadcast_urls_bad():
                 status_code=404,
                 reason="Not Found",
             ),
-            SimpleNamespace(
-                status_code=404,
-                reason="Not Found",
-                json=lambda: {},
-            ),
+            None,
         ),
         # C4: One URL is not with a format of GH repo, another URL is with
         #   a format of GH repo but doesn't point to a valid GH repo,
@@ -411,11 +503,7 @@ def test_get_broadcast_urls_bad():
                 status_code=404,
                 reason="Not Found",
             ),
-            SimpleNamespace(
-                status_code=404,
-                reason="Not Found",
-                json=lambda: {},
-            ),
+            None,
         ),
     ],
 )
@@ -426,16 +514,9 @@ def test_broadcast_issue_to_urls(
     expected_failed_urls,
     dry_run,
     create_issue_mocker_return_value,
-    dry_run_mocker_return_value,
+    graphql_repository,
 ):
-    mocker.patch(
-        "requests.post",
-        return_value=create_issue_mocker_return_value,
-    )
-    mocker.patch(
-        "requests.get",
-        return_value=dry_run_mocker_return_value,
-    )
+    _mock_github(mocker, graphql_repository, create_issue_mocker_return_value)
     issue_content = {"title": "issue-title", "body": "issue-body"}
     actual_non_gh_urls, actual_failed_urls, actual_dry_run = (
         _broadcast_issue_to_urls(
@@ -450,6 +531,52 @@ def test_broadcast_issue_to_urls(
     assert actual_dry_run is dry_run
 
 
+def test_broadcast_issue_to_urls_concurrently(mocker, capsys):
+    # C1: eight repos with a concurrency of 3, one of them rejects the
+    #   issue and one can not be reached. Expect at most 3 issues are
+    #   created at the same time, and all repos are reported in order.
+    repo_urls = [f"https://github.com/user/repo{i}" for i in range(8)]
+    lock = threading.Lock()
+    in_flight, max_in_flight = [0], [0]
+
+    def mock_post(api_url, json, headers, limiter):
+        assert isinstance(limiter, gh.http.RateLimiter)
+        with lock:
+            in_flight[0] += 1
+            max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        if api_url.endswith("/repo3/issues"):
+            return SimpleNamespace(status_code=410, reason="Gone")
+        if api_url.endswith("/repo5/issues"):
+            raise gh.http.RequestException("Connection aborted.")
+        return SimpleNamespace(status_code=201, reason="Created")
+
+    post_mocker = mocker.patch(
+        "scikit_package.utils.http.post", side_effect=mock_post
+    )
+    non_gh_urls, failed_gh_urls, dry_run = _broadcast_issue_to_urls(
+        {"title": "issue-title", "body": "issue-body"},
+        repo_urls,
+        gh_token="dummy_token",
+        dry_run=False,
+        concurrency=3,
+    )
+    assert post_mocker.call_count == 8
+    assert max_in_flight[0] == 3
+    assert non_gh_urls == []
+    assert failed_gh_urls == [repo_urls[3], repo_urls[5]]
+    assert dry_run is False
+    captured = capsys.readouterr()
+    assert f"  - [410 Gone] {repo_urls[3]}" in captured.out
+    assert f"  - [Connection aborted.] {repo_urls[5]}" in captured.out
+    success_report = captured.out.split("Successfully created issues")[1]
+    assert [
+        line.removeprefix("  - ") for line in success_report.splitlines()[1:]
+    ] == [url for i, url in enumerate(repo_urls) if i not in (3, 5)]
+
+
 def test_broadcast_issue_to_repos(mocker, user_filesystem):
     # C1: GITHUB_TOKEN is set in environment variables.
     #  Expect no error is raised.
@@ -468,19 +595,10 @@ def test_broadcast_issue_to_repos(mocker, user_filesystem):
         ),
     )
     mocker.patch.dict(os.environ, {"GITHUB_TOKEN": "dummy_token"}, clear=True)
-    mocker.patch(
-        "requests.post",
-        return_value=SimpleNamespace(status_code=201, reason="OK"),
-    )
-    mocker.patch(
-        "requests.get",
-        return_value=SimpleNamespace(
-            status_code=200,
-            reason="OK",
-            json=lambda: {
-                "owner": {"login": "user-or-orgname"},
-            },
-        ),
+    _mock_github(
+        mocker,
+        WRITABLE_REPOSITORY,
+        SimpleNamespace(status_code=201, reason="OK"),
     )
     non_gh_urls, failed_gh_urls, dry_run = broadcast_issue_to_repos(args)
     assert non_gh_urls == []
@@ -498,3 +616,366 @@ def test_broadcast_issue_to_repos(mocker, user_filesystem):
         ),
     ):
         non_gh_urls, failed_gh_urls, dry_run = broadcast_issue_to_repos(args)
+
+
+def test_check_repos(mocker):
+    # C1: 120 repos with various states. Expect they are checked with one
+    #   GraphQL query per batch and classified with the failure reasons.
+    repo_urls = [f"https://github.com/user/repo{i}" for i in range(120)]
+    repositories = {
+        "repo1": None,
+        "repo2": {**WRITABLE_REPOSITORY, "isArchived": True},
+        "repo3": {**WRITABLE_REPOSITORY, "hasIssuesEnabled": False},
+        "repo4": {**WRITABLE_REPOSITORY, "viewerPermission": None},
+        "repo5": None,
+    }
+
+    def mock_post(url, json, headers):
+        assert url == gh.GRAPHQL_URL
+        assert headers["Authorization"] == "token dummy_token"
+        variables = json["variables"]
+        data, errors = {}, []
+        for i in range(len(variables) // 2):
+            name = variables[f"name{i}"]
+            data[f"r{i}"] = repositories.get(name, WRITABLE_REPOSITORY)
+            if name == "repo5":
+                errors.append({"path": [f"r{i}"], "type": "FORBIDDEN"})
+        return SimpleNamespace(
+            status_code=200,
+            reason="OK",
+            json=lambda: {"data": data, "errors": errors},
+        )
+
+    post_mocker = mocker.patch(
+        "scikit_package.utils.http.post", side_effect=mock_post
+    )
+    might_fail_info, might_succeed = gh._check_repos(
+        repo_urls, {"Authorization": "token dummy_token"}
+    )
+    assert post_mocker.call_count == 3
+    assert might_fail_info == [
+        ("https://github.com/user/repo1", "not found"),
+        ("https://github.com/user/repo2", "archived"),
+        ("https://github.com/user/repo3", "issues disabled"),
+        ("https://github.com/user/repo4", "no permission"),
+        ("https://github.com/user/repo5", "forbidden"),
+    ]
+    assert might_succeed == [
+        url for url in repo_urls if url not in dict(might_fail_info)
+    ]
+    # C2: the GraphQL API rejects the token. Expect every repo of the
+    #   batch might fail with the status of the response.
+    post_mocker.side_effect = None
+    post_mocker.return_value = SimpleNamespace(
+        status_code=401, reason="Unauthorized"
+    )
+    might_fail_info, might_succeed = gh._check_repos(repo_urls[:2], {})
+    assert might_fail_info == [
+        (url, "401 Unauthorized") for url in repo_urls[:2]
+    ]
+    assert might_succeed == []
+
+
+def test_broadcast_issue_to_urls_resume(mocker, capsys):
+    issue_url = "https://github.com/user/source/issues/1"
+    repo_urls = [f"https://github.com/user/repo{i}" for i in range(4)]
+    failing_urls = {"https://api.github.com/repos/user/repo2/issues"}
+
+    def mock_post(api_url, json, headers, limiter):
+        if api_url in failing_urls:
+            return SimpleNamespace(status_code=500, reason="Server Error")
+        repo = api_url.split("/")[-2]
+        return SimpleNamespace(
+            status_code=201,
+            reason="Created",
+            json=lambda: {"html_url": f"https://github.com/user/{repo}/1"},
+        )
+
+    post_mocker = mocker.patch(
+        "scikit_package.utils.http.post", side_effect=mock_post
+    )
+
+    def broadcast(resume):
+        return _broadcast_issue_to_urls(
+            {"title": "issue-title", "body": "issue-body"},
+            repo_urls,
+            gh_token="dummy_token",
+            dry_run=False,
+            issue_url=issue_url,
+            resume=resume,
+        )
+
+    # C1: a broadcast failing in one repo. Expect the other repos are
+    #   recorded in the journal of the issue.
+    assert broadcast(resume=False)[1] == [repo_urls[2]]
+    assert gh._read_journal(issue_url) == {
+        repo_urls[0],
+        repo_urls[1],
+        repo_urls[3],
+    }
+    # C2: the broadcast is resumed after the failure is fixed and the
+    #   journal ends with a line cut short. Expect only the missing repo
+    #   is sent the issue and it is added to the journal.
+    with open(gh._get_journal_path(issue_url), "a") as f:
+        f.write('{"repo_url": "https://github.com/user/rep')
+    failing_urls.clear()
+    post_mocker.reset_mock()
+    capsys.readouterr()
+    assert broadcast(resume=True)[1] == []
+    assert [c.args[0] for c in post_mocker.call_args_list] == [
+        "https://api.github.com/repos/user/repo2/issues"
+    ]
+    assert (
+        "the following repositories, which are skipped:"
+        in capsys.readouterr().out
+    )
+    assert gh._read_journal(issue_url) == set(repo_urls)
+    # C3: the broadcast is run again without resume. Expect a warning and
+    #   the issue is sent to all repos again.
+    post_mocker.reset_mock()
+    broadcast(resume=False)
+    assert post_mocker.call_count == 4
+    assert (
+        "the issue has already been broadcast to 4 of the target "
+        "repositories" in capsys.readouterr().out
+    )
+
+
+def test_broadcast_issue_to_urls_duplicates(mocker, capsys):
+    repo_urls = [f"https://github.com/user/repo{i}" for i in range(25)]
+    title = 'Drop "Python 3.10"'
+    open_issues = {
+        # an open issue with the same title
+        "user/repo1": [
+            {"title": "Drop Python", "url": "https://github.com/a/1"},
+            {"title": title, "url": "https://github.com/user/repo1/9"},
+        ],
+        # only a similar title
+        "user/repo2": [{"title": "Drop Python 3.10", "url": "x"}],
+        "user/repo21": [
+            {"title": title, "url": "https://github.com/user/repo21/3"}
+        ],
+    }
+
+    def mock_post(url, json, headers, **kwargs):
+        if url != gh.GRAPHQL_URL:
+            return SimpleNamespace(status_code=201, reason="Created")
+        assert "search(" in json["query"]
+        data = {}
+        for name, query in json["variables"].items():
+            repo = query.split()[0].removeprefix("repo:")
+            assert query.endswith('in:title "Drop  Python 3.10 "')
+            data[name.replace("q", "s")] = {"nodes": open_issues.get(repo, [])}
+        return SimpleNamespace(
+            status_code=200, reason="OK", json=lambda: {"data": data}
+        )
+
+    post_mocker = mocker.patch(
+        "scikit_package.utils.http.post", side_effect=mock_post
+    )
+
+    def broadcast(duplicates):
+        return _broadcast_issue_to_urls(
+            {"title": title, "body": "issue-body"},
+            repo_urls,
+            gh_token="dummy_token",
+            dry_run=False,
+            duplicates=duplicates,
+        )
+
+    # C1: two repos already have an open issue with the same title.
+    #   Expect they are searched in two GraphQL queries and skipped.
+    broadcast("skip")
+    created = [
+        c.args[0]
+        for c in post_mocker.call_args_list
+        if c.args[0] != gh.GRAPHQL_URL
+    ]
+    assert len(created) == 23
+    assert post_mocker.call_count == 25
+    assert "https://api.github.com/repos/user/repo1/issues" not in created
+    assert "https://api.github.com/repos/user/repo21/issues" not in created
+    out = capsys.readouterr().out
+    assert f"  - {repo_urls[1]} (https://github.com/user/repo1/9)" in out
+    # C2: the duplicates are only flagged. Expect the results of the
+    #   search are reused and the issue is created in every repo.
+    post_mocker.reset_mock()
+    broadcast("flag")
+    assert post_mocker.call_count == 25
+    assert all(c.args[0] != gh.GRAPHQL_URL for c in post_mocker.call_args_list)
+    assert "'--skip-duplicates y' to skip them" in capsys.readouterr().out
+
+
+def test_compile_registry(tmp_path, mocker):
+    registry_dir = tmp_path / "registry"
+    registry_dir.mkdir()
+    groups_file = registry_dir / "groups.yaml"
+    groups_file.write_text("odd: [repo1, repo3]\neven: [repo2]\n")
+    (registry_dir / "repos.yml").write_text(
+        "".join(
+            f"repo{i}: https://github.com/user/repo{i}\n" for i in (1, 2, 3)
+        )
+    )
+    safe_load_spy = mocker.spy(gh.yaml, "safe_load")
+    # C1: a cold cache. Expect the files are parsed and the urls of each
+    #   group are indexed.
+    registry = gh._compile_registry(registry_dir)
+    assert safe_load_spy.call_count == 2
+    assert registry["groups"] == {"odd": ["repo1", "repo3"], "even": ["repo2"]}
+    assert registry["index"] == {
+        "odd": [
+            "https://github.com/user/repo1",
+            "https://github.com/user/repo3",
+        ],
+        "even": ["https://github.com/user/repo2"],
+    }
+    # C2: the files are unchanged, or only touched. Expect the compiled
+    #   registry is reused without parsing the files.
+    assert gh._compile_registry(registry_dir) == registry
+    os.utime(groups_file, ns=(0, 0))
+    assert gh._compile_registry(registry_dir)["index"] == registry["index"]
+    assert safe_load_spy.call_count == 2
+    # C3: a group is changed. Expect the files are parsed again.
+    groups_file.write_text(
+        "odd: [repo1, repo3]\neven: [repo2]\nall: [repo1]\n"
+    )
+    registry = gh._compile_registry(registry_dir)
+    assert safe_load_spy.call_count == 4
+    assert gh._get_broadcast_urls(
+        "all", registry["groups"], registry["repos"], index=registry["index"]
+    ) == ["https://github.com/user/repo1"]
+    # C4: a group mentions a missing repo. Expect KeyError every time.
+    groups_file.write_text("odd: [repo5]\n")
+    for _ in range(2):
+        with pytest.raises(KeyError, match="repo `repo5`"):
+            gh._compile_registry(registry_dir)
+
+
+def test_get_forges(mocker, tmp_path, capsys):
+    home_dir = tmp_path / "home"
+    home_dir.mkdir()
+    (home_dir / ".skpkgrc").write_text(
+        '{"forges": {"git.example.com": "gitlab", "bad.example.com": "svn"}}'
+    )
+    mocker.patch("pathlib.Path.home", return_value=home_dir)
+    mocker.patch.dict(
+        os.environ,
+        {"GITHUB_TOKEN": "gh", "GITLAB_TOKEN": "gl", "GITEA_TOKEN": "gt"},
+        clear=True,
+    )
+    # C1: repos on GitHub, a self-hosted GitLab, Codeberg and an unknown
+    #   host. Expect a forge with its own token and rate limiter for each
+    #   known host.
+    forges_by_url = gh._get_forges(
+        [
+            "https://github.com/user/repo1",
+            "https://github.com/user/repo2",
+            "https://git.example.com/group/repo",
+            "https://codeberg.org/user/repo",
+            "https://unknown.example.com/user/repo",
+        ]
+    )
+    assert {url: type(f).__name__ for url, f in forges_by_url.items()} == {
+        "https://github.com": "GitHub",
+        "https://git.example.com": "GitLab",
+        "https://codeberg.org": "Gitea",
+    }
+    assert forges_by_url["https://git.example.com"].token == "gl"
+    limiters = {id(forge.limiter) for forge in forges_by_url.values()}
+    assert len(limiters) == 3
+    # C2: the token of a targeted forge is not set. Expect a warning and
+    #   the other forges are still used.
+    del os.environ["GITLAB_TOKEN"]
+    assert list(
+        gh._get_forges(
+            [
+                "https://git.example.com/group/repo1",
+                "https://git.example.com/group/repo2",
+                "https://codeberg.org/user/repo",
+            ]
+        )
+    ) == ["https://codeberg.org"]
+    out = capsys.readouterr().out
+    assert out.count("Warning: GITLAB_TOKEN environment variable") == 1
+    assert "repositories on git.example.com are skipped" in out
+    # C3: a host with an unknown forge type. Expect ValueError.
+    with pytest.raises(ValueError, match="forge type `svn`"):
+        gh._get_forges(["https://bad.example.com/group/repo"])
+
+
+def test_broadcast_issue_to_urls_forges(mocker, start_stub_server, capsys):
+    gitlab = start_stub_server()
+    gitea = start_stub_server()
+    for i in range(2):
+        path = f"/api/v4/projects/group%2Frepo{i}"
+        gitlab.routes[("GET", path)] = (200, {"archived": False}, {})
+        gitlab.routes[("POST", f"{path}/issues")] = (
+            201,
+            {"web_url": f"{gitlab.url}/group/repo{i}/-/issues/1"},
+            {},
+        )
+    gitea.routes[("GET", "/api/v1/repos/user/repo")] = (
+        200,
+        {"archived": True},
+        {},
+    )
+    gitea.routes[("POST", "/api/v1/repos/user/repo/issues")] = (
+        201,
+        {"html_url": f"{gitea.url}/user/repo/issues/1"},
+        {},
+    )
+    _mock_github(
+        mocker,
+        WRITABLE_REPOSITORY,
+        SimpleNamespace(
+            status_code=201,
+            reason="Created",
+            json=lambda: {"html_url": "https://github.com/user/repo/1"},
+        ),
+    )
+    repo_urls = [
+        "https://github.com/user/repo",
+        f"{gitlab.url}/group/repo0",
+        f"{gitea.url}/user/repo",
+        "https://unknown.example.com/user/repo",
+        f"{gitlab.url}/group/repo1",
+    ]
+    forges_by_url = {
+        gh.GITHUB_URL: gh.GitHub("gh-token"),
+        gitlab.url: forges.GitLab(gitlab.url, "gl-token"),
+        gitea.url: forges.Gitea(gitea.url, "gt-token"),
+    }
+    issue_url = "https://github.com/user/source/issues/1"
+
+    def broadcast(dry_run):
+        return _broadcast_issue_to_urls(
+            {"title": "issue-title", "body": "issue-body"},
+            repo_urls,
+            gh_token=None,
+            dry_run=dry_run,
+            issue_url=issue_url,
+            forges_by_url=forges_by_url,
+        )
+
+    # C1: a dry run over GitHub, GitLab, Gitea and an unknown host.
+    #   Expect each repo is checked on its forge, and the archived Gitea
+    #   repo and the unknown host are reported.
+    unsupported_urls, failed_urls, _ = broadcast(dry_run=True)
+    assert unsupported_urls == ["https://unknown.example.com/user/repo"]
+    assert failed_urls == [f"{gitea.url}/user/repo"]
+    assert f"  - [archived] {gitea.url}/user/repo" in capsys.readouterr().out
+    # C2: the broadcast. Expect the issue is created on every forge, in
+    #   one pass, and recorded in the journal.
+    unsupported_urls, failed_urls, _ = broadcast(dry_run=False)
+    assert failed_urls == []
+    assert sorted(r[1] for r in gitlab.requests if r[0] == "POST") == [
+        "/api/v4/projects/group%2Frepo0/issues",
+        "/api/v4/projects/group%2Frepo1/issues",
+    ]
+    assert gh._read_journal(issue_url) == set(repo_urls) - set(
+        unsupported_urls
+    )
+    success_report = capsys.readouterr().out.split("Successfully created")[1]
+    assert [
+        line.removeprefix("  - ") for line in success_report.splitlines()[1:]
+    ] == [url for url in repo_urls if url not in unsupported_urls]
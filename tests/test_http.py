@@ -0,0 +1,125 @@
+from io import BytesIO
+
+import pytest
+import requests
+
+from scikit_package.utils import http
+
+
+def _response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.raw = BytesIO()
+    return response
+
+
+@pytest.fixture
+def session_request(mocker):
+    session = mocker.Mock()
+    mocker.patch.object(http, "get_session", return_value=session)
+    return session.request
+
+
+def test_get_session():
+    # C1: two calls. Expect the same pooled session.
+    assert http.get_session() is http.get_session()
+
+
+@pytest.mark.parametrize(
+    "method, responses, expected_status_code, expected_delays",
+    [
+        # C1: GET, a 503 with Retry-After in seconds, then a 200.
+        #   Expect one retry after the requested delay.
+        (
+            "GET",
+            [_response(503, {"Retry-After": "2"}), _response(200)],
+            200,
+            [2.0],
+        ),
+        # C2: GET, always 502. Expect retries with exponential backoff
+        #   and the last response is returned.
+        ("GET", [_response(502)] * 4, 502, [0.5, 1.0, 2.0]),
+        # C3: POST, a 500. Expect no retry since the server might have
+        #   processed the request.
+        ("POST", [_response(500), _response(201)], 500, []),
+        # C4: POST, a 429, then a 201. Expect one retry.
+        ("POST", [_response(429), _response(201)], 201, [0.5]),
+        # C5: POST, a 403 of a secondary rate limit with Retry-After, then
+        #   a 201. Expect one retry after the requested delay.
+        (
+            "POST",
+            [_response(403, {"Retry-After": "3"}), _response(201)],
+            201,
+            [3.0],
+        ),
+        # C6: POST, a 403 without rate limit headers. Expect no retry.
+        ("POST", [_response(403), _response(201)], 403, []),
+    ],
+)
+def test_request(
+    mocker,
+    session_request,
+    method,
+    responses,
+    expected_status_code,
+    expected_delays,
+):
+    sleep_mocker = mocker.patch("time.sleep")
+    session_request.side_effect = responses
+    response = http.request(method, "https://api.github.com")
+    assert response.status_code == expected_status_code
+    assert [c.args[0] for c in sleep_mocker.call_args_list] == (
+        expected_delays
+    )
+    session_request.assert_called_with(
+        method, "https://api.github.com", timeout=http.DEFAULT_TIMEOUT
+    )
+
+
+def test_request_connection_error(mocker, session_request):
+    mocker.patch("time.sleep")
+    # C1: GET, a connection error, then a 200. Expect one retry.
+    session_request.side_effect = [requests.ConnectionError, _response(200)]
+    assert http.get("https://pypi.org").status_code == 200
+    # C2: POST, a connection error. Expect ConnectionError without retry.
+    session_request.side_effect = [requests.ConnectionError, _response(201)]
+    with pytest.raises(requests.ConnectionError):
+        http.post("https://api.github.com")
+
+
+def test_rate_limiter(mocker, session_request):
+    sleep_mocker = mocker.patch("time.sleep")
+    mocker.patch("time.time", return_value=1000.0)
+    mocker.patch("time.monotonic", return_value=0.0)
+    limiter = http.RateLimiter()
+    # C1: a response with requests remaining. Expect no wait.
+    session_request.side_effect = [
+        _response(201, {"X-RateLimit-Remaining": "1"})
+    ]
+    http.post("https://api.github.com", limiter=limiter)
+    sleep_mocker.assert_not_called()
+    # C2: a response exhausting the rate limit. Expect the next request
+    #   waits until X-RateLimit-Reset.
+    session_request.side_effect = [
+        _response(
+            201,
+            {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1030"},
+        ),
+        _response(201),
+    ]
+    http.post("https://api.github.com", limiter=limiter)
+    sleep_mocker.assert_not_called()
+    http.post("https://api.github.com", limiter=limiter)
+    sleep_mocker.assert_called_once_with(30.0)
+    # C3: a 429 with Retry-After. Expect the retry waits through the
+    #   limiter, which also pauses the other threads.
+    sleep_mocker.reset_mock()
+    limiter = http.RateLimiter()
+    session_request.side_effect = [
+        _response(429, {"Retry-After": "5"}),
+        _response(201),
+    ]
+    response = http.post("https://api.github.com", limiter=limiter)
+    assert response.status_code == 201
+    sleep_mocker.assert_called_once_with(5.0)
@@ -1,8 +1,14 @@
+import json
 import re
 
 import pytest
+import requests
 
-from scikit_package.utils.io import copy_all_files
+from scikit_package.utils.io import (
+    copy_all_files,
+    get_latest_release_tag,
+    get_release_tag_cache_ttl,
+)
 
 
 # C1: Source dir and target dir exist. Some files exist in target have the
@@ -103,3 +109,81 @@ def test_copy_all_files_bad(user_filesystem):
         assert str(target_dir) in actual_error_message
         for name in duplicate_names:
             assert name in actual_error_message
+
+
+def _release_response(status_code, tag=None, etag='"etag-1"'):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers["ETag"] = etag
+    if tag is not None:
+        response._content = json.dumps({"tag_name": tag}).encode()
+    return response
+
+
+def test_get_latest_release_tag_cache(mocker, tmp_path):
+    config_path = tmp_path / ".skpkgrc"
+    config_path.write_text(json.dumps({"release_tag_cache_ttl": 60}))
+    mocker.patch("time.time", return_value=1000.0)
+    get_mocker = mocker.patch(
+        "scikit_package.utils.http.get",
+        return_value=_release_response(200, tag="1.0.0"),
+    )
+    # C1: no cached tag. Expect the tag is fetched from GitHub.
+    assert get_latest_release_tag("owner", "repo", config_path) == "1.0.0"
+    get_mocker.assert_called_once_with(
+        "https://api.github.com/repos/owner/repo/releases/latest", headers={}
+    )
+    # C2: the cached tag is younger than the TTL. Expect no request.
+    mocker.patch("time.time", return_value=1059.0)
+    assert get_latest_release_tag("owner", "repo", config_path) == "1.0.0"
+    assert get_mocker.call_count == 1
+    # C3: the cached tag is older than the TTL and unchanged on GitHub.
+    #   Expect a revalidation with If-None-Match and the cached tag.
+    mocker.patch("time.time", return_value=1061.0)
+    get_mocker.return_value = _release_response(304)
+    assert get_latest_release_tag("owner", "repo", config_path) == "1.0.0"
+    assert get_mocker.call_args.kwargs["headers"] == {
+        "If-None-Match": '"etag-1"'
+    }
+    # C4: the revalidation finds a new release. Expect the new tag.
+    mocker.patch("time.time", return_value=1200.0)
+    get_mocker.return_value = _release_response(
+        200, tag="1.1.0", etag='"etag-2"'
+    )
+    assert get_latest_release_tag("owner", "repo", config_path) == "1.1.0"
+    # C5: GitHub can not be reached. Expect the cached tag.
+    mocker.patch("time.time", return_value=1300.0)
+    get_mocker.side_effect = requests.ConnectionError
+    assert get_latest_release_tag("owner", "repo", config_path) == "1.1.0"
+
+
+def test_get_latest_release_tag_cache_bad(mocker, tmp_path):
+    # C1: GitHub can not be reached and no tag is cached.
+    #   Expect ConnectionError.
+    mocker.patch(
+        "scikit_package.utils.http.get", side_effect=requests.ConnectionError
+    )
+    with pytest.raises(requests.ConnectionError):
+        get_latest_release_tag("owner", "repo", tmp_path / ".skpkgrc")
+
+
+@pytest.mark.parametrize(
+    "config, expected_ttl",
+    [
+        # C1: no ~/.skpkgrc entry. Expect the default TTL.
+        ({}, 3600),
+        # C2: a number of seconds. Expect it is used.
+        ({"release_tag_cache_ttl": 60}, 60),
+        # C3: a value that is not a number. Expect the default TTL.
+        ({"release_tag_cache_ttl": "one day"}, 3600),
+        ({"release_tag_cache_ttl": [1]}, 3600),
+    ],
+)
+def test_get_release_tag_cache_ttl(tmp_path, capsys, config, expected_ttl):
+    config_path = tmp_path / ".skpkgrc"
+    config_path.write_text(json.dumps(config))
+    assert get_release_tag_cache_ttl(config_path) == expected_ttl
+    warned = "'release_tag_cache_ttl'" in capsys.readouterr().out
+    assert warned == isinstance(
+        config.get("release_tag_cache_ttl"), (str, list)
+    )
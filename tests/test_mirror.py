@@ -0,0 +1,109 @@
+import shutil
+import subprocess
+
+import pytest
+
+from scikit_package.utils import mirror
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        [
+            "git",
+            "-c",
+            "user.name=skpkg",
+            "-c",
+            "user.email=skpkg@email.com",
+            *args,
+        ],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def template_repo(tmp_path):
+    repo_path = tmp_path / "remote" / "owner" / "template"
+    repo_path.mkdir(parents=True)
+    _git(repo_path, "init", "--quiet")
+    (repo_path / "cookiecutter.json").write_text('{"project_name": "a"}')
+    _git(repo_path, "add", "cookiecutter.json")
+    _git(repo_path, "commit", "--quiet", "-m", "first release")
+    _git(repo_path, "tag", "1.0.0")
+    return repo_path
+
+
+def test_checkout_template(template_repo, skpkg_cache_dir, mocker):
+    repo_url = template_repo.as_uri()
+    # C1: a cold cache. Expect the mirror is cloned and the files at the
+    #   tag are extracted into the cache.
+    template_path = mirror.checkout_template(repo_url, "1.0.0")
+    assert template_path == (
+        skpkg_cache_dir / "templates" / "owner" / "template" / "1.0.0"
+    )
+    assert (template_path / "cookiecutter.json").read_text() == (
+        '{"project_name": "a"}'
+    )
+    assert (skpkg_cache_dir / "mirrors" / "owner" / "template.git").is_dir()
+    # C2: a warm cache. Expect the checkout is reused without running git.
+    git_spy = mocker.spy(mirror, "_git")
+    assert mirror.checkout_template(repo_url, "1.0.0") == template_path
+    git_spy.assert_not_called()
+    # C3: a new release tag. Expect the mirror is fetched instead of cloned
+    #   and the files of the new tag are extracted.
+    (template_repo / "cookiecutter.json").write_text('{"project_name": "b"}')
+    _git(template_repo, "commit", "--quiet", "-am", "second release")
+    _git(template_repo, "tag", "1.1.0")
+    new_template_path = mirror.checkout_template(repo_url, "1.1.0")
+    assert (new_template_path / "cookiecutter.json").read_text() == (
+        '{"project_name": "b"}'
+    )
+    git_commands = [call.args[0] for call in git_spy.call_args_list]
+    assert "fetch" in git_commands
+    assert "clone" not in git_commands
+    assert (template_path / "cookiecutter.json").read_text() == (
+        '{"project_name": "a"}'
+    )
+
+
+def test_checkout_sparse(tmp_path, skpkg_cache_dir, mocker):
+    repo_path = tmp_path / "remote" / "owner" / "repo-info"
+    repo_path.mkdir(parents=True)
+    _git(repo_path, "init", "--quiet")
+    (repo_path / "groups.json").write_text('{"group": ["repo1"]}')
+    (repo_path / "repos.json").write_text('{"repo1": "url1"}')
+    (repo_path / "README.md").write_text("registry")
+    _git(repo_path, "add", ".")
+    _git(repo_path, "commit", "--quiet", "-m", "first registry")
+    repo_url = repo_path.as_uri()
+    paths = ["groups.json", "repos.json"]
+    # C1: a cold cache. Expect a shallow clone in the cache that only
+    #   checks out the requested files.
+    checkout_path = mirror.checkout_sparse(repo_url, paths)
+    assert checkout_path == (
+        skpkg_cache_dir / "checkouts" / "owner" / "repo-info"
+    )
+    assert (checkout_path / "repos.json").read_text() == '{"repo1": "url1"}'
+    assert not (checkout_path / "README.md").exists()
+    # C2: the remote is unchanged. Expect only `git ls-remote` is run
+    #   against the remote.
+    git_spy = mocker.spy(mirror, "_git")
+    assert mirror.checkout_sparse(repo_url, paths) == checkout_path
+    git_commands = [call.args[0] for call in git_spy.call_args_list]
+    assert "ls-remote" in git_commands
+    assert "clone" not in git_commands
+    assert all("fetch" not in call.args for call in git_spy.call_args_list)
+    # C3: a new commit on the remote. Expect the checkout is fetched and
+    #   updated to it.
+    (repo_path / "repos.json").write_text('{"repo1": "url2"}')
+    _git(repo_path, "commit", "--quiet", "-am", "second registry")
+    git_spy.reset_mock()
+    mirror.checkout_sparse(repo_url, paths)
+    assert any("fetch" in call.args for call in git_spy.call_args_list)
+    assert (checkout_path / "repos.json").read_text() == '{"repo1": "url2"}'
+    assert not (checkout_path / "README.md").exists()
+    # C4: the remote can not be reached. Expect the cached checkout is
+    #   used.
+    shutil.rmtree(repo_path)
+    assert mirror.checkout_sparse(repo_url, paths) == checkout_path
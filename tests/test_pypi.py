@@ -1,14 +1,21 @@
+import hashlib
+
 import pytest
 
-from scikit_package.utils.pypi import check_pypi_package_exists
+from scikit_package.utils import pypi
+from scikit_package.utils.pypi import (
+    check_pypi_package_exists,
+    get_pypi_version_sha,
+)
 
 
 def test_check_pypi_package_exists(mocker, capsys):
     mock_response = mocker.Mock()
     mock_response.status_code = 200
+    mock_response.headers = {}
     mock_response.json.return_value = {"info": {"version": "1.2.3"}}
     mock_get = mocker.patch(
-        "scikit_package.utils.pypi.requests.get", return_value=mock_response
+        "scikit_package.utils.http.get", return_value=mock_response
     )
     check_pypi_package_exists("my-package")
     captured = capsys.readouterr()
@@ -16,14 +23,16 @@ def test_check_pypi_package_exists(mocker, capsys):
         "> my-package is available on PyPI (latest version: 1.2.3)."
         in captured.out
     )
-    mock_get.assert_called_once_with("https://pypi.org/pypi/my-package/json")
+    mock_get.assert_called_once_with(
+        "https://pypi.org/pypi/my-package/json", headers={}
+    )
 
 
 def test_check_pypi_package_exists_404(mocker):
     mock_response = mocker.Mock()
     mock_response.status_code = 404
     mock_get = mocker.patch(
-        "scikit_package.utils.pypi.requests.get", return_value=mock_response
+        "scikit_package.utils.http.get", return_value=mock_response
     )
     with pytest.raises(
         ValueError,
@@ -35,4 +44,291 @@ def test_check_pypi_package_exists_404(mocker):
         "please update the conda-forge recipe by hand.",
     ):
         check_pypi_package_exists("my-package")
-    mock_get.assert_called_once_with("https://pypi.org/pypi/my-package/json")
+    mock_get.assert_called_once_with(
+        "https://pypi.org/pypi/my-package/json", headers={}
+    )
+
+
+def _mock_pypi(mocker, documents):
+    """Mock PyPI to serve the JSON ``documents`` keyed by URL path."""
+
+    def mock_get(url, headers):
+        path = url.removeprefix("https://pypi.org")
+        if headers.get("If-None-Match") == f'"{path}"':
+            return mocker.Mock(status_code=304, headers={})
+        if path not in documents:
+            return mocker.Mock(status_code=404, headers={})
+        return mocker.Mock(
+            status_code=200,
+            headers={
+                "ETag": f'"{path}"',
+                "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+            },
+            json=lambda: documents[path],
+        )
+
+    return mocker.patch("scikit_package.utils.http.get", side_effect=mock_get)
+
+
+def _project_json(versions):
+    return {
+        "info": {"version": versions[-1]},
+        "releases": {
+            version: [
+                {"packagetype": "bdist_wheel", "digests": {"sha256": "w"}},
+                {"packagetype": "sdist", "digests": {"sha256": version}},
+            ]
+            for version in versions
+        },
+    }
+
+
+def test_pypi_metadata_cache(mocker):
+    # the simple index is not available, so the project JSON is used
+    mock_get = _mock_pypi(
+        mocker,
+        {"/pypi/my-package/json": _project_json(["1.0.0", "1.1.0"])},
+    )
+    # C1: both lookups for the same package in one run.
+    #   Expect the project JSON is downloaded once.
+    check_pypi_package_exists("my-package")
+    assert get_pypi_version_sha("my-package") == {"1.1.0": "1.1.0"}
+    project_json_calls = [
+        c
+        for c in mock_get.call_args_list
+        if c.args[0] == "https://pypi.org/pypi/my-package/json"
+    ]
+    assert len(project_json_calls) == 1
+    # C2: a lookup in a later run, unchanged on PyPI. Expect a revalidation
+    #   with the cached ETag and Last-Modified and the cached document.
+    pypi.clear_cache()
+    check_pypi_package_exists("my-package")
+    assert mock_get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"/pypi/my-package/json"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+
+
+def test_get_pypi_version_sha(mocker):
+    # C1: the simple index lists the versions. Expect only the per-version
+    #   JSON of the latest stable versions is downloaded.
+    versions = ["0.9.0", "1.0.0", "1.1.0", "1.2.0rc1"]
+    documents = {
+        "/simple/my-package/": {"versions": versions},
+        "/pypi/my-package/json": _project_json(versions),
+    }
+    for version in versions:
+        documents[f"/pypi/my-package/{version}/json"] = {
+            "urls": _project_json([version])["releases"][version]
+        }
+    mock_get = _mock_pypi(mocker, documents)
+    assert get_pypi_version_sha("my-package", count=2) == {
+        "1.1.0": "1.1.0",
+        "1.0.0": "1.0.0",
+    }
+    assert [c.args[0] for c in mock_get.call_args_list] == [
+        "https://pypi.org/simple/my-package/",
+        "https://pypi.org/pypi/my-package/1.1.0/json",
+        "https://pypi.org/pypi/my-package/1.0.0/json",
+    ]
+    assert mock_get.call_args_list[0].kwargs["headers"] == {
+        "Accept": "application/vnd.pypi.simple.v1+json"
+    }
+    # C2: the simple index also lists the sdists with their SHA256, except
+    #   the one of 1.0.0. Expect only the per-version JSON of 1.0.0 is
+    #   downloaded.
+    documents["/simple/indexed-package/"] = {
+        "versions": versions,
+        "files": [
+            {
+                "filename": f"indexed_package-{version}.tar.gz",
+                "hashes": {"sha256": f"index-{version}"},
+                "url": f"https://files.example/{version}.tar.gz",
+            }
+            for version in ["0.9.0", "1.1.0"]
+        ]
+        + [
+            {
+                "filename": "indexed_package-1.0.0-py3-none-any.whl",
+                "hashes": {"sha256": "w"},
+                "url": "https://files.example/1.0.0.whl",
+            }
+        ],
+    }
+    documents["/pypi/indexed-package/1.0.0/json"] = documents[
+        "/pypi/my-package/1.0.0/json"
+    ]
+    mock_get.reset_mock()
+    assert get_pypi_version_sha("indexed-package", count=2) == {
+        "1.1.0": "index-1.1.0",
+        "1.0.0": "1.0.0",
+    }
+    assert [c.args[0] for c in mock_get.call_args_list] == [
+        "https://pypi.org/simple/indexed-package/",
+        "https://pypi.org/pypi/indexed-package/1.0.0/json",
+    ]
+
+
+def test_get_pypi_version_sha_bad(mocker):
+    # C1: a package that is not on PyPI. Expect ValueError.
+    _mock_pypi(mocker, {})
+    with pytest.raises(
+        ValueError,
+        match="No matching package found for my-package on PyPI. ",
+    ):
+        get_pypi_version_sha("my-package")
+
+
+def _mock_sdist_download(mocker, content):
+    """Mock the streamed download of an sdist with ``content``."""
+    response = mocker.MagicMock(status_code=200)
+    response.__enter__.return_value = response
+    response.iter_content.side_effect = lambda chunk_size: [
+        content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
+    ]
+    return mocker.patch("scikit_package.utils.http.get", return_value=response)
+
+
+def test_verify_sdist_sha256(mocker):
+    content = b"sdist" * 100000
+    sha256 = hashlib.sha256(content).hexdigest()
+    url = "https://files.pythonhosted.org/my-package-1.0.0.tar.gz"
+    # C1: the advertised SHA256 matches the sdist. Expect the sdist is
+    #   streamed in chunks, and the verified SHA256 is returned and cached.
+    mock_get = _mock_sdist_download(mocker, content)
+    assert pypi.verify_sdist_sha256(url, sha256) == sha256
+    mock_get.assert_called_once_with(url, stream=True)
+    mock_get.return_value.iter_content.assert_called_once_with(
+        pypi.DOWNLOAD_CHUNK_SIZE
+    )
+    # C2: the same URL again. Expect the cached result without download.
+    assert pypi.verify_sdist_sha256(url, sha256) == sha256
+    assert pypi.verify_sdist_sha256(url) == sha256
+    mock_get.assert_called_once()
+    # C3: the advertised SHA256 does not match the sdist. Expect ValueError.
+    mock_get = _mock_sdist_download(mocker, b"tampered")
+    with pytest.raises(ValueError, match="but PyPI lists"):
+        pypi.verify_sdist_sha256(url.replace("1.0.0", "1.0.1"), sha256)
+
+
+def test_get_pypi_version_sha_verify(mocker):
+    # C1: the sdist of the latest version has no digest on PyPI.
+    #   Expect it is left out without verify, and computed with verify.
+    content = b"sdist content"
+    url = "https://files.pythonhosted.org/my-package-1.0.0.tar.gz"
+    sdist = {"packagetype": "sdist", "digests": {}, "url": url}
+    _mock_pypi(
+        mocker, {"/pypi/my-package/json": {"releases": {"1.0.0": [sdist]}}}
+    )
+    assert get_pypi_version_sha("my-package") == {}
+    mock_get = _mock_sdist_download(mocker, content)
+    assert get_pypi_version_sha("my-package", verify=True) == {
+        "1.0.0": hashlib.sha256(content).hexdigest()
+    }
+    mock_get.assert_called_once_with(url, stream=True)
+
+
+def _build_pypi_documents(package, n_releases):
+    """Build PyPI documents resembling a project with many releases."""
+    description = "A long README used as the project description.\n" * 500
+    info = {"name": package, "description": description}
+    files_url = "https://files.pythonhosted.org/packages"
+    releases, simple_files = {}, []
+    for i in range(n_releases):
+        version = f"{i // 100}.{i // 10 % 10}.{i % 10}"
+        files = []
+        for packagetype, filename in [
+            ("sdist", f"{package}-{version}.tar.gz"),
+            ("bdist_wheel", f"{package}-{version}-py3-none-any.whl"),
+        ]:
+            files.append(
+                {
+                    "comment_text": "",
+                    "digests": {
+                        "blake2b_256": "b" * 64,
+                        "md5": "m" * 32,
+                        "sha256": f"{version}-{filename}",
+                    },
+                    "filename": filename,
+                    "packagetype": packagetype,
+                    "python_version": "source",
+                    "requires_python": ">=3.12",
+                    "size": 123456,
+                    "upload_time_iso_8601": "2024-01-01T00:00:00.000000Z",
+                    "url": f"{files_url}/{filename}",
+                    "yanked": False,
+                    "yanked_reason": None,
+                }
+            )
+            simple_files.append(
+                {
+                    "filename": filename,
+                    "hashes": {"sha256": f"{version}-{filename}"},
+                    "requires-python": ">=3.12",
+                    "size": 123456,
+                    "upload-time": "2024-01-01T00:00:00.000000Z",
+                    "url": f"{files_url}/{filename}",
+                    "yanked": False,
+                }
+            )
+        releases[version] = files
+    return {
+        f"/pypi/{package}/json": {
+            "info": {**info, "version": version},
+            "releases": releases,
+        },
+        f"/simple/{package}/": {
+            "meta": {"api-version": "1.1"},
+            "name": package,
+            "files": simple_files,
+            "versions": list(releases),
+        },
+        **{
+            f"/pypi/{package}/{v}/json": {
+                "info": {**info, "version": v},
+                "urls": files,
+            }
+            for v, files in releases.items()
+        },
+    }
+
+
+@pytest.fixture
+def pypi_stub_server(start_stub_server, monkeypatch):
+    """Serve the PyPI documents of a project with many releases from a
+    stub server, see ``start_stub_server``."""
+    stub = start_stub_server()
+    documents = _build_pypi_documents("my-package", n_releases=300)
+    stub.routes = {
+        ("GET", path): (200, document, {})
+        for path, document in documents.items()
+    }
+    monkeypatch.setattr(pypi, "PYPI_URL", stub.url)
+    return stub
+
+
+def test_get_version_sdist_transfer(pypi_stub_server):
+    # C1: a project with 300 releases served by a local stub of PyPI.
+    #   Expect both strategies find the same sdist, the simple index
+    #   strategy does not request the per-version JSON and transfers
+    #   fewer bytes.
+    results = {}
+    for name, strategy in [
+        ("project JSON", pypi._get_version_sdist_from_project_json),
+        ("simple index", pypi._get_version_sdist_from_version_json),
+    ]:
+        pypi_stub_server.responses.clear()
+        version_sdist = strategy("my-package", 1)
+        results[name] = (version_sdist, list(pypi_stub_server.responses))
+    project_sdist, project_responses = results["project JSON"]
+    index_sdist, index_responses = results["simple index"]
+    assert index_sdist["2.9.9"]["url"] == project_sdist["2.9.9"]["url"]
+    assert (
+        index_sdist["2.9.9"]["digests"]["sha256"]
+        == project_sdist["2.9.9"]["digests"]["sha256"]
+        == "2.9.9-my-package-2.9.9.tar.gz"
+    )
+    assert [path for path, _ in index_responses] == ["/simple/my-package/"]
+    assert sum(n for _, n in index_responses) < sum(
+        n for _, n in project_responses
+    )
@@ -0,0 +1,132 @@
+import pytest
+
+from scikit_package.utils import recipe
+
+SHA256_VARIABLE_RECIPE = """\
+{% set version = "1.0.0" %}
+{% set sha256 = "aaaa" %}
+
+source:
+  url: https://pypi.org/packages/source/p/pkg/pkg-{{ version }}.tar.gz
+  sha256: {{ sha256 }}
+"""
+
+MULTI_SOURCE_RECIPE = """\
+{% set name = "diffpy.utils" %}
+{% set version = "3.5.0" %}
+{% set build = 2 %}
+
+package:
+  name: {{ name|lower }}
+  version: {{ version }}
+
+source:
+  - url: https://github.com/diffpy/data/archive/v1.0.tar.gz
+    sha256: aaaa  # [not win]
+    folder: data
+  - url: https://pypi.io/packages/source/d/diffpy.utils/diffpy.utils-{{ version }}.tar.gz
+    sha256: bbbb  # [not win]
+
+build:
+  number: {{ build }}
+  script: {{ PYTHON }} -m pip install . -vv
+
+outputs:
+  - name: diffpy.utils
+    build:
+      number: 3
+  - name: diffpy.utils-data
+    build:
+      number: {{ build }}
+
+about:
+  description: |
+    source:
+      sha256: not-a-key
+    build:
+      number: 5
+  license: BSD-3-Clause
+"""  # noqa: E501
+
+
+def test_tokenize():
+    # C1: a multi-source, multi-output recipe. Expect the entries of each
+    #   source and output are told apart and the content of the block
+    #   scalar is skipped.
+    tokens = recipe.tokenize(MULTI_SOURCE_RECIPE)
+    sets = {t.path[0]: t.value for t in tokens if t.kind == "set"}
+    assert sets == {"name": "diffpy.utils", "version": "3.5.0", "build": "2"}
+    sha256_tokens = [t for t in tokens if t.path[-1] == "sha256"]
+    assert [t.value for t in sha256_tokens] == ["aaaa", "bbbb"]
+    assert sha256_tokens[0].path[:-1] != sha256_tokens[1].path[:-1]
+    number_tokens = [t for t in tokens if t.path[-2:] == ("build", "number")]
+    assert [t.value for t in number_tokens] == [
+        "{{ build }}",
+        "3",
+        "{{ build }}",
+    ]
+    assert not any(t.value == "not-a-key" for t in tokens)
+
+
+def test_read_version_sha256():
+    # C1: a multi-source recipe. Expect the SHA256 of the PyPI source.
+    assert recipe.read_version_sha256(MULTI_SOURCE_RECIPE) == ("3.5.0", "bbbb")
+    # C2: a recipe without version. Expect None.
+    assert recipe.read_version_sha256("source:\n  sha256: 'cccc'\n") == (
+        None,
+        "cccc",
+    )
+    # C3: the SHA256 set through a Jinja variable. Expect the value of
+    #   the variable.
+    assert recipe.read_version_sha256(SHA256_VARIABLE_RECIPE) == (
+        "1.0.0",
+        "aaaa",
+    )
+
+
+def test_update_text():
+    # C1: a new version of a multi-source, multi-output recipe. Expect only
+    #   the version, the SHA256 of the PyPI source and the build numbers
+    #   are replaced, keeping the selectors.
+    updated = recipe.update_text(MULTI_SOURCE_RECIPE, "3.6.0", "cccc")
+    expected = (
+        MULTI_SOURCE_RECIPE.replace('version = "3.5.0"', 'version = "3.6.0"')
+        .replace("{% set build = 2 %}", "{% set build = 0 %}")
+        .replace("sha256: bbbb", "sha256: cccc")
+        .replace("number: 3", "number: 0")
+    )
+    assert updated == expected
+    # C2: the same version with a new SHA256. Expect the build numbers
+    #   are kept.
+    updated = recipe.update_text(MULTI_SOURCE_RECIPE, "3.5.0", "cccc")
+    assert updated == MULTI_SOURCE_RECIPE.replace("bbbb", "cccc")
+    # C3: a recipe without version. Expect ValueError.
+    with pytest.raises(ValueError, match="No `{% set version"):
+        recipe.update_text("source:\n  sha256: aaaa\n", "1.0.0", "bbbb")
+    # C4: two sources, none of them with the version in its URL.
+    #   Expect ValueError.
+    with pytest.raises(ValueError, match="PyPI source"):
+        recipe.update_text(
+            '{% set version = "1.0.0" %}\n'
+            "source:\n"
+            "  - url: https://a.tar.gz\n"
+            "    sha256: aaaa\n"
+            "  - url: https://b.tar.gz\n"
+            "    sha256: bbbb\n",
+            "1.1.0",
+            "cccc",
+        )
+    # C5: the SHA256 set through a Jinja variable. Expect the variable is
+    #   replaced and the entry is kept.
+    updated = recipe.update_text(SHA256_VARIABLE_RECIPE, "1.1.0", "bbbb")
+    assert updated == SHA256_VARIABLE_RECIPE.replace("1.0.0", "1.1.0").replace(
+        "aaaa", "bbbb"
+    )
+    # C6: the SHA256 set through a Jinja variable that is not set.
+    #   Expect ValueError.
+    with pytest.raises(ValueError, match="Jinja variable of the PyPI source"):
+        recipe.update_text(
+            SHA256_VARIABLE_RECIPE.replace('{% set sha256 = "aaaa" %}', ""),
+            "1.1.0",
+            "bbbb",
+        )
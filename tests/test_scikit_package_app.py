@@ -0,0 +1,86 @@
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import scikit_package
+from scikit_package.scikit_package_app import (
+    _lazy_handler,
+    _positive_int,
+    setup_subparsers,
+)
+
+
+def test_lazy_handler(mocker):
+    # C1: a handler import path. Expect the module is only imported when
+    #   the handler is called and the call is dispatched with the args.
+    import_module_mocker = mocker.patch(
+        "scikit_package.scikit_package_app.import_module"
+    )
+    handler = _lazy_handler("scikit_package.cli.add:news_item")
+    assert handler.import_path == "scikit_package.cli.add:news_item"
+    import_module_mocker.assert_not_called()
+    handler("args")
+    import_module_mocker.assert_called_once_with("scikit_package.cli.add")
+    import_module_mocker.return_value.news_item.assert_called_once_with("args")
+
+
+def test_positive_int(capsys):
+    # C1: a positive integer. Expect it is parsed.
+    assert _positive_int("3") == 3
+    # C2: zero, a negative and a non-integer value of `--concurrency`.
+    #   Expect a usage error instead of a crash of the thread pool.
+    parser = argparse.ArgumentParser(prog="package")
+    setup_subparsers(parser.add_subparsers(dest="command", required=True))
+    for value in ["0", "-2", "two"]:
+        with pytest.raises(SystemExit):
+            parser.parse_args(
+                ["broadcast", "issue-url", "group", "--concurrency", value]
+            )
+        assert (
+            f"argument --concurrency: must be a positive integer, but it is "
+            f"'{value}'"
+        ) in capsys.readouterr().err
+
+
+def test_add_news_does_not_import_requests(tmp_path):
+    # C1: `package add news -a -m <message>` in a fresh interpreter.
+    #   Expect the news item is written and `requests` is never imported.
+    news_dir = tmp_path / "news"
+    news_dir.mkdir()
+    project_root = Path(__file__).resolve().parents[1]
+    shutil.copy(project_root / "news" / "TEMPLATE.rst", news_dir)
+    script = """
+import sys
+from unittest import mock
+
+from scikit_package.scikit_package_app import main
+
+sys.argv = ["package", "add", "news", "-a", "-m", "Add lazy loading."]
+with mock.patch(
+    "scikit_package.utils.auth.get_current_branch",
+    return_value="test-branch",
+):
+    main()
+print("requests" in sys.modules)
+"""
+    # make the imported scikit_package importable from the tmp cwd
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(Path(scikit_package.__file__).parents[1])]
+        + env.get("PYTHONPATH", "").split(os.pathsep)
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip().splitlines()[-1] == "False"
+    assert "* Add lazy loading." in (news_dir / "test-branch.rst").read_text()
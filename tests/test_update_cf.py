@@ -1,35 +1,12 @@
 import importlib
+import os
+import subprocess
+import threading
 from pathlib import Path
 
-from scikit_package.cli.update.cf import _update_meta_yaml
-
-
-def test_update_meta_yaml_realistic(tmpdir):
-    original_meta = """{%- set version = "1.0.5" -%}
-package:
-  name: {{ name|lower }}
-  version: {{ version }}
-
-source:
-  url: https://pypi.org/packages/source/{{ name[0] }}/{{ name }}/{{ name }}-{{ version }}.tar.gz  # noqa: E501
-  sha256: 1b71d398d73800db32b09785af0e7
-"""
-    new_version = "1.0.6"
-    new_sha256 = "123456789abcdef0123456789"
-    expected_updated_meta = """{%- set version = "1.0.6" -%}
-package:
-  name: {{ name|lower }}
-  version: {{ version }}
-
-source:
-  url: https://pypi.org/packages/source/{{ name[0] }}/{{ name }}/{{ name }}-{{ version }}.tar.gz  # noqa: E501
-  sha256: 123456789abcdef0123456789
-"""
-    meta_file = Path(tmpdir) / "meta.yaml"
-    meta_file.write_text(original_meta)
-    _update_meta_yaml(str(meta_file), new_version, new_sha256)
-    updated_meta = meta_file.read_text()
-    assert updated_meta == expected_updated_meta
+import pytest
+
+from scikit_package.cli.update import cf
 
 
 # C1: a src file in a namespace package. Expect the it's correct relative path
@@ -48,3 +25,403 @@ def test_get_src_file_location_in_submodule():
         filename, "diffpy.my_project"
     )
     assert actual_filename == expected_filename
+
+
+def test_update_conda_forge(mocker, tmp_path, capsys, git_identity):
+    # C1: three feedstocks and the PyPI lookup of one of them fails.
+    #   Expect the failure is listed inline and the numbering of the
+    #   menu only covers the feedstocks that can be updated.
+    # C2: the upstream/main of pkg-c already has the latest version and
+    #   SHA256. Expect it is marked as current.
+    # C3: the working tree of pkg-a has the latest version and SHA256,
+    #   but its upstream/main does not. Expect it is marked as outdated.
+    old_recipe = '{% set version = "0.9.0" %}\nsource:\n  sha256: old\n'
+    for pkg_name in ["pkg-a", "pkg-b", "pkg-c"]:
+        _create_local_feedstock(
+            tmp_path / f"{pkg_name}-feedstock",
+            (
+                old_recipe.replace("0.9.0", "1.0.0").replace(
+                    "old", "sha256-of-pkg-c"
+                )
+                if pkg_name == "pkg-c"
+                else old_recipe
+            ),
+        )
+    (tmp_path / "pkg-a-feedstock" / "recipe" / "meta.yaml").write_text(
+        '{% set version = "1.0.0" %}\nsource:\n  sha256: sha256-of-pkg-a\n'
+    )
+    mocker.patch(
+        "scikit_package.utils.io.get_config_value", return_value=str(tmp_path)
+    )
+
+    def mock_get_pypi_version_sha(pkg_name, count, verify):
+        if pkg_name == "pkg-b":
+            raise ValueError("No matching package found for pkg-b on PyPI.")
+        return {"1.0.0": f"sha256-of-{pkg_name}"}
+
+    mocker.patch(
+        "scikit_package.utils.pypi.get_pypi_version_sha",
+        side_effect=mock_get_pypi_version_sha,
+    )
+    prompt_mocker = mocker.patch("click.prompt", return_value=2)
+    mocker.patch(
+        "scikit_package.utils.auth.get_github_username",
+        return_value="username",
+    )
+    run_commands_mocker = mocker.patch.object(cf, "_run_commands")
+    cf.update_conda_forge()
+    captured = capsys.readouterr()
+    assert (
+        "  -  pkg-b, failed to fetch from PyPI: "
+        "No matching package found for pkg-b on PyPI."
+    ) in captured.out
+    assert "pkg-a, 1.0.0, SHA256: sha25.. (outdated)" in captured.out
+    assert "pkg-c, 1.0.0, SHA256: sha25.. (current)" in captured.out
+    assert prompt_mocker.call_args.kwargs["type"].max == 2
+    selected_feedstock = run_commands_mocker.call_args.args[0]
+    selected_pkg_name = run_commands_mocker.call_args.args[-1]
+    assert selected_feedstock == os.path.join(
+        tmp_path, f"{selected_pkg_name}-feedstock"
+    )
+    assert f"  2. {selected_pkg_name}, 1.0.0" in captured.out
+
+
+def test_update_all_outdated_feedstocks(
+    mocker, tmp_path, capsys, git_identity
+):
+    # C1: an outdated, an up-to-date and a feedstock not found on PyPI.
+    #   Expect the up-to-date feedstock is skipped from the meta.yaml of
+    #   its local upstream/main ref, a PR is only created for the outdated
+    #   feedstock and all feedstocks are listed in the summary.
+    recipe_versions = {"pkg-a": "1.0.0", "pkg-b": "2.0.0", "pkg-c": "0.1.0"}
+    for pkg_name, version in recipe_versions.items():
+        _create_local_feedstock(
+            tmp_path / f"{pkg_name}-feedstock",
+            f'{{% set version = "{version}" %}}\n'
+            f"package:\n  name: {pkg_name}\n",
+        )
+    mocker.patch(
+        "scikit_package.utils.io.get_config_value", return_value=str(tmp_path)
+    )
+
+    def mock_get_pypi_version_sha(pkg_name, count, verify):
+        if pkg_name == "pkg-c":
+            raise ValueError("No matching package found for pkg-c on PyPI.")
+        return {"2.0.0": f"sha256-of-{pkg_name}"}
+
+    mocker.patch(
+        "scikit_package.utils.pypi.get_pypi_version_sha",
+        side_effect=mock_get_pypi_version_sha,
+    )
+    mocker.patch(
+        "scikit_package.utils.auth.get_github_username",
+        return_value="username",
+    )
+    update_mocker = mocker.patch.object(
+        cf,
+        "_update_outdated_feedstock",
+        side_effect=lambda cwd, version, sha256, pkg_name: {
+            "pkg-a": ("1.0.0", "pushed"),
+        }[pkg_name],
+    )
+    pr_mocker = mocker.patch.object(cf, "_create_pull_request")
+    results = cf.update_all_outdated_feedstocks()
+    update_mocker.assert_called_once_with(
+        os.path.join(tmp_path, "pkg-a-feedstock"),
+        "2.0.0",
+        "sha256-of-pkg-a",
+        "pkg-a",
+    )
+    pr_mocker.assert_called_once_with(
+        os.path.join(tmp_path, "pkg-a-feedstock"),
+        "pkg-a",
+        "username",
+        "2.0.0",
+        body="Update pkg-a to 2.0.0, the latest version on PyPI.",
+    )
+    assert {r["package_name"]: r["result"] for r in results} == {
+        "pkg-a": "PR created",
+        "pkg-b": "up to date",
+        "pkg-c": (
+            "failed to fetch from PyPI: "
+            "No matching package found for pkg-c on PyPI."
+        ),
+    }
+    captured = capsys.readouterr()
+    assert "  pkg-a    1.0.0   2.0.0  PR created" in captured.out
+    assert "  pkg-b    2.0.0   2.0.0  up to date" in captured.out
+
+
+def test_is_meta_yaml_current():
+    text = (
+        '{% set version = "1.0.0" %}\n'
+        "source:\n"
+        "  url: https://pypi.org/packages/source/p/pkg/pkg-1.0.0.tar.gz\n"
+        "  sha256: abc123\n"
+    )
+    # C1: the meta.yaml already has the latest version and SHA256.
+    #   Expect True.
+    assert cf._is_meta_yaml_current(text, "1.0.0", "abc123")
+    # C2: the meta.yaml has the latest version but a different SHA256.
+    #   Expect False.
+    assert not cf._is_meta_yaml_current(text, "1.0.0", "def456")
+
+
+def _git(cwd, *args):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _create_feedstock(base_path, feedstock_path):
+    """Create a feedstock clone with upstream and origin remotes in
+    ``base_path``, on a feature branch with an uncommitted change."""
+    base_path.mkdir(parents=True, exist_ok=True)
+    source_path = base_path / "source"
+    (source_path / "recipe").mkdir(parents=True)
+    (source_path / "recipe" / "meta.yaml").write_text(
+        '{% set version = "1.0.0" %}\n' "source:\n" "  sha256: old-sha256\n"
+    )
+    _git(base_path, "init", "--quiet", "-b", "main", str(source_path))
+    _git(source_path, "add", "recipe/meta.yaml")
+    _git(source_path, "commit", "--quiet", "-m", "initial commit")
+    for name in ["upstream.git", "origin.git"]:
+        _git(base_path, "clone", "--quiet", "--bare", "source", name)
+    _git(base_path, "clone", "--quiet", "origin.git", str(feedstock_path))
+    _git(
+        feedstock_path,
+        "remote",
+        "add",
+        "upstream",
+        str(base_path / "upstream.git"),
+    )
+    _git(feedstock_path, "checkout", "--quiet", "-b", "feature")
+    (feedstock_path / "recipe" / "meta.yaml").write_text("local changes\n")
+    # upstream moves on after the feedstock was cloned
+    (source_path / "README.md").write_text("readme\n")
+    _git(source_path, "add", "README.md")
+    _git(source_path, "commit", "--quiet", "-m", "add readme")
+    _git(source_path, "push", "--quiet", "../upstream.git", "main")
+    return feedstock_path
+
+
+def _create_local_feedstock(feedstock_path, meta_yaml):
+    """Create a feedstock whose local upstream/main ref has a commit with
+    the meta.yaml, without any remote."""
+    (feedstock_path / "recipe").mkdir(parents=True)
+    (feedstock_path / "recipe" / "meta.yaml").write_text(meta_yaml)
+    _git(feedstock_path, "init", "--quiet", "-b", "main")
+    _git(feedstock_path, "add", "recipe/meta.yaml")
+    _git(feedstock_path, "commit", "--quiet", "-m", "initial commit")
+    _git(feedstock_path, "update-ref", cf.UPSTREAM_MAIN_REF, "HEAD")
+    return feedstock_path
+
+
+@pytest.fixture
+def git_identity(monkeypatch):
+    for name in ["NAME", "EMAIL"]:
+        for role in ["AUTHOR", "COMMITTER"]:
+            monkeypatch.setenv(f"GIT_{role}_{name}", "skpkg")
+
+
+@pytest.fixture
+def feedstock(tmp_path, git_identity):
+    return _create_feedstock(tmp_path, tmp_path / "pkg-feedstock")
+
+
+def test_run_commands(feedstock, mocker, capsys):
+    # C1: an outdated feedstock on a feature branch with local changes.
+    #   Expect the release branch is created from the latest upstream/main
+    #   and pushed, and the checkout of the user is untouched.
+    pr_mocker = mocker.patch.object(cf, "_create_pull_request")
+    meta_file_path = feedstock / "recipe" / "meta.yaml"
+    assert cf._run_commands(str(feedstock), "1.1.0", "new-sha256", "me", "pkg")
+    pr_mocker.assert_called_once_with(str(feedstock), "pkg", "me", "1.1.0")
+    origin = feedstock.parent / "origin.git"
+    assert _git(origin, "show", "1.1.0:recipe/meta.yaml") == (
+        '{% set version = "1.1.0" %}\nsource:\n  sha256: new-sha256'
+    )
+    assert _git(origin, "log", "-1", "--format=%s", "1.1.0") == (
+        "release: update to 1.1.0"
+    )
+    upstream_main = _git(
+        feedstock.parent / "upstream.git", "rev-parse", "main"
+    )
+    assert _git(origin, "rev-parse", "1.1.0^") == upstream_main
+    assert _git(feedstock, "branch", "--show-current") == "feature"
+    assert _git(feedstock, "status", "--porcelain") == "M recipe/meta.yaml"
+    assert _git(feedstock, "stash", "list") == ""
+    assert meta_file_path.read_text() == "local changes\n"
+    # C2: the release branch already exists. Expect ValueError.
+    with pytest.raises(ValueError, match="'1.1.0' already exists"):
+        cf._run_commands(
+            str(feedstock),
+            "1.1.0",
+            "newer-sha256",
+            "me",
+            "pkg",
+        )
+    # C3: upstream/main already has the version and SHA256, while the
+    #   working tree has another version. Expect it is skipped without a
+    #   fetch or a commit and False is returned.
+    meta_file_path.write_text(
+        '{% set version = "0.9.0" %}\nsource:\n  sha256: local-sha256\n'
+    )
+    run_spy = mocker.spy(cf.git, "run")
+    assert not cf._run_commands(
+        str(feedstock), "1.0.0", "old-sha256", "me", "pkg"
+    )
+    pr_mocker.assert_called_once()
+    # the local upstream/main ref is current, so upstream is not fetched
+    assert all(c.args[0] != "fetch" for c in run_spy.call_args_list)
+    assert "Skipping pkg, the meta.yaml of upstream/main" in (
+        capsys.readouterr().out
+    )
+
+
+def test_create_pull_request(mocker):
+    # C1: a PR without a body. Expect gh prompts for it.
+    run_mocker = mocker.patch("subprocess.run")
+    cf._create_pull_request("feedstock", "pkg", "me", "1.1.0")
+    command = run_mocker.call_args.args[0]
+    assert command[:3] == ["gh", "pr", "create"]
+    assert "--body" not in command
+    # C2: a PR with a body. Expect it is passed to gh.
+    cf._create_pull_request("feedstock", "pkg", "me", "1.1.0", body="text")
+    assert run_mocker.call_args.args[0][-2:] == ["--body", "text"]
+
+
+def test_update_all_outdated_feedstocks_in_parallel(
+    mocker, tmp_path, git_identity
+):
+    # C1: three outdated feedstocks, each on a feature branch with local
+    #   changes, updated by three workers. Expect a release branch is
+    #   pushed for each of them, no checkout of the user is touched and
+    #   the PRs are created one after the other. The working tree of
+    #   pkg-a already has the latest version, but its upstream/main does
+    #   not, so it is updated as well.
+    pkg_names = ["pkg-a", "pkg-b", "pkg-c"]
+    feedstock_path = tmp_path / "feedstocks"
+    for pkg_name in pkg_names:
+        _create_feedstock(
+            tmp_path / pkg_name, feedstock_path / f"{pkg_name}-feedstock"
+        )
+    (feedstock_path / "pkg-a-feedstock" / "recipe" / "meta.yaml").write_text(
+        '{% set version = "1.1.0" %}\nsource:\n  sha256: pkg-a-sha256\n'
+    )
+    mocker.patch(
+        "scikit_package.utils.io.get_config_value",
+        return_value=str(feedstock_path),
+    )
+    mocker.patch(
+        "scikit_package.utils.pypi.get_pypi_version_sha",
+        side_effect=lambda pkg_name, count, verify: {
+            "1.1.0": f"{pkg_name}-sha256"
+        },
+    )
+    mocker.patch(
+        "scikit_package.utils.auth.get_github_username", return_value="me"
+    )
+    main_thread = threading.current_thread()
+    pr_threads = []
+    pr_mocker = mocker.patch.object(
+        cf,
+        "_create_pull_request",
+        side_effect=lambda *args, **kwargs: pr_threads.append(
+            threading.current_thread()
+        ),
+    )
+    results = cf.update_all_outdated_feedstocks(max_workers=3)
+    assert [r["result"] for r in results] == ["PR created"] * 3
+    # the PRs are created one at a time with a body, so gh never prompts
+    assert pr_threads == [main_thread] * 3
+    assert [c.args[1] for c in pr_mocker.call_args_list] == pkg_names
+    assert all(c.kwargs["body"] for c in pr_mocker.call_args_list)
+    for pkg_name in pkg_names:
+        origin = tmp_path / pkg_name / "origin.git"
+        assert f"  sha256: {pkg_name}-sha256" in _git(
+            origin, "show", "1.1.0:recipe/meta.yaml"
+        )
+        local_feedstock = feedstock_path / f"{pkg_name}-feedstock"
+        assert _git(local_feedstock, "branch", "--show-current") == "feature"
+        assert _git(local_feedstock, "status", "--porcelain") == (
+            "M recipe/meta.yaml"
+        )
+
+
+def test_update_verify(mocker):
+    # C1: `package update conda-forge --verify`. Expect the sdists of the
+    #   listed feedstocks are verified.
+    update_mocker = mocker.patch.object(cf, "update_conda_forge")
+    args = mocker.Mock(subcommand="conda-forge", all_outdated=False)
+    args.verify = True
+    cf.update(args)
+    update_mocker.assert_called_once_with(verify=True)
+    # C2: `package update conda-forge --all-outdated --verify`.
+    #   Expect the sdists of all feedstocks are verified.
+    update_all_mocker = mocker.patch.object(
+        cf, "update_all_outdated_feedstocks"
+    )
+    args.all_outdated = True
+    cf.update(args)
+    update_all_mocker.assert_called_once_with(verify=True)
+
+
+def test_list_feedstock(tmp_path, mocker, git_identity):
+    feedstock_path = tmp_path / "feedstocks"
+    for pkg_name in ["pkg-a", "pkg-b"]:
+        _create_local_feedstock(
+            feedstock_path / f"{pkg_name}-feedstock",
+            '{% set version = "1.0.0" %}\nsource:\n  sha256: abc\n',
+        )
+    (feedstock_path / "not-a-feedstock.txt").write_text("")
+    (feedstock_path / "file-feedstock").write_text("")
+    # C1: an empty index. Expect the feedstock directories are listed with
+    #   the version and SHA256 of the recipe of their upstream/main, not
+    #   of their working tree.
+    (feedstock_path / "pkg-a-feedstock" / "recipe" / "meta.yaml").write_text(
+        "local changes\n"
+    )
+    feedstocks = cf._list_feedstock(str(feedstock_path))
+    assert list(feedstocks) == ["pkg-a-feedstock", "pkg-b-feedstock"]
+    assert feedstocks["pkg-a-feedstock"]["path"] == str(
+        feedstock_path / "pkg-a-feedstock"
+    )
+    assert feedstocks["pkg-a-feedstock"]["version"] == "1.0.0"
+    assert feedstocks["pkg-a-feedstock"]["sha256"] == "abc"
+    # C2: nothing changed. Expect the directory is not listed again and
+    #   no recipe is read again.
+    listdir_spy = mocker.spy(os, "listdir")
+    read_spy = mocker.spy(cf, "_read_upstream_meta_yaml")
+    assert cf._list_feedstock(str(feedstock_path)) == feedstocks
+    listdir_spy.assert_not_called()
+    read_spy.assert_not_called()
+    # C3: upstream/main of a feedstock is fetched and a feedstock without
+    #   upstream/main is added. Expect only their recipes are read.
+    pkg_a_path = feedstock_path / "pkg-a-feedstock"
+    (pkg_a_path / "recipe" / "meta.yaml").write_text(
+        '{% set version = "2.0.0" %}\nsource:\n  sha256: def\n'
+    )
+    _git(pkg_a_path, "commit", "--quiet", "-am", "release: update to 2.0.0")
+    _git(pkg_a_path, "update-ref", cf.UPSTREAM_MAIN_REF, "HEAD")
+    ref_path = pkg_a_path / ".git" / "refs" / "remotes" / "upstream" / "main"
+    os.utime(ref_path, ns=(0, 0))
+    (feedstock_path / "pkg-c-feedstock").mkdir()
+    feedstocks = cf._list_feedstock(str(feedstock_path))
+    assert list(feedstocks) == [
+        "pkg-a-feedstock",
+        "pkg-b-feedstock",
+        "pkg-c-feedstock",
+    ]
+    assert [c.args[0] for c in read_spy.call_args_list] == [
+        str(pkg_a_path),
+        str(feedstock_path / "pkg-c-feedstock"),
+    ]
+    assert feedstocks["pkg-a-feedstock"]["version"] == "2.0.0"
+    assert feedstocks["pkg-b-feedstock"]["version"] == "1.0.0"
+    assert feedstocks["pkg-c-feedstock"]["version"] is None
+    # C4: a directory without feedstocks. Expect ValueError.
+    empty_path = feedstock_path / "empty"
+    empty_path.mkdir()
+    with pytest.raises(ValueError, match="No feedstocks found"):
+        cf._list_feedstock(str(empty_path))